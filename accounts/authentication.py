@@ -0,0 +1,83 @@
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import attach_dormitory, claims_are_fresh, get_user_row, user_from_row
+from .models import User
+from .tokens import USER_CLAIMS
+
+
+def user_from_claims(token):
+    """
+    Token claim'laridan User obyektini quradi. Qolgan ustunlar kechiktirilgan (deferred)
+    bo'lib, birinchi murojaatda User.refresh_from_db orqali keshdan to'ldiriladi.
+    """
+    claims = {
+        'id': token[api_settings.USER_ID_CLAIM],
+        'username': token['username'],
+        'role': token['role'],
+        'status': token['status'],
+        'is_active': True,
+    }
+    # from_db qiymatlarni modeldagi ustunlar tartibida kutadi
+    fields = [field.attname for field in User._meta.concrete_fields if field.attname in claims]
+    user = User.from_db(DEFAULT_DB_ALIAS, fields, [claims[name] for name in fields])
+    user._from_token = True
+    attach_dormitory(user, token['dormitory'])
+    return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication, lekin User bazadan o'qilmaydi:
+    - claim'lar yangi bo'lsa (accounts.cache.claims_are_fresh) foydalanuvchi token'dan quriladi;
+    - aks holda User qatori qisqa muddatli keshdan (yoki bir marta bazadan) olinadi.
+
+    `aauthenticate` async view'lar (joybor.asyncviews) uchun: bazaga faqat oxirgi holatda,
+    sync_to_async orqali murojaat qilinadi.
+    """
+
+    def _user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    @staticmethod
+    def _has_fresh_claims(user_id, validated_token):
+        return all(claim in validated_token for claim in USER_CLAIMS) and claims_are_fresh(
+            user_id, validated_token['claims_at']
+        )
+
+    @staticmethod
+    def _user_from_row(row):
+        if row is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not row['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user_from_row(row)
+
+    def get_user(self, validated_token):
+        user_id = self._user_id(validated_token)
+        if self._has_fresh_claims(user_id, validated_token):
+            return user_from_claims(validated_token)
+        return self._user_from_row(get_user_row(user_id))
+
+    async def aget_user(self, validated_token):
+        user_id = self._user_id(validated_token)
+        if self._has_fresh_claims(user_id, validated_token):
+            return user_from_claims(validated_token)
+        return self._user_from_row(await sync_to_async(get_user_row)(user_id))
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
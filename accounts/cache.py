@@ -0,0 +1,84 @@
+"""
+Autentifikatsiya uchun foydalanuvchi keshi.
+
+- Foydalanuvchi qatori (barcha ustunlar + admin bo'lgan yotoqxona id si) qisqa muddat
+  (AUTH_USER_CACHE_TIMEOUT) keshda saqlanadi, shuning uchun to'liq User yuklash har
+  so'rovda bazaga bormaydi.
+- User yoki yotoqxona admini o'zgarganda `invalidate_user` kesh qatorini o'chiradi va
+  shu vaqtgacha berilgan token claim'larini eskirgan deb belgilaydi.
+
+Kesh `default` backend'da. Bir nechta jarayonli deploy'da umumiy kesh (Redis, Memcached)
+sozlanishi kerak, aks holda bekor qilish faqat o'zgarish bo'lgan jarayonga ta'sir qiladi;
+bunday holatda eskirish muddati AUTH_CLAIMS_MAX_AGE bilan cheklangan.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
+
+
+def _claims_max_age():
+    return getattr(settings, 'AUTH_CLAIMS_MAX_AGE', 300)
+
+
+def _row_key(user_id):
+    return f'accounts:user:{user_id}'
+
+
+def _changed_key(user_id):
+    return f'accounts:user-changed:{user_id}'
+
+
+def _user_model():
+    from .models import User
+    return User
+
+
+def get_user_row(user_id):
+    """Foydalanuvchi ustunlarini {attname: qiymat} ko'rinishida qaytaradi yoki None."""
+    key = _row_key(user_id)
+    row = cache.get(key)
+    if row is None:
+        User = _user_model()
+        fields = [field.attname for field in User._meta.concrete_fields]
+        row = User.objects.filter(pk=user_id).values(*fields, dormitory_id=F('dormitory__id')).first()
+        if row is None:
+            return None
+        cache.set(key, row, getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 60))
+    return row
+
+
+def invalidate_user(user_id):
+    if user_id is None:
+        return
+    cache.delete(_row_key(user_id))
+    # AUTH_CLAIMS_MAX_AGE dan eski claim'larga baribir ishonilmaydi, belgi ham shuncha yashaydi
+    cache.set(_changed_key(user_id), time.time(), _claims_max_age())
+
+
+def claims_are_fresh(user_id, claims_at):
+    if claims_at is None or time.time() - claims_at > _claims_max_age():
+        return False
+    changed_at = cache.get(_changed_key(user_id))
+    return changed_at is None or claims_at > changed_at
+
+
+def attach_dormitory(user, dormitory_id):
+    """user.dormitory ni so'rovsiz ishlatish uchun faqat id si bor yotoqxona obyektini bog'laydi."""
+    from dormitories.models import Dormitory
+
+    dormitory = None
+    if dormitory_id is not None:
+        dormitory = Dormitory.from_db(DEFAULT_DB_ALIAS, ['id'], [dormitory_id])
+        Dormitory.admin.field.set_cached_value(dormitory, user)
+    type(user).dormitory.related.set_cached_value(user, dormitory)
+
+
+def user_from_row(row):
+    User = _user_model()
+    fields = [field.attname for field in User._meta.concrete_fields]
+    user = User.from_db(DEFAULT_DB_ALIAS, fields, [row[name] for name in fields])
+    attach_dormitory(user, row['dormitory_id'])
+    return user
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_userprofile_profile_picture_variants'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('reset_password_token__isnull', False)), fields=['reset_password_token'], name='user_reset_token_idx'),
+        ),
+    ]
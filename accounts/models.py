@@ -44,6 +44,23 @@ class User(AbstractUser):
         verbose_name = _('user')
         verbose_name_plural = _('users')
         ordering = ['-date_joined']
+        indexes = [
+            # Parolni tiklash tokeni bo'yicha qidiruv; token faqat kam foydalanuvchida bo'ladi
+            models.Index(fields=['reset_password_token'], name='user_reset_token_idx',
+                         condition=models.Q(reset_password_token__isnull=False)),
+        ]
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # Token claim'laridan qurilgan foydalanuvchining yetishmayotgan ustunlari keshdan olinadi
+        if fields is not None and from_queryset is None and getattr(self, '_from_token', False):
+            from .cache import get_user_row
+
+            row = get_user_row(self.pk)
+            if row is not None:
+                for name in self.get_deferred_fields():
+                    setattr(self, name, row[name])
+                return
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
 
     @property
     def is_super_admin(self):
@@ -68,6 +85,7 @@ class UserProfile(models.Model):
         verbose_name=_('Phone number')
     )
     profile_picture = models.ImageField(upload_to='profile_pics/', blank=True, null=True)
+    profile_picture_variants = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
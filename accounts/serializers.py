@@ -1,6 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+
+from joybor.serializers import ImageVariantsField
 from .models import UserProfile
+from .tokens import RoleRefreshToken
 
 User = get_user_model()
 
@@ -11,10 +15,11 @@ class UserProfileSerializer(serializers.ModelSerializer):
     """
     role = serializers.SerializerMethodField()
     status = serializers.SerializerMethodField()
+    profile_picture_variants = ImageVariantsField('profile_picture')
 
     class Meta:
         model = UserProfile
-        fields = ['id', 'user', 'phone_number', 'profile_picture', 'status', 'role']
+        fields = ['id', 'user', 'phone_number', 'profile_picture', 'profile_picture_variants', 'status', 'role']
         read_only_fields = ['user', 'status', 'role']
 
     def get_role(self, obj):
@@ -156,3 +161,11 @@ class DormitoryAdminCreateSerializer(serializers.ModelSerializer):
             role=User.Role.IS_ADMIN  # Set the role correctly for dormitory admin
         )
         return user
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = RoleRefreshToken
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RoleRefreshToken
@@ -17,6 +17,8 @@ from django.utils import timezone
 from datetime import timedelta
 from rest_framework import status
 from django.urls import reverse
+from django.core import mail
+from joybor.models import Job
 
 
 
@@ -382,10 +384,15 @@ class UserViewSetTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
     def test_reset_password_request_valid(self):
-        response = self.client.post(reverse('user-reset-password-request'), {
-            'email': self.student.email
-        })
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('user-reset-password-request'), {
+                'email': self.student.email
+            })
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Xat so'rov ichida emas, fon vazifasida yuboriladi
+        self.assertEqual(mail.outbox, [])
+        job = Job.objects.get(name='joybor.tasks.send_email')
+        self.assertEqual(job.args[2], [self.student.email])
 
     def test_reset_password_request_invalid_email(self):
         response = self.client.post(reverse('user-reset-password-request'), {
@@ -425,4 +432,51 @@ class UserViewSetTests(APITestCase):
 
         self.authenticate(self.student)
         response = self.client.get(reverse('user-list'))
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+class ClaimsJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        from dormitories.models import Dormitory
+
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass1234',
+                                              role=User.Role.IS_ADMIN)
+        self.dormitory = Dormitory.objects.create(name='Dorm', address='-', number_of_floors=1, admin=self.admin)
+        response = self.client.post(reverse('token_obtain_pair'), {'username': 'admin', 'password': 'pass1234'})
+        self.access = response.data['access']
+
+    def authenticate(self):
+        from accounts.authentication import ClaimsJWTAuthentication
+
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {self.access}')
+        user, _ = ClaimsJWTAuthentication().authenticate(request)
+        return user
+
+    def test_authentication_without_queries(self):
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+            self.assertTrue(user.is_dormitory_admin)
+            self.assertEqual(user.dormitory.pk, self.dormitory.pk)
+            self.assertEqual(user.email, 'admin@example.com')
+
+    def test_role_change_invalidates_claims(self):
+        self.admin.role = User.Role.IS_STUDENT
+        self.admin.save()
+
+        user = self.authenticate()
+        self.assertFalse(user.is_dormitory_admin)
+
+    def test_dormitory_admin_change_invalidates_claims(self):
+        self.dormitory.admin = None
+        self.dormitory.save()
+
+        user = self.authenticate()
+        self.assertFalse(hasattr(user, 'dormitory') and user.dormitory)
+
+    def test_inactive_user_rejected(self):
+        from rest_framework.exceptions import AuthenticationFailed
+
+        self.admin.is_active = False
+        self.admin.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
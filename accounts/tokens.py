@@ -0,0 +1,29 @@
+import time
+
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .cache import get_user_row
+
+# Autentifikatsiya bazaga murojaatsiz ishlashi uchun access token'ga yoziladigan claim'lar
+USER_CLAIMS = ('username', 'role', 'status', 'dormitory', 'claims_at')
+
+
+def set_user_claims(token, row):
+    token['username'] = row['username']
+    token['role'] = row['role']
+    token['status'] = row['status']
+    token['dormitory'] = row['dormitory_id']
+    token['claims_at'] = time.time()
+
+
+class RoleRefreshToken(RefreshToken):
+    """Har bir yangi access token'ga foydalanuvchining joriy role/status/yotoqxona claim'larini yozadi."""
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        row = get_user_row(self.payload[api_settings.USER_ID_CLAIM])
+        if row is not None:
+            set_user_claims(access, row)
+        return access
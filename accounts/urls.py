@@ -1,6 +1,7 @@
 from django.urls import path, include
 from .views import UserViewSet, UserProfileViewSet
 from rest_framework.routers import DefaultRouter
+from joybor.asyncviews import router_urls
 
 router = DefaultRouter()
 
@@ -8,5 +9,5 @@ router.register('user', UserViewSet)
 router.register('userprofile', UserProfileViewSet)
 
 urlpatterns = [
-    path('', include(router.urls))
+    path('', include(router_urls(router)))
 ]
\ No newline at end of file
@@ -7,7 +7,6 @@ from django.contrib.auth import authenticate
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.utils import timezone
 from django.utils.crypto import get_random_string
-from django.core.mail import send_mail
 from datetime import timedelta
 from django.conf import settings
 
@@ -22,7 +21,11 @@ from .serializers import (
     DormitoryAdminCreateSerializer, UserProfileSerializer,
 )
 from .permissions import CanCreateDormitoryAdmin, IsSelfOrSuperAdmin, IsSuperAdmin, IsDormitoryAdmin
-from rest_framework_simplejwt.tokens import RefreshToken
+from .tokens import RoleRefreshToken
+
+from joybor.asyncviews import AsyncReadMixin
+from joybor.mixins import OptimizedQuerysetMixin
+from joybor.tasks import send_email
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -91,7 +94,7 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
-            refresh = RefreshToken.for_user(user)
+            refresh = RoleRefreshToken.for_user(user)
             return Response({
                 'user': UserSerializer(user).data,
                 'refresh': str(refresh),
@@ -109,7 +112,7 @@ class UserViewSet(viewsets.ModelViewSet):
                 password=serializer.validated_data['password']
             )
             if user:
-                refresh = RefreshToken.for_user(user)
+                refresh = RoleRefreshToken.for_user(user)
                 return Response({
                     'user': UserSerializer(user).data,
                     'refresh': str(refresh),
@@ -155,12 +158,11 @@ class UserViewSet(viewsets.ModelViewSet):
                 user.save()
 
                 reset_link = f"{settings.FRONTEND_URL}/reset-password/{token}"
-                send_mail(
+                # Xat fon vazifasida yuboriladi, javob SMTP ni kutmaydi
+                send_email.enqueue(
                     'Password Reset Request',
                     f'Click the link to reset your password: {reset_link}',
-                    settings.DEFAULT_FROM_EMAIL,
                     [email],
-                    fail_silently=False,
                 )
                 return Response({'status': 'Reset email sent'})
             except User.DoesNotExist:
@@ -211,10 +213,12 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserProfileViewSet(viewsets.ModelViewSet):
+class UserProfileViewSet(AsyncReadMixin, OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = UserProfile.objects.all()
     serializer_class = UserProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # get_role / get_status obj.user ni o'qiydi
+    extra_select_related = ('user',)
 
     def get_permissions(self):
         """
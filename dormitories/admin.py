@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Dormitory, Floor, Room, DormitoryImage
+from .models import Dormitory, Floor, Room, DormitoryImage, DormitoryVacancy
 
 
 class DormitoryAdmin(admin.ModelAdmin):
@@ -10,8 +10,9 @@ class DormitoryAdmin(admin.ModelAdmin):
     ordering = ('-created_at',)
     fields = (
     'name', 'university', 'address', 'number_of_floors', 'description', 'admin',
-    'status', 'contact_info', 'latitude', 'longitude', 'created_at', 'updated_at')
-    readonly_fields = ('created_at', 'updated_at')
+    'status', 'contact_info', 'latitude', 'longitude', 'total_capacity', 'current_occupancy', 'created_at',
+    'updated_at')
+    readonly_fields = ('total_capacity', 'current_occupancy', 'created_at', 'updated_at')
 
     def get_fieldsets(self, request, obj=None):
         fieldsets = super().get_fieldsets(request, obj)
@@ -25,7 +26,8 @@ class DormitoryAdmin(admin.ModelAdmin):
 
 
 class FloorAdmin(admin.ModelAdmin):
-    list_display = ('name', 'dormitory', 'gender_type', 'created_at')
+    list_display = ('name', 'dormitory', 'gender_type', 'total_capacity', 'current_occupancy', 'created_at')
+    readonly_fields = ('total_capacity', 'current_occupancy')
     list_filter = ('gender_type', 'dormitory')
     search_fields = ('dormitory__name', 'name')
     ordering = ('dormitory',)
@@ -36,6 +38,7 @@ class RoomAdmin(admin.ModelAdmin):
     list_filter = ('floor',)
     search_fields = ('room_number', 'dormitory__name')
     ordering = ('floor', 'room_number')
+    readonly_fields = ('current_occupancy',)
 
     def save_model(self, request, obj, form, change):
         if obj.current_occupancy > obj.capacity:
@@ -48,7 +51,17 @@ class DormitoryImageAdmin(admin.ModelAdmin):
     search_fields = ('dormitory__name',)
 
 
+class DormitoryVacancyAdmin(admin.ModelAdmin):
+    list_display = ('dormitory', 'gender_type', 'status', 'total_capacity', 'current_occupancy', 'free_beds',
+                    'updated_at')
+    list_filter = ('gender_type', 'status', 'university')
+    search_fields = ('dormitory__name',)
+    readonly_fields = ('dormitory', 'university', 'gender_type', 'status', 'total_capacity', 'current_occupancy',
+                       'free_beds', 'updated_at')
+
+
 admin.site.register(Dormitory, DormitoryAdmin)
 admin.site.register(Floor, FloorAdmin)
 admin.site.register(Room, RoomAdmin)
 admin.site.register(DormitoryImage, DormitoryImageAdmin)
+admin.site.register(DormitoryVacancy, DormitoryVacancyAdmin)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DormitoriesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dormitories'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,13 @@
+import django_filters
+
+from .models import DormitoryVacancy, Floor
+
+
+class DormitoryVacancyFilter(django_filters.FilterSet):
+    university = django_filters.NumberFilter(field_name='university_id')
+    gender = django_filters.ChoiceFilter(field_name='gender_type', choices=Floor.GENDER_CHOICES)
+    min_free_beds = django_filters.NumberFilter(field_name='free_beds', lookup_expr='gte')
+
+    class Meta:
+        model = DormitoryVacancy
+        fields = ['university', 'gender', 'min_free_beds']
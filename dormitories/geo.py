@@ -0,0 +1,55 @@
+"""
+Yaqin atrofdagi yotoqxonalarni qidirish uchun yordamchi funksiyalar.
+
+Avval (latitude, longitude) indeksidan foydalanib bounding box bo'yicha nomzodlar
+olinadi, so'ng aniq haversine masofa SQL ichida bitta ifoda bilan hisoblanadi.
+Trigonometrik funksiyalar SQLite uchun Django tomonidan ro'yxatdan o'tkaziladi,
+PostgreSQL'da esa ular o'rnatilgan.
+"""
+import math
+
+from django.db.models import ExpressionWrapper, F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """(min_lat, max_lat, min_lng, max_lng). Qutb yoki 180° meridian kesilsa uzunlik None bo'ladi."""
+    lat_delta = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - lat_delta, latitude + lat_delta
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90), min(max_lat, 90), None, None
+
+    lng_delta = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(latitude))))
+    min_lng, max_lng = longitude - lng_delta, longitude + lng_delta
+    if min_lng < -180 or max_lng > 180:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, min_lng, max_lng
+
+
+def haversine_distance(latitude, longitude, lat_field='latitude', lng_field='longitude'):
+    """Berilgan nuqtadan kilometrdagi masofani hisoblaydigan SQL ifoda."""
+    lat = Radians(F(lat_field))
+    lng = Radians(F(lng_field))
+    origin_lat = Value(math.radians(latitude), output_field=FloatField())
+    origin_lng = Value(math.radians(longitude), output_field=FloatField())
+    cos_origin = Value(math.cos(math.radians(latitude)), output_field=FloatField())
+
+    a = Power(Sin((lat - origin_lat) / 2), 2) + cos_origin * Cos(lat) * Power(Sin((lng - origin_lng) / 2), 2)
+    return ExpressionWrapper(2 * EARTH_RADIUS_KM * ASin(Sqrt(a)), output_field=FloatField())
+
+
+def nearby(queryset, latitude, longitude, radius_km):
+    """Radius ichidagi yozuvlarni `distance` (km) bilan, yaqinlik bo'yicha tartiblab qaytaradi."""
+    min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius_km)
+    queryset = queryset.filter(latitude__range=(min_lat, max_lat))
+    if min_lng is not None:
+        queryset = queryset.filter(longitude__range=(min_lng, max_lng))
+    else:
+        queryset = queryset.filter(longitude__isnull=False)
+    return (
+        queryset.annotate(distance=haversine_distance(latitude, longitude))
+        .filter(distance__lte=radius_km)
+        .order_by('distance')
+    )
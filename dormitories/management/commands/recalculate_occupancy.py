@@ -0,0 +1,86 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from dormitories.models import Dormitory, Floor, Room
+from dormitories.vacancy import refresh_dormitory_vacancies
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class Command(BaseCommand):
+    help = "Xona, qavat va yotoqxona bandlik hisoblagichlarini qayta hisoblaydi va farqlarni tuzatadi."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help="Bitta tranzaksiyada tekshiriladigan yozuvlar soni.")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Faqat farqlarni ko'rsatadi, bazaga yozmaydi.")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        dry_run = options['dry_run']
+
+        # Tartib muhim: qavatlar xonalardan, yotoqxonalar qavatlardan hisoblanadi
+        steps = [
+            (Room, {'current_occupancy': Count('student')}),
+            (Floor, {
+                'total_capacity': Coalesce(Sum('floors__capacity'), Value(0)),
+                'current_occupancy': Coalesce(Sum('floors__current_occupancy'), Value(0)),
+            }),
+            (Dormitory, {
+                'total_capacity': Coalesce(Sum('floors__total_capacity'), Value(0)),
+                'current_occupancy': Coalesce(Sum('floors__current_occupancy'), Value(0)),
+            }),
+        ]
+        for model, expected in steps:
+            fixed = self.recalculate(model, expected, chunk_size, dry_run)
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {fixed} ta yozuv tuzatildi")
+
+        if not dry_run:
+            for dormitory_id in Dormitory.objects.values_list('pk', flat=True).iterator(chunk_size=chunk_size):
+                refresh_dormitory_vacancies(dormitory_id)
+            self.stdout.write("Bo'sh joylar indeksi qayta qurildi")
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING("Dry run: o'zgarishlar saqlanmadi."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Bandlik hisoblagichlari yangilandi."))
+
+    def recalculate(self, model, expected, chunk_size, dry_run):
+        fields = list(expected)
+        annotations = {f'expected_{field}': expression for field, expression in expected.items()}
+        ids = model.objects.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=chunk_size)
+        fixed = 0
+
+        for chunk in chunked(ids, chunk_size):
+            with transaction.atomic():
+                # Qatorlar qulflanadi, shunda hisoblash paytida F() yangilanishlar yo'qolmaydi
+                list(model.objects.select_for_update().filter(pk__in=chunk).values_list('pk', flat=True))
+                rows = model.objects.filter(pk__in=chunk).only('pk', *fields).annotate(**annotations)
+
+                drifted = []
+                for row in rows:
+                    changed = False
+                    for field in fields:
+                        value = getattr(row, f'expected_{field}')
+                        if getattr(row, field) != value:
+                            setattr(row, field, value)
+                            changed = True
+                    if changed:
+                        row.updated_at = timezone.now()
+                        drifted.append(row)
+
+                if drifted and not dry_run:
+                    model.objects.bulk_update(drifted, fields + ['updated_at'])
+                fixed += len(drifted)
+
+        return fixed
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:33
+
+from django.db import migrations, models
+from django.db.models import Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_totals(apps, schema_editor):
+    Floor = apps.get_model('dormitories', 'Floor')
+    Dormitory = apps.get_model('dormitories', 'Dormitory')
+
+    for floor in Floor.objects.annotate(
+            capacity_sum=Coalesce(Sum('floors__capacity'), Value(0)),
+            occupancy_sum=Coalesce(Sum('floors__current_occupancy'), Value(0)),
+    ).iterator():
+        Floor.objects.filter(pk=floor.pk).update(total_capacity=floor.capacity_sum,
+                                                 current_occupancy=floor.occupancy_sum)
+
+    for dormitory in Dormitory.objects.annotate(
+            capacity_sum=Coalesce(Sum('floors__total_capacity'), Value(0)),
+            occupancy_sum=Coalesce(Sum('floors__current_occupancy'), Value(0)),
+    ).iterator():
+        Dormitory.objects.filter(pk=dormitory.pk).update(total_capacity=dormitory.capacity_sum,
+                                                         current_occupancy=dormitory.occupancy_sum)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitories', '0002_alter_dormitory_admin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dormitory',
+            name='current_occupancy',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Current occupancy'),
+        ),
+        migrations.AddField(
+            model_name='dormitory',
+            name='total_capacity',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Total capacity'),
+        ),
+        migrations.AddField(
+            model_name='floor',
+            name='current_occupancy',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Current occupancy'),
+        ),
+        migrations.AddField(
+            model_name='floor',
+            name='total_capacity',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Total capacity'),
+        ),
+        migrations.AlterField(
+            model_name='room',
+            name='current_occupancy',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_totals, migrations.RunPython.noop),
+    ]
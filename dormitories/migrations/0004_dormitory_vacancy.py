@@ -0,0 +1,63 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def build_vacancies(apps, schema_editor):
+    Dormitory = apps.get_model('dormitories', 'Dormitory')
+    Floor = apps.get_model('dormitories', 'Floor')
+    DormitoryVacancy = apps.get_model('dormitories', 'DormitoryVacancy')
+
+    dormitories = {row['id']: row for row in Dormitory.objects.values('id', 'university_id', 'status')}
+    totals = (
+        Floor.objects.values('dormitory_id', 'gender_type')
+        .annotate(capacity=Sum('total_capacity'), occupancy=Sum('current_occupancy'))
+        .order_by()
+    )
+    DormitoryVacancy.objects.bulk_create([
+        DormitoryVacancy(
+            dormitory_id=row['dormitory_id'],
+            university_id=dormitories[row['dormitory_id']]['university_id'],
+            status=dormitories[row['dormitory_id']]['status'],
+            gender_type=row['gender_type'],
+            total_capacity=row['capacity'],
+            current_occupancy=row['occupancy'],
+            free_beds=max(row['capacity'] - row['occupancy'], 0),
+        )
+        for row in totals
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitories', '0003_occupancy_counters'),
+        ('universities', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DormitoryVacancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gender_type', models.CharField(choices=[('male', 'Male'), ('female', 'Female')], max_length=20, verbose_name='Gender type')),
+                ('status', models.CharField(choices=[('active', 'Active'), ('pending', 'Pending'), ('inactive', 'Inactive')], max_length=30, verbose_name='Status')),
+                ('total_capacity', models.PositiveIntegerField(default=0, verbose_name='Total capacity')),
+                ('current_occupancy', models.PositiveIntegerField(default=0, verbose_name='Current occupancy')),
+                ('free_beds', models.PositiveIntegerField(default=0, verbose_name='Free beds')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('dormitory', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vacancies', to='dormitories.dormitory')),
+                ('university', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='universities.university')),
+            ],
+            options={
+                'verbose_name': 'Dormitory vacancy',
+                'verbose_name_plural': 'Dormitory vacancies',
+                'ordering': ['-free_beds', 'dormitory'],
+                'indexes': [models.Index(condition=models.Q(('status', 'active')), fields=['university', 'gender_type', '-free_beds'], name='vacancy_university_idx'), models.Index(condition=models.Q(('status', 'active')), fields=['gender_type', '-free_beds'], name='vacancy_gender_idx')],
+                'constraints': [models.UniqueConstraint(fields=('dormitory', 'gender_type'), name='unique_dormitory_vacancy')],
+            },
+        ),
+        migrations.RunPython(build_vacancies, migrations.RunPython.noop),
+    ]
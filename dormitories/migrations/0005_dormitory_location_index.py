@@ -0,0 +1,20 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitories', '0004_dormitory_vacancy'),
+        ('universities', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dormitory',
+            index=models.Index(fields=['latitude', 'longitude'], name='dormitory_location_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:07
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_updated_at(apps, schema_editor):
+    # Mavjud qatorlar uchun migratsiya vaqti emas, yaratilgan vaqt olinadi
+    for model_name in ('Floor', 'Room'):
+        apps.get_model('dormitories', model_name).objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitories', '0005_dormitory_location_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='floor',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='room',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+    ]
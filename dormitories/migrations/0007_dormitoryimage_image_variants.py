@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitories', '0006_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dormitoryimage',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -1,12 +1,34 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
+from joybor.tenant import TenantManager
 from universities.models import University
 
 User = get_user_model()
 
 
-class Dormitory(models.Model):
+class CounterFieldsModel(models.Model):
+    """
+    Hisoblagich maydonlari (counter_fields) faqat F() orqali yangilanadi.
+    Oddiy save() ularni eski qiymat bilan qayta yozib yubormasligi uchun mavjud
+    yozuvni saqlashda bu maydonlar update_fields dan chiqarib tashlanadi.
+    """
+    counter_fields = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+
+class Dormitory(CounterFieldsModel):
     STATUS_CHOICES = (
         ('active', _('Active')),
         ('pending', _('Pending')),
@@ -25,9 +47,13 @@ class Dormitory(models.Model):
     contact_info = models.TextField(blank=True, null=True, verbose_name=_('Contact information'))
     latitude = models.FloatField(blank=True, null=True, verbose_name=_('Latitude'))
     longitude = models.FloatField(blank=True, null=True, verbose_name=_('Longitude'))
+    total_capacity = models.PositiveIntegerField(default=0, editable=False, verbose_name=_('Total capacity'))
+    current_occupancy = models.PositiveIntegerField(default=0, editable=False, verbose_name=_('Current occupancy'))
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    counter_fields = ('total_capacity', 'current_occupancy')
+
     def __str__(self):
         return f"{self.name}) - {self.university.name if self.university else 'No University'}"
 
@@ -35,9 +61,12 @@ class Dormitory(models.Model):
         verbose_name = _('Dormitory')
         verbose_name_plural = _('Dormitories')
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['latitude', 'longitude'], name='dormitory_location_idx'),
+        ]
 
 
-class Floor(models.Model):
+class Floor(CounterFieldsModel):
     GENDER_CHOICES = (
         ('male', _('Male')),
         ('female', _('Female')),
@@ -51,7 +80,15 @@ class Floor(models.Model):
         default='female',
         verbose_name=_('Gender type')
     )
+    total_capacity = models.PositiveIntegerField(default=0, editable=False, verbose_name=_('Total capacity'))
+    current_occupancy = models.PositiveIntegerField(default=0, editable=False, verbose_name=_('Current occupancy'))
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    counter_fields = ('total_capacity', 'current_occupancy')
+    tenant_field = 'dormitory_id'
+
+    objects = TenantManager()
 
     def __str__(self):
         return f"Floor {self.name} - {self.dormitory.name}"
@@ -63,19 +100,48 @@ class Floor(models.Model):
         unique_together = ('dormitory', 'name')
 
 
-class Room(models.Model):
+class Room(CounterFieldsModel):
     dormitory = models.ForeignKey(Dormitory, on_delete=models.CASCADE, related_name='dormitories', blank=True,
                                   null=True)
     floor = models.ForeignKey(Floor, related_name='floors', on_delete=models.CASCADE)
     room_number = models.CharField(max_length=10)
     capacity = models.PositiveIntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
-    current_occupancy = models.PositiveSmallIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    current_occupancy = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    counter_fields = ('current_occupancy',)
+    tenant_field = 'dormitory_id'
+
+    objects = TenantManager()
 
     @property
     def is_full(self):
         return self.current_occupancy >= self.capacity
 
+    def save(self, *args, **kwargs):
+        """Sig'im yoki qavat o'zgarsa, qavat va yotoqxona jami qiymatlarini ham yangilaydi."""
+        from .occupancy import shift_floor_totals
+
+        with transaction.atomic():
+            if self._state.adding:
+                super().save(*args, **kwargs)
+                shift_floor_totals(self.floor_id, capacity=self.capacity, occupancy=self.current_occupancy)
+                return
+
+            previous = (
+                Room.objects.select_for_update()
+                .values('floor_id', 'capacity', 'current_occupancy')
+                .get(pk=self.pk)
+            )
+            super().save(*args, **kwargs)
+            if previous['floor_id'] != self.floor_id:
+                shift_floor_totals(previous['floor_id'], capacity=-previous['capacity'],
+                                   occupancy=-previous['current_occupancy'])
+                shift_floor_totals(self.floor_id, capacity=self.capacity, occupancy=previous['current_occupancy'])
+            else:
+                shift_floor_totals(self.floor_id, capacity=self.capacity - previous['capacity'])
+
     class Meta:
         unique_together = ('floor', 'room_number')
         verbose_name = _('Room')
@@ -89,6 +155,40 @@ class Room(models.Model):
 class DormitoryImage(models.Model):
     dormitory = models.ForeignKey(Dormitory, related_name='images', on_delete=models.CASCADE)
     image = models.ImageField(upload_to='dormitories/')
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         return f"{self.dormitory.name} Image"
+
+
+class DormitoryVacancy(models.Model):
+    """
+    Bo'sh joylar indeksi: har bir yotoqxona va jins bo'yicha bitta qator.
+    Qavat hisoblagichlaridan dormitories.vacancy orqali yangilanadi, qo'lda tahrirlanmaydi.
+    """
+    dormitory = models.ForeignKey(Dormitory, on_delete=models.CASCADE, related_name='vacancies')
+    university = models.ForeignKey(University, on_delete=models.SET_NULL, null=True, blank=True,
+                                   related_name='+')
+    gender_type = models.CharField(max_length=20, choices=Floor.GENDER_CHOICES, verbose_name=_('Gender type'))
+    status = models.CharField(max_length=30, choices=Dormitory.STATUS_CHOICES, verbose_name=_('Status'))
+    total_capacity = models.PositiveIntegerField(default=0, verbose_name=_('Total capacity'))
+    current_occupancy = models.PositiveIntegerField(default=0, verbose_name=_('Current occupancy'))
+    free_beds = models.PositiveIntegerField(default=0, verbose_name=_('Free beds'))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Dormitory vacancy')
+        verbose_name_plural = _('Dormitory vacancies')
+        ordering = ['-free_beds', 'dormitory']
+        constraints = [
+            models.UniqueConstraint(fields=['dormitory', 'gender_type'], name='unique_dormitory_vacancy'),
+        ]
+        indexes = [
+            models.Index(fields=['university', 'gender_type', '-free_beds'], name='vacancy_university_idx',
+                         condition=models.Q(status='active')),
+            models.Index(fields=['gender_type', '-free_beds'], name='vacancy_gender_idx',
+                         condition=models.Q(status='active')),
+        ]
+
+    def __str__(self):
+        return f"{self.dormitory_id} ({self.gender_type}) - {self.free_beds}"
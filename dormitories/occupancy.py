@@ -0,0 +1,79 @@
+"""
+Xona, qavat va yotoqxona bandlik hisoblagichlari.
+
+Hisoblagichlar faqat F() orqali o'zgartiriladi, xonalar esa o'zgartirishdan oldin
+id tartibida qulflanadi (select_for_update), shuning uchun parallel joylashtirishlar
+bir-birining qiymatini yozib yubormaydi va xona sig'imidan oshib ketmaydi.
+"""
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import Dormitory, Floor, Room
+from .vacancy import schedule_floor_vacancy_refresh
+
+
+def _lock_rooms(room_ids):
+    room_ids = sorted({room_id for room_id in room_ids if room_id is not None})
+    if not room_ids:
+        return {}
+    rooms = (
+        Room.objects.select_for_update()
+        .filter(id__in=room_ids)
+        .order_by('id')
+        .values('id', 'floor_id', 'capacity', 'current_occupancy')
+    )
+    return {room['id']: room for room in rooms}
+
+
+def shift_floor_totals(floor_id, capacity=0, occupancy=0):
+    """Qavat va uning yotoqxonasidagi umumiy sig'im/bandlikni delta qiymatga o'zgartiradi."""
+    updates, guards = {}, {}
+    for field, delta in (('total_capacity', capacity), ('current_occupancy', occupancy)):
+        if delta:
+            updates[field] = F(field) + delta
+        if delta < 0:
+            # Hisoblagich manfiy bo'lib qolmasligi uchun; farqni recalculate_occupancy tuzatadi
+            guards[f'{field}__gte'] = -delta
+    if not updates or floor_id is None:
+        return
+    # update() auto_now ni yangilamaydi, ETag/Last-Modified validatorlari uchun qo'lda
+    updates['updated_at'] = timezone.now()
+    Floor.objects.filter(pk=floor_id, **guards).update(**updates)
+    Dormitory.objects.filter(floors__id=floor_id, **guards).update(**updates)
+    schedule_floor_vacancy_refresh(floor_id)
+
+
+def shift_room_occupancy(room, delta):
+    """
+    Xona bandligini delta ga o'zgartiradi. Xona to'lgan bo'lsa ValidationError.
+    Chaqiruvchi tranzaksiya ichida va xona qulflangan bo'lishi kerak.
+    """
+    rooms = Room.objects.filter(pk=room['id'])
+    if delta > 0:
+        # Qulflash imkoni bo'lmagan bazalarda ham sig'im shartli UPDATE bilan kafolatlanadi
+        rooms = rooms.filter(current_occupancy__lte=F('capacity') - delta)
+    else:
+        rooms = rooms.filter(current_occupancy__gte=-delta)
+    if rooms.update(current_occupancy=F('current_occupancy') + delta, updated_at=timezone.now()):
+        shift_floor_totals(room['floor_id'], occupancy=delta)
+    elif delta > 0:
+        raise ValidationError({'room': "Xonada bo'sh joy qolmagan."})
+
+
+def move_occupants(previous_room_id, room_id, count=1):
+    """
+    `count` ta talabani previous_room_id dan room_id ga ko'chiradi.
+    Biriktirish uchun previous_room_id=None, chiqarish uchun room_id=None.
+    """
+    if previous_room_id == room_id or count <= 0:
+        return
+    with transaction.atomic():
+        rooms = _lock_rooms([previous_room_id, room_id])
+        if room_id is not None:
+            if room_id not in rooms:
+                raise ValidationError({'room': "Xona topilmadi."})
+            shift_room_occupancy(rooms[room_id], count)
+        if previous_room_id in rooms:
+            shift_room_occupancy(rooms[previous_room_id], -count)
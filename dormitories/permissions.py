@@ -1,5 +1,7 @@
 from rest_framework import permissions
 
+from joybor.tenant import is_own_dormitory
+
 
 class DormitoryPermission(permissions.BasePermission):
 
@@ -13,7 +15,7 @@ class DormitoryPermission(permissions.BasePermission):
         if user.role == user.Role.IS_ADMIN:
             return True
 
-        if view.action in ['list', 'retrieve']:
+        if view.action in ['list', 'retrieve', 'nearby', 'export']:
             return True
 
         return False
@@ -71,7 +73,7 @@ class FloorPermission(permissions.BasePermission):
         # DormitoryAdmin faqat o‘zining dormitory’siga tegishli floor’ni tahrirlay oladi
         if user.role == user.Role.IS_ADMIN:
             if view.action in ['retrieve', 'update', 'destroy']:
-                return obj.dormitory.admin == user
+                return is_own_dormitory(request, obj.dormitory_id)
             return False
 
         # Student faqat floor’larni ko‘ra oladi, hech qanday o‘zgartirish kiritishga ruxsat yo‘q
@@ -97,13 +99,13 @@ class RoomPermission(permissions.BasePermission):
 
         # DormitoryAdmin faqat o‘zining dormitory’sidagi room’larni ko‘ra oladi
         if user.role == user.Role.IS_ADMIN:
-            if view.action in ['list', 'retrieve', 'create', 'update']:
+            if view.action in ['list', 'retrieve', 'create', 'update', 'export']:
                 return True
             return False
 
         # Student faqat ko‘ra oladi
         if user.role == user.Role.IS_STUDENT:
-            if view.action in ['list', 'retrieve']:
+            if view.action in ['list', 'retrieve', 'export']:
                 return True
             return False
 
@@ -119,9 +121,9 @@ class RoomPermission(permissions.BasePermission):
         # DormitoryAdmin faqat o‘zining dormitory’siga tegishli room’ni tahrirlay oladi
         if user.role == user.Role.IS_ADMIN:
             if view.action == 'retrieve':
-                return obj.dormitory.admin == user
+                return is_own_dormitory(request, obj.dormitory_id)
             if view.action in ['update', 'destroy']:
-                return obj.dormitory.admin == user
+                return is_own_dormitory(request, obj.dormitory_id)
             return False
 
         # Student faqat room’larni ko‘ra oladi, hech qanday o‘zgartirish kiritishga ruxsat yo‘q
@@ -1,7 +1,8 @@
 from rest_framework import serializers
 
 from accounts.serializers import UserSerializer
-from .models import Dormitory, Floor, Room, DormitoryImage
+from joybor.serializers import ExpandableFieldsMixin, ImageVariantsField, ReferenceFieldsMixin
+from .models import Dormitory, Floor, Room, DormitoryImage, DormitoryVacancy
 from universities.models import University
 from django.contrib.auth import get_user_model
 
@@ -15,12 +16,14 @@ class UniversityShortSerializer(serializers.ModelSerializer):
 
 
 class DormitoryImageSerializer(serializers.ModelSerializer):
+    image_variants = ImageVariantsField('image')
+
     class Meta:
         model = DormitoryImage
-        fields = ['id', 'image']
+        fields = ['id', 'image', 'image_variants']
 
 
-class DormitorySerializer(serializers.ModelSerializer):
+class DormitorySerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     university = UniversityShortSerializer(read_only=True)
     admin = UserSerializer(read_only=True)
     images = DormitoryImageSerializer(many=True, read_only=True)
@@ -29,23 +32,38 @@ class DormitorySerializer(serializers.ModelSerializer):
         model = Dormitory
         fields = ['id', 'name', 'university', 'address', 'number_of_floors', 'description', 'created_at',
                   'admin', 'status', 'contact_info', 'latitude', 'longitude', 'updated_at',
-                  'images']
+                  'images', 'total_capacity', 'current_occupancy']
+
+
+class DormitoryNearbySerializer(DormitorySerializer):
+    distance = serializers.FloatField(read_only=True)
+
+    class Meta(DormitorySerializer.Meta):
+        fields = DormitorySerializer.Meta.fields + ['distance']
+
 
+class NearbyQuerySerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lng = serializers.FloatField(min_value=-180, max_value=180)
+    radius = serializers.FloatField(min_value=0.1, max_value=100, default=5,
+                                    help_text="Qidiruv radiusi, km")
 
-class DormitoryCreateUpdateSerializer(serializers.ModelSerializer):
+
+class DormitoryCreateUpdateSerializer(ReferenceFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Dormitory
         fields = ['name', 'university', 'address', 'number_of_floors', 'description',
                   'status', 'contact_info', 'latitude', 'longitude']
 
 
-class FloorSerializer(serializers.ModelSerializer):
+class FloorSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     dormitory = DormitorySerializer(read_only=True)
     rooms = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
 
     class Meta:
         model = Floor
-        fields = ['id', 'name', 'dormitory', 'gender_type', 'created_at', 'rooms']
+        fields = ['id', 'name', 'dormitory', 'gender_type', 'created_at', 'updated_at', 'rooms', 'total_capacity',
+                  'current_occupancy']
 
 
 class FloorCreateUpdateSerializer(serializers.ModelSerializer):
@@ -54,22 +72,38 @@ class FloorCreateUpdateSerializer(serializers.ModelSerializer):
         fields = ['name', 'gender_type']
 
 
-class RoomSerializer(serializers.ModelSerializer):
+class RoomSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     dormitory = DormitorySerializer(read_only=True)
     floor = FloorSerializer(read_only=True)
 
     class Meta:
         model = Room
         fields = ['id', 'dormitory', 'floor', 'room_number', 'capacity', 'current_occupancy',
-                  'created_at', 'is_full']
+                  'created_at', 'updated_at', 'is_full']
 
 
 class RoomCreateUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Room
         fields = ['dormitory', 'floor', 'room_number', 'capacity', 'current_occupancy']
+        read_only_fields = ['current_occupancy']
 
     def validate(self, data):
-        if data['current_occupancy'] > data['capacity']:
+        # current_occupancy talabalar biriktirilganda tizim tomonidan yuritiladi
+        capacity = data.get('capacity')
+        if self.instance is not None and capacity is not None and capacity < self.instance.current_occupancy:
             raise serializers.ValidationError("Current occupancy cannot exceed room capacity.")
         return data
+
+
+class DormitoryVacancySerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    dormitory_name = serializers.CharField(source='dormitory.name', read_only=True)
+    expandable_fields = {
+        'dormitory': DormitorySerializer,
+    }
+
+    class Meta:
+        model = DormitoryVacancy
+        fields = ['dormitory', 'dormitory_name', 'university', 'gender_type', 'total_capacity',
+                  'current_occupancy', 'free_beds', 'updated_at']
+        read_only_fields = fields
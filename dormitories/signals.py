@@ -0,0 +1,78 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from accounts.cache import invalidate_user
+from joybor.images import variants_saved
+from .models import Dormitory, DormitoryImage, Floor, Room
+from .occupancy import shift_floor_totals
+from .vacancy import schedule_vacancy_refresh
+
+
+@receiver(pre_delete, sender=Room)
+def release_room_totals(sender, instance, **kwargs):
+    """
+    Xona o'chirilganda (qavat/yotoqxona bilan birga kaskad bo'lsa ham) uning
+    sig'imi va bandligini qavat va yotoqxona jami qiymatlaridan ayiradi.
+    """
+    room = (
+        Room.objects.select_for_update()
+        .filter(pk=instance.pk)
+        .values('floor_id', 'capacity', 'current_occupancy')
+        .first()
+    )
+    if room:
+        shift_floor_totals(room['floor_id'], capacity=-room['capacity'], occupancy=-room['current_occupancy'])
+
+
+@receiver(post_save, sender=Dormitory)
+def refresh_dormitory_vacancy(sender, instance, **kwargs):
+    # Holat yoki universitet o'zgarishi indeksga ham yozilishi kerak
+    schedule_vacancy_refresh(instance.pk)
+
+
+@receiver(post_save, sender=Floor)
+@receiver(post_delete, sender=Floor)
+def refresh_floor_vacancy(sender, instance, **kwargs):
+    schedule_vacancy_refresh(instance.dormitory_id)
+
+
+@receiver(pre_save, sender=Dormitory)
+def remember_previous_admin(sender, instance, **kwargs):
+    instance._previous_admin_id = (
+        Dormitory.objects.filter(pk=instance.pk).values_list('admin_id', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Dormitory)
+def invalidate_changed_admin(sender, instance, **kwargs):
+    # Admin almashsa eski va yangi adminning token'idagi `dormitory` claim'i eskiradi
+    previous_admin_id = getattr(instance, '_previous_admin_id', None)
+    if previous_admin_id != instance.admin_id:
+        invalidate_user(previous_admin_id)
+        invalidate_user(instance.admin_id)
+
+
+@receiver(post_delete, sender=Dormitory)
+def invalidate_deleted_admin(sender, instance, **kwargs):
+    invalidate_user(instance.admin_id)
+
+
+
+def touch_dormitory(dormitory_id):
+    # Rasmlar yotoqxona javobining bir qismi: updated_at ETag/Last-Modified'ni yangilaydi
+    Dormitory.objects.filter(pk=dormitory_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=DormitoryImage)
+@receiver(post_delete, sender=DormitoryImage)
+def touch_image_dormitory(sender, instance, **kwargs):
+    touch_dormitory(instance.dormitory_id)
+
+
+@receiver(variants_saved, sender=DormitoryImage)
+def touch_variant_dormitory(sender, pk, **kwargs):
+    dormitory_id = DormitoryImage.objects.filter(pk=pk).values_list('dormitory_id', flat=True).first()
+    if dormitory_id:
+        touch_dormitory(dormitory_id)
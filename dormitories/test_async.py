@@ -0,0 +1,96 @@
+import json
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.test import TestCase, override_settings
+from django.urls import include, path, resolve
+
+from accounts.models import User, UserProfile
+from accounts.tokens import RoleRefreshToken
+from accounts.urls import router as accounts_router
+from dormitories.models import Dormitory, Floor, Room
+from dormitories.urls import router as dormitories_router
+from joybor import refdata
+from joybor.asyncviews import async_read_urls
+from universities.models import Faculty, University
+from universities.urls import router as universities_router
+
+# Bir xil ViewSet'lar: /async/ ostida ASGI (async view), /sync/ ostida odatiy yo'llar
+urlpatterns = [
+    path('async/dormitories/', include(async_read_urls(dormitories_router) + dormitories_router.urls)),
+    path('async/universities/', include(async_read_urls(universities_router) + universities_router.urls)),
+    path('async/accounts/', include(async_read_urls(accounts_router) + accounts_router.urls)),
+    path('sync/dormitories/', include(dormitories_router.urls)),
+    path('sync/universities/', include(universities_router.urls)),
+    path('sync/accounts/', include(accounts_router.urls)),
+]
+
+
+@override_settings(ROOT_URLCONF='dormitories.test_async')
+class AsyncReadViewTest(TestCase):
+    def setUp(self):
+        refdata.clear()
+        self.addCleanup(refdata.clear)
+        self.superadmin = User.objects.create_user(username='super', email='super@example.com', password='pass1234',
+                                                   role=User.Role.IS_SUPERADMIN)
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass1234',
+                                              role=User.Role.IS_ADMIN)
+        UserProfile.objects.get_or_create(user=self.admin)
+        university = University.objects.create(name='TATU', city='Toshkent')
+        Faculty.objects.create(name='Dasturiy injiniring', university=university)
+        self.dormitory = Dormitory.objects.create(name='Dorm', address='-', number_of_floors=2, admin=self.admin,
+                                                  university=university)
+        floor = Floor.objects.create(name='1', dormitory=self.dormitory)
+        # PAGE_SIZE (10) dan ko'p, ikkinchi sahifa ham bo'lsin
+        for number in range(101, 113):
+            Room.objects.create(dormitory=self.dormitory, floor=floor, room_number=str(number), capacity=2)
+
+    def auth(self, user):
+        return {'authorization': f'Bearer {RoleRefreshToken.for_user(user).access_token}'}
+
+    async def get_both(self, path, user, **params):
+        headers = await sync_to_async(self.auth)(user)
+        async_response = await self.async_client.get(f'/async/{path}', params, headers=headers)
+        sync_response = await sync_to_async(self.client.get)(f'/sync/{path}', params, headers=headers)
+        return async_response, sync_response
+
+    def test_read_routes_are_async(self):
+        self.assertTrue(iscoroutinefunction(resolve('/async/dormitories/dormitory/').func))
+        self.assertTrue(iscoroutinefunction(resolve('/async/dormitories/room/1/').func))
+        self.assertFalse(iscoroutinefunction(resolve('/async/dormitories/floor/').func))
+
+    async def test_same_payload_as_sync_views(self):
+        paths = [
+            ('dormitories/dormitory/', self.admin, {}),
+            (f'dormitories/dormitory/{self.dormitory.pk}/', self.admin, {}),
+            ('dormitories/room/', self.admin, {'page': 2, 'ordering': '-room_number'}),
+            ('universities/university/', self.superadmin, {}),
+            ('universities/faculty/', self.superadmin, {'expand': 'university'}),
+            ('accounts/userprofile/', self.admin, {}),
+        ]
+        for path_, user, params in paths:
+            with self.subTest(path=path_):
+                async_response, sync_response = await self.get_both(path_, user, **params)
+                self.assertEqual(async_response.status_code, 200)
+                # next/previous havolalari faqat prefiksi bilan farq qiladi
+                self.assertEqual(json.loads(async_response.content.decode().replace('/async/', '/sync/')),
+                                 sync_response.json())
+                self.assertEqual(async_response.get('ETag'), sync_response.get('ETag'))
+
+    async def test_not_modified(self):
+        headers = await sync_to_async(self.auth)(self.admin)
+        response = await self.async_client.get('/async/dormitories/room/', headers=headers)
+        response = await self.async_client.get('/async/dormitories/room/',
+                                               headers={**headers, 'if-none-match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_errors(self):
+        response = await self.async_client.get('/async/dormitories/room/')
+        self.assertEqual(response.status_code, 401)
+
+        headers = await sync_to_async(self.auth)(self.admin)
+        response = await self.async_client.get('/async/dormitories/room/0/', headers=headers)
+        self.assertEqual(response.status_code, 404)
+
+        # Yozish amallari odatiy ViewSet'ga uzatiladi
+        response = await self.async_client.delete('/async/universities/university/0/', headers=headers)
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,106 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from dormitories.models import Dormitory, DormitoryImage, Floor, Room
+from dormitories.occupancy import move_occupants
+from joybor.images import save_variants
+
+
+class ConditionalRequestTest(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass1234',
+                                              role=User.Role.IS_ADMIN)
+        self.dormitory = Dormitory.objects.create(name='Dorm', address='-', number_of_floors=2, admin=self.admin)
+        self.floor = Floor.objects.create(name='1', dormitory=self.dormitory)
+        self.room = Room.objects.create(dormitory=self.dormitory, floor=self.floor, room_number='101', capacity=2)
+        self.client.force_authenticate(self.admin)
+
+    def test_list_not_modified(self):
+        response = self.client.get(reverse('room-list'))
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertIn('Last-Modified', response)
+
+        # Faqat bitta aggregate so'rov, serializatsiya yo'q
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('room-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        Room.objects.create(dormitory=self.dormitory, floor=self.floor, room_number='102', capacity=2)
+        response = self.client.get(reverse('room-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_detail_changes_with_occupancy(self):
+        url = reverse('room-detail', args=[self.room.pk])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # Hisoblagich F() bilan yangilansa ham validator o'zgaradi
+        move_occupants(None, self.room.pk)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['current_occupancy'], 1)
+
+    def test_stale_if_match_rejected(self):
+        url = reverse('floor-detail', args=[self.floor.pk])
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.put(url, {'name': '1', 'gender_type': 'male'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        new_etag = response['ETag']
+        self.assertNotEqual(new_etag, etag)
+
+        response = self.client.put(url, {'name': '1', 'gender_type': 'female'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.floor.refresh_from_db()
+        self.assertEqual(self.floor.gender_type, 'male')
+
+        response = self.client.delete(url, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(self.client.delete(url, HTTP_IF_MATCH=new_etag).status_code, 204)
+
+    def test_detail_changes_with_images(self):
+        url = reverse('dormitory-detail', args=[self.dormitory.pk])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        image = DormitoryImage.objects.create(dormitory=self.dormitory, image='dormitories/a.jpg')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['images']), 1)
+        self.assertNotEqual(response['ETag'], etag)
+
+        # Hosilalar update() bilan yoziladi - signal orqali yotoqxona ham yangilanadi
+        etag = response['ETag']
+        save_variants('dormitories.DormitoryImage', image.pk, 'image',
+                      {'source': 'dormitories/a.jpg', 'thumb': 'dormitories/a_thumb.jpg'})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        image.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['images'], [])
+
+    def test_detail_etag_follows_expand(self):
+        url = reverse('dormitory-detail', args=[self.dormitory.pk])
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, {'expand': 'admin'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        expanded_etag = response['ETag']
+        self.assertTrue(expanded_etag.startswith('W/"'))
+        self.assertNotEqual(expanded_etag, etag)
+        self.assertEqual(self.client.get(url, {'expand': 'admin'}, HTTP_IF_NONE_MATCH=expanded_etag).status_code, 304)
+
+        # Kengaytirilgan obyekt o'zgarsa ota obyektning updated_at i o'zgarmasa ham javob yangi
+        self.admin.first_name = 'Yangi'
+        self.admin.save()
+        response = self.client.get(url, {'expand': 'admin'}, HTTP_IF_NONE_MATCH=expanded_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], expanded_etag)
@@ -0,0 +1,39 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from dormitories.geo import bounding_box
+from dormitories.models import Dormitory
+
+
+class DormitoryNearbyTest(APITestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(username='student', email='student@example.com',
+                                                password='pass1234', role=User.Role.IS_STUDENT)
+        # Toshkent markazi atrofida
+        self.center = Dormitory.objects.create(name='Markaz', address='-', number_of_floors=1,
+                                               latitude=41.3111, longitude=69.2797)
+        self.chilonzor = Dormitory.objects.create(name='Chilonzor', address='-', number_of_floors=1,
+                                                  latitude=41.2856, longitude=69.2034)
+        self.samarkand = Dormitory.objects.create(name='Samarqand', address='-', number_of_floors=1,
+                                                  latitude=39.6542, longitude=66.9597)
+        Dormitory.objects.create(name='Koordinatasiz', address='-', number_of_floors=1)
+        self.client.force_authenticate(self.student)
+
+    def test_bounding_box_contains_radius(self):
+        min_lat, max_lat, min_lng, max_lng = bounding_box(41.3, 69.2, 10)
+        self.assertAlmostEqual(max_lat - 41.3, 0.0899, places=3)
+        self.assertTrue(min_lng < 69.2 - 0.0899 < max_lng)
+
+    def test_nearby_sorted_by_distance(self):
+        response = self.client.get(reverse('dormitory-nearby'), {'lat': 41.3111, 'lng': 69.2797, 'radius': 20})
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results']
+        self.assertEqual([row['id'] for row in results], [self.center.id, self.chilonzor.id])
+        self.assertAlmostEqual(results[0]['distance'], 0, places=3)
+        # Markaz - Chilonzor taxminan 7 km
+        self.assertAlmostEqual(results[1]['distance'], 6.97, delta=0.1)
+
+    def test_invalid_coordinates(self):
+        response = self.client.get(reverse('dormitory-nearby'), {'lat': 120, 'lng': 69.2})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,139 @@
+import threading
+
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from rest_framework.exceptions import ValidationError
+
+from accounts.models import User
+from dormitories.models import Dormitory, Floor, Room
+from students.models import Student
+from universities.models import University
+
+
+def create_dormitory():
+    university = University.objects.create(name='Test University', city='Toshkent')
+    admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass1234',
+                                     role=User.Role.IS_ADMIN)
+    return Dormitory.objects.create(name='Test Dormitory', university=university, address='Address',
+                                    number_of_floors=2, admin=admin)
+
+
+def create_student(dormitory, index, room=None):
+    return Student.objects.create(name=f'Talaba {index}', last_name='Valiyev', dormitory=dormitory,
+                                  passport_number=f'AA{index:07d}', emergency_contact_phone='+998901234567',
+                                  room=room)
+
+
+class OccupancyCounterTest(TestCase):
+    def setUp(self):
+        self.dormitory = create_dormitory()
+        self.floor = Floor.objects.create(name='1', dormitory=self.dormitory)
+        self.room_a = Room.objects.create(dormitory=self.dormitory, floor=self.floor, room_number='101', capacity=2)
+        self.room_b = Room.objects.create(dormitory=self.dormitory, floor=self.floor, room_number='102', capacity=3)
+
+    def assertCounters(self, room_a, room_b):
+        for obj in (self.room_a, self.room_b, self.floor, self.dormitory):
+            obj.refresh_from_db()
+        self.assertEqual(self.room_a.current_occupancy, room_a)
+        self.assertEqual(self.room_b.current_occupancy, room_b)
+        self.assertEqual(self.floor.current_occupancy, room_a + room_b)
+        self.assertEqual(self.dormitory.current_occupancy, room_a + room_b)
+
+    def test_room_capacity_totals(self):
+        self.floor.refresh_from_db()
+        self.dormitory.refresh_from_db()
+        self.assertEqual(self.floor.total_capacity, 5)
+        self.assertEqual(self.dormitory.total_capacity, 5)
+
+        self.room_a.capacity = 4
+        self.room_a.save()
+        self.dormitory.refresh_from_db()
+        self.assertEqual(self.dormitory.total_capacity, 7)
+
+        self.room_b.delete()
+        self.dormitory.refresh_from_db()
+        self.assertEqual(self.dormitory.total_capacity, 4)
+
+    def test_assign_move_and_delete_student(self):
+        student = create_student(self.dormitory, 1, room=self.room_a)
+        self.assertCounters(1, 0)
+
+        student.room = self.room_b
+        student.save()
+        self.assertCounters(0, 1)
+
+        student.delete()
+        self.assertCounters(0, 0)
+
+    def test_full_room_rejects_student(self):
+        create_student(self.dormitory, 1, room=self.room_a)
+        create_student(self.dormitory, 2, room=self.room_a)
+        with self.assertRaises(ValidationError):
+            create_student(self.dormitory, 3, room=self.room_a)
+        self.assertCounters(2, 0)
+
+    def test_dormitory_save_keeps_counters(self):
+        stale = Dormitory.objects.get(pk=self.dormitory.pk)
+        create_student(self.dormitory, 1, room=self.room_a)
+        stale.name = 'Yangi nom'
+        stale.save()
+        self.assertCounters(1, 0)
+
+    def test_recalculate_occupancy_fixes_drift(self):
+        create_student(self.dormitory, 1, room=self.room_a)
+        Room.objects.filter(pk=self.room_b.pk).update(current_occupancy=3)
+        Floor.objects.filter(pk=self.floor.pk).update(total_capacity=0, current_occupancy=10)
+
+        call_command('recalculate_occupancy', chunk_size=1, stdout=open('/dev/null', 'w'))
+
+        self.assertCounters(1, 0)
+        self.floor.refresh_from_db()
+        self.assertEqual(self.floor.total_capacity, 5)
+
+
+class ConcurrentAssignmentTest(TransactionTestCase):
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest("Parallel ulanishlar uchun faylga yoziladigan test bazasi kerak")
+
+    def test_parallel_assignments_do_not_overfill_room(self):
+        dormitory = create_dormitory()
+        floor = Floor.objects.create(name='1', dormitory=dormitory)
+        room = Room.objects.create(dormitory=dormitory, floor=floor, room_number='101', capacity=3)
+        students = [create_student(dormitory, index) for index in range(8)]
+
+        barrier = threading.Barrier(len(students))
+        results = []
+
+        def assign(student_id):
+            barrier.wait()
+            try:
+                while True:
+                    try:
+                        student = Student.objects.get(pk=student_id)
+                        student.room_id = room.pk
+                        student.save()
+                        results.append(True)
+                        break
+                    except OperationalError:
+                        # SQLite bir vaqtda faqat bitta yozuvchiga ruxsat beradi
+                        continue
+                    except ValidationError:
+                        results.append(False)
+                        break
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=assign, args=(student.pk,)) for student in students]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        room.refresh_from_db()
+        floor.refresh_from_db()
+        self.assertEqual(results.count(True), 3)
+        self.assertEqual(room.current_occupancy, 3)
+        self.assertEqual(floor.current_occupancy, 3)
+        self.assertEqual(Student.objects.filter(room=room).count(), 3)
@@ -0,0 +1,68 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from dormitories.models import Dormitory, Floor, Room
+
+
+class TenantScopeTest(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass1234',
+                                              role=User.Role.IS_ADMIN)
+        other_admin = User.objects.create_user(username='other', email='other@example.com', password='pass1234',
+                                               role=User.Role.IS_ADMIN)
+        self.dormitory = Dormitory.objects.create(name='Dorm', address='-', number_of_floors=2, admin=self.admin)
+        other = Dormitory.objects.create(name='Other', address='-', number_of_floors=1, admin=other_admin)
+        self.floor = Floor.objects.create(name='1', dormitory=self.dormitory)
+        self.room = Room.objects.create(dormitory=self.dormitory, floor=self.floor, room_number='101', capacity=2)
+        other_floor = Floor.objects.create(name='1', dormitory=other)
+        self.other_room = Room.objects.create(dormitory=other, floor=other_floor, room_number='101', capacity=2)
+        self.client.force_authenticate(self.admin)
+
+    def dormitory_lookups(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(url, data, format='json')
+        lookups = [query['sql'] for query in queries if query['sql'].startswith('SELECT')
+                   and 'FROM "dormitories_dormitory"' in query['sql']]
+        return response, lookups
+
+    def test_dormitory_resolved_once_per_request(self):
+        # Keshsiz foydalanuvchi: yotoqxona id si so'rov boshida bir marta aniqlanadi
+        self.client.force_authenticate(User.objects.get(pk=self.admin.pk))
+        response, lookups = self.dormitory_lookups(
+            'put', reverse('room-detail', args=[self.room.pk]),
+            {'floor': self.floor.pk, 'room_number': '101', 'capacity': 4},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(lookups), 1)
+
+        self.client.force_authenticate(User.objects.get(pk=self.admin.pk))
+        response, lookups = self.dormitory_lookups(
+            'post', reverse('room-list'), {'floor': self.floor.pk, 'room_number': '102', 'capacity': 3},
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(lookups), 1)
+        self.assertEqual(Room.objects.get(room_number='102').dormitory_id, self.dormitory.pk)
+
+    def test_floor_create_single_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.post(reverse('floor-list'), {'name': '2'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Floor.objects.filter(name='2', dormitory=self.dormitory).exists())
+
+    def test_other_dormitory_hidden(self):
+        response = self.client.get(reverse('room-list'))
+        self.assertEqual([room['id'] for room in response.data['results']], [self.room.pk])
+
+        response = self.client.put(reverse('room-detail', args=[self.other_room.pk]),
+                                   {'floor': self.floor.pk, 'room_number': '101', 'capacity': 4}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+    def test_admin_without_dormitory(self):
+        admin = User.objects.create_user(username='new', email='new@example.com', password='pass1234',
+                                         role=User.Role.IS_ADMIN)
+        self.client.force_authenticate(admin)
+        response = self.client.post(reverse('floor-list'), {'name': '3'}, format='json')
+        self.assertEqual(response.status_code, 400)
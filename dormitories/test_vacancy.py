@@ -0,0 +1,63 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from dormitories.models import Dormitory, DormitoryVacancy, Floor, Room
+from students.models import Student
+from universities.models import University
+
+
+class DormitoryVacancyTest(APITestCase):
+    def setUp(self):
+        self.university = University.objects.create(name='Test University', city='Toshkent')
+        self.other_university = University.objects.create(name='Boshqa University', city='Andijon')
+        self.student_user = User.objects.create_user(username='student', email='student@example.com',
+                                                     password='pass1234', role=User.Role.IS_STUDENT)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.small = self.create_dormitory('Kichik', self.university, female_beds=2)
+            self.large = self.create_dormitory('Katta', self.university, female_beds=6)
+            self.other = self.create_dormitory('Boshqa', self.other_university, female_beds=4)
+
+    def create_dormitory(self, name, university, female_beds):
+        dormitory = Dormitory.objects.create(name=name, university=university, address='Address',
+                                             number_of_floors=2)
+        female = Floor.objects.create(name='1', dormitory=dormitory, gender_type='female')
+        male = Floor.objects.create(name='2', dormitory=dormitory, gender_type='male')
+        Room.objects.create(dormitory=dormitory, floor=female, room_number='101', capacity=female_beds)
+        Room.objects.create(dormitory=dormitory, floor=male, room_number='201', capacity=3)
+        return dormitory
+
+    def get_vacancies(self, **params):
+        self.client.force_authenticate(self.student_user)
+        response = self.client.get(reverse('dormitoryvacancy-list'), params)
+        self.assertEqual(response.status_code, 200)
+        return [(row['dormitory'], row['free_beds']) for row in response.data['results']]
+
+    def test_index_follows_room_changes(self):
+        vacancy = DormitoryVacancy.objects.get(dormitory=self.small, gender_type='female')
+        self.assertEqual((vacancy.total_capacity, vacancy.free_beds), (2, 2))
+
+        room = Room.objects.get(floor__dormitory=self.small, floor__gender_type='female')
+        with self.captureOnCommitCallbacks(execute=True):
+            Student.objects.create(name='Ali', last_name='Valiyev', passport_number='AA1234567',
+                                   emergency_contact_phone='+998901234567', room=room)
+        vacancy.refresh_from_db()
+        self.assertEqual((vacancy.current_occupancy, vacancy.free_beds), (1, 1))
+
+    def test_filter_and_sort_by_free_beds(self):
+        self.assertEqual(
+            self.get_vacancies(university=self.university.id, gender='female'),
+            [(self.large.id, 6), (self.small.id, 2)],
+        )
+        self.assertEqual(
+            self.get_vacancies(gender='female', min_free_beds=3),
+            [(self.large.id, 6), (self.other.id, 4)],
+        )
+
+    def test_inactive_dormitory_is_hidden(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.large.status = 'inactive'
+            self.large.save()
+        self.assertEqual(self.get_vacancies(university=self.university.id, gender='female'),
+                         [(self.small.id, 2)])
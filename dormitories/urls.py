@@ -1,14 +1,17 @@
 from django.urls import path, include
 
-from .views import FloorViewSet, RoomViewSet, DormitoryViewSet
+from .views import FloorViewSet, RoomViewSet, DormitoryViewSet, DormitoryVacancyViewSet
 from rest_framework.routers import DefaultRouter
 
+from joybor.asyncviews import router_urls
+
 router = DefaultRouter()
 
 router.register('dormitory', DormitoryViewSet)
 router.register('floor', FloorViewSet)
 router.register('room', RoomViewSet)
+router.register('vacancy', DormitoryVacancyViewSet)
 
 urlpatterns = [
-    path('', include(router.urls))
+    path('', include(router_urls(router)))
 ]
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""
+Bo'sh joylar indeksi (DormitoryVacancy) ni yotoqxona bo'yicha qayta hisoblash.
+
+Yangilanish tranzaksiya commit bo'lgandan keyin bajariladi: kaskad o'chirishlar
+tugagach indeks bazadagi yakuniy holatdan hisoblanadi.
+"""
+from django.db import transaction
+from django.db.models import Sum
+
+from .models import Dormitory, DormitoryVacancy, Floor
+
+
+def refresh_dormitory_vacancies(dormitory_id):
+    dormitory = Dormitory.objects.filter(pk=dormitory_id).values('university_id', 'status').first()
+    if dormitory is None:
+        return
+
+    totals = (
+        Floor.objects.filter(dormitory_id=dormitory_id)
+        .values('gender_type')
+        .annotate(capacity=Sum('total_capacity'), occupancy=Sum('current_occupancy'))
+        .order_by()
+    )
+    rows = [
+        DormitoryVacancy(
+            dormitory_id=dormitory_id,
+            university_id=dormitory['university_id'],
+            status=dormitory['status'],
+            gender_type=row['gender_type'],
+            total_capacity=row['capacity'],
+            current_occupancy=row['occupancy'],
+            free_beds=max(row['capacity'] - row['occupancy'], 0),
+        )
+        for row in totals
+    ]
+
+    with transaction.atomic():
+        DormitoryVacancy.objects.filter(dormitory_id=dormitory_id).exclude(
+            gender_type__in=[row.gender_type for row in rows]
+        ).delete()
+        if rows:
+            DormitoryVacancy.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['dormitory', 'gender_type'],
+                update_fields=['university', 'status', 'total_capacity', 'current_occupancy', 'free_beds',
+                               'updated_at'],
+            )
+
+
+def schedule_vacancy_refresh(dormitory_id):
+    if dormitory_id is not None:
+        transaction.on_commit(lambda: refresh_dormitory_vacancies(dormitory_id))
+
+
+def schedule_floor_vacancy_refresh(floor_id):
+    dormitory_id = Floor.objects.filter(pk=floor_id).values_list('dormitory_id', flat=True).first()
+    schedule_vacancy_refresh(dormitory_id)
@@ -1,24 +1,36 @@
 from sys import exception
 
+from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import viewsets, status
+from rest_framework import filters, viewsets, status
+from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from .models import Dormitory, Floor, Room
+from joybor.asyncviews import AsyncReadMixin
+from joybor.mixins import ConditionalRequestMixin, OptimizedQuerysetMixin, ExportMixin
+from joybor.tenant import get_tenant
+
+from .filters import DormitoryVacancyFilter
+from .geo import nearby
+from .models import Dormitory, DormitoryVacancy, Floor, Room
 from .permissions import DormitoryPermission, FloorPermission, RoomPermission
 from .serializers import DormitoryCreateUpdateSerializer, DormitorySerializer, FloorCreateUpdateSerializer, \
-    FloorSerializer, RoomCreateUpdateSerializer, RoomSerializer
+    FloorSerializer, RoomCreateUpdateSerializer, RoomSerializer, DormitoryVacancySerializer, \
+    DormitoryNearbySerializer, NearbyQuerySerializer
 
 
-class DormitoryViewSet(viewsets.ModelViewSet):
+class DormitoryViewSet(ConditionalRequestMixin, AsyncReadMixin, OptimizedQuerysetMixin, ExportMixin,
+                       viewsets.ModelViewSet):
     queryset = Dormitory.objects.all().select_related('university', 'admin')
     permission_classes = [DormitoryPermission]
 
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
             return DormitoryCreateUpdateSerializer
+        if self.action == 'nearby':
+            return DormitoryNearbySerializer
         return DormitorySerializer
 
     def get_queryset(self):
@@ -52,6 +64,26 @@ class DormitoryViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
+    @swagger_auto_schema(tags=['Yotoqxona'], query_serializer=NearbyQuerySerializer)
+    @action(detail=False, methods=['get'])
+    def nearby(self, request):
+        """Berilgan nuqtaga radius ichidagi yotoqxonalar, masofa (km) bo'yicha tartiblangan."""
+        params = NearbyQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        queryset = nearby(
+            self.filter_queryset(self.get_queryset()),
+            params.validated_data['lat'],
+            params.validated_data['lng'],
+            params.validated_data['radius'],
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
     def perform_create(self, serializer):
         user = self.request.user
         if user.role == user.Role.IS_STUDENT or user.role == user.Role.IS_SUPERADMIN:
@@ -79,7 +111,7 @@ class DormitoryViewSet(viewsets.ModelViewSet):
         instance.delete()
 
 
-class FloorViewSet(viewsets.ModelViewSet):
+class FloorViewSet(ConditionalRequestMixin, OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = Floor.objects.select_related('dormitory').all()
     permission_classes = [IsAuthenticated, FloorPermission]
 
@@ -99,7 +131,7 @@ class FloorViewSet(viewsets.ModelViewSet):
             return Floor.objects.all()
 
         elif user.role == user.Role.IS_ADMIN:
-            return Floor.objects.filter(dormitory__admin=user)
+            return Floor.objects.for_tenant()
 
         return Floor.objects.none()
 
@@ -109,12 +141,11 @@ class FloorViewSet(viewsets.ModelViewSet):
         if user.role != user.Role.IS_ADMIN:
             raise PermissionDenied("Faqat dormitory admin floor yaratishi mumkin.")
 
-        try:
-            dormitory = Dormitory.objects.get(admin=user)
-        except Dormitory.DoesNotExist:
+        dormitory_id = get_tenant(self.request).dormitory_id
+        if dormitory_id is None:
             raise ValidationError("Sizga hech qanday dormitory biriktirilmagan.")
 
-        serializer.save(dormitory=dormitory)
+        serializer.save(dormitory_id=dormitory_id)
 
     def perform_update(self, serializer):
         user = self.request.user
@@ -125,15 +156,14 @@ class FloorViewSet(viewsets.ModelViewSet):
         if user.role != user.Role.IS_ADMIN:
             raise PermissionDenied("Faqat dormitory admin floor yangilashi mumkin.")
 
-        try:
-            dormitory = Dormitory.objects.get(admin=user)
-        except Dormitory.DoesNotExist:
+        dormitory_id = get_tenant(self.request).dormitory_id
+        if dormitory_id is None:
             raise ValidationError("Sizga hech qanday dormitory biriktirilmagan.")
 
-        if serializer.instance.dormitory != dormitory:
+        if serializer.instance.dormitory_id != dormitory_id:
             raise PermissionDenied("Faqat o‘z dormitory’ingizdagi floor’ni tahrirlay olasiz.")
 
-        serializer.save(dormitory=dormitory)
+        serializer.save(dormitory_id=dormitory_id)
 
     def destroy(self, request, *args, **kwargs):
         user = request.user
@@ -144,14 +174,11 @@ class FloorViewSet(viewsets.ModelViewSet):
         # O‘chirilayotgan obyektni olamiz
         instance = self.get_object()
 
-        # Foydalanuvchiga tegishli dormitoryni olamiz
-        try:
-            dormitory = Dormitory.objects.get(admin=user)
-        except Dormitory.DoesNotExist:
-            raise PermissionDenied("Sizga hech qanday dormitory biriktirilmagan.")
+        # Foydalanuvchiga tegishli dormitory
+        dormitory_id = get_tenant(request).require_dormitory_id()
 
         # O‘chirishga ruxsat bor-yo‘qligini tekshiramiz
-        if instance.dormitory != dormitory:
+        if instance.dormitory_id != dormitory_id:
             raise PermissionDenied("Siz faqat o‘z dormitory’ingizdagi floor’ni o‘chira olasiz.")
 
         self.perform_destroy(instance)
@@ -181,7 +208,7 @@ class FloorViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
-class RoomViewSet(viewsets.ModelViewSet):
+class RoomViewSet(ConditionalRequestMixin, AsyncReadMixin, OptimizedQuerysetMixin, ExportMixin, viewsets.ModelViewSet):
     queryset = Room.objects.select_related('dormitory', 'floor').all()
     permission_classes = [RoomPermission]
 
@@ -202,7 +229,7 @@ class RoomViewSet(viewsets.ModelViewSet):
             return Room.objects.all()
 
         elif user.role == user.Role.IS_ADMIN:
-            return Room.objects.filter(dormitory__admin=user)
+            return Room.objects.for_tenant()
 
         return Room.objects.none()
 
@@ -215,11 +242,8 @@ class RoomViewSet(viewsets.ModelViewSet):
         if user.role != user.Role.IS_ADMIN:
             raise PermissionDenied("Faqat dormitory admin room yaratishi mumkin.")
 
-        # Foydalanuvchiga biriktirilgan dormitoryni olish
-        try:
-            dormitory = Dormitory.objects.get(admin=user)
-        except Dormitory.DoesNotExist:
-            raise PermissionDenied("Sizga hech qanday dormitory biriktirilmagan.")
+        # Foydalanuvchiga biriktirilgan dormitory
+        dormitory_id = get_tenant(self.request).require_dormitory_id()
 
         # Floorni serializerdan olish
         floor = serializer.validated_data.get('floor')
@@ -228,10 +252,10 @@ class RoomViewSet(viewsets.ModelViewSet):
         if not floor:
             raise PermissionDenied("Floor ko‘rsatilmagan.")
 
-        if floor.dormitory != dormitory:
+        if floor.dormitory_id != dormitory_id:
             raise PermissionDenied("Siz faqat o‘z dormitory’ingizga tegishli floor ichida room yaratishingiz mumkin.")
 
-        serializer.save(dormitory=dormitory)
+        serializer.save(dormitory_id=dormitory_id)
 
     def perform_update(self, serializer):
         user = self.request.user
@@ -239,17 +263,15 @@ class RoomViewSet(viewsets.ModelViewSet):
         if user.role != user.Role.IS_ADMIN:
             raise PermissionDenied("Faqat dormitory admin room’ni tahrirlay oladi.")
 
-        try:
-            dormitory = Dormitory.objects.get(admin=user)
-        except Dormitory.DoesNotExist:
-            raise PermissionDenied("Sizga hech qanday dormitory biriktirilmagan.")
+        dormitory_id = get_tenant(self.request).require_dormitory_id()
 
-        floor = serializer.validated_data.get('floor', serializer.instance.floor)
+        floor = serializer.validated_data.get('floor')
+        floor_dormitory_id = floor.dormitory_id if floor else serializer.instance.dormitory_id
 
-        if floor.dormitory != dormitory:
+        if floor_dormitory_id != dormitory_id:
             raise PermissionDenied("Siz faqat o‘z dormitory’ingizdagi room’ni tahrirlay olasiz.")
 
-        serializer.save(dormitory=dormitory)
+        serializer.save(dormitory_id=dormitory_id)
 
     def perform_destroy(self, instance):
         user = self.request.user
@@ -257,12 +279,9 @@ class RoomViewSet(viewsets.ModelViewSet):
         if user.role != user.Role.IS_ADMIN:
             raise PermissionDenied("Faqat dormitory admin room’ni o‘chira oladi.")
 
-        try:
-            dormitory = Dormitory.objects.get(admin=user)
-        except Dormitory.DoesNotExist:
-            raise PermissionDenied("Sizga hech qanday dormitory biriktirilmagan.")
+        dormitory_id = get_tenant(self.request).require_dormitory_id()
 
-        if instance.floor.dormitory != dormitory:
+        if instance.dormitory_id != dormitory_id:
             raise PermissionDenied("Siz faqat o‘z dormitory’ingizdagi room’ni o‘chira olasiz.")
 
         instance.delete()
@@ -289,4 +308,26 @@ class RoomViewSet(viewsets.ModelViewSet):
 
     @swagger_auto_schema(tags=['Xona'])
     def destroy(self, request, *args, **kwargs):
-        return super().destroy(request, *args, **kwargs)
\ No newline at end of file
+        return super().destroy(request, *args, **kwargs)
+
+
+class DormitoryVacancyViewSet(OptimizedQuerysetMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Bo'sh joylar qidiruvi: faol yotoqxonalar jins bo'yicha bo'sh o'rinlari bilan.
+    ?university=&gender=&min_free_beds= bo'yicha filtrlanadi, sukut bo'yicha eng ko'p bo'sh joy birinchi.
+    """
+    queryset = DormitoryVacancy.objects.filter(status='active', free_beds__gt=0)
+    serializer_class = DormitoryVacancySerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_class = DormitoryVacancyFilter
+    ordering_fields = ['free_beds', 'total_capacity']
+    ordering = ['-free_beds', 'dormitory']
+
+    @swagger_auto_schema(tags=['Bo\'sh joylar'])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @swagger_auto_schema(tags=['Bo\'sh joylar'])
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
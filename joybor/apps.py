@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class JoyborConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'joybor'
+
+    def ready(self):
+        from . import images, metrics, refdata
+        refdata.connect_signals()
+        images.connect_signals()
+        metrics.connect_signals()
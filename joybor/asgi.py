@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'joybor.settings')
+# O'qish endpoint'lari oqim egallamaydigan async view'lar orqali (joybor.asyncviews)
+os.environ.setdefault('JOYBOR_ASYNC_READ_VIEWS', '1')
 
 application = get_asgi_application()
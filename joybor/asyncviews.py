@@ -0,0 +1,178 @@
+"""
+ASGI ostida eng ko'p chaqiriladigan o'qish amallari (list/retrieve) uchun async view'lar.
+
+ViewSet'ga `AsyncReadMixin` qo'shiladi va uning `alist`/`aretrieve` amallari queryset,
+ruxsatlar, serializer va pagination'ni sinxron amallar bilan bir xil quradi, faqat
+bazaga async ORM (`aget`, `aiterator`, `acount`, `aaggregate`) orqali murojaat qiladi.
+Shuning uchun so'rov autentifikatsiya, serializatsiya va javobni yuborish paytida oqim
+egallamaydi.
+
+URL'lar `async_read_urls(router)` bilan quriladi va ASYNC_READ_VIEWS yoqilganda
+(joybor/asgi.py) router URL'laridan oldin qo'yiladi. Bir xil yo'ldagi boshqa metodlar
+(POST, PUT, DELETE) va async varianti yo'q amallar odatiy ViewSet'ga uzatiladi.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import SynchronousOnlyOperation, ValidationError
+from django.http import Http404, HttpResponse
+from django.urls import re_path
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.response import Response
+
+from . import refdata
+from .pagination import apaginate_queryset
+
+LIST_ACTIONS = {'get': 'list', 'post': 'create'}
+DETAIL_ACTIONS = {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}
+
+
+class AsyncReadMixin:
+    """
+    ViewSet uchun list/retrieve ning async variantlari (alist, aretrieve).
+
+    ConditionalRequestMixin va ReferenceListMixin o'zlarining async variantlarini beradi,
+    shuning uchun ular bazalar ro'yxatida bu mixin'dan oldin turadi.
+    """
+    aiterator_chunk_size = 2000
+    # Serializer o'qiydigan ma'lumotnoma jadvallari (joybor.refdata), serializatsiyadan oldin yuklanadi
+    async_reference_models = ()
+
+    async def adispatch(self, request, action, *args, **kwargs):
+        """APIView.dispatch() ning GET/HEAD uchun async nusxasi."""
+        self.action_map = {'get': action, 'head': action}
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            response = await getattr(self, f'a{action}')(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        """APIView.initial(), autentifikatsiya async."""
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        request.accepted_renderer, request.accepted_media_type = self.perform_content_negotiation(request)
+        request.version, request.versioning_scheme = self.determine_version(request, *args, **kwargs)
+        await self.aperform_authentication(request)
+        self.check_permissions(request)
+        self.check_throttles(request)
+
+    async def aperform_authentication(self, request):
+        """Request._authenticate(); `aauthenticate` bo'lmagan autentifikatorlar oqimda chaqiriladi."""
+        for authenticator in request.authenticators:
+            authenticate = getattr(authenticator, 'aauthenticate', None)
+            try:
+                if authenticate is not None:
+                    user_auth_tuple = await authenticate(request)
+                else:
+                    user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+
+        request._not_authenticated()
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def aserialize(self, instance, many=False):
+        for model in self.async_reference_models:
+            await refdata.aget_table(model)
+        serializer = self.get_serializer(instance, many=many)
+        try:
+            return serializer.data
+        except SynchronousOnlyOperation:
+            # Serializer bazaga murojaat qildi (masalan, refdata keshi shu orada yangilandi)
+            return await sync_to_async(lambda: serializer.data)()
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.paginator is not None:
+            page = await apaginate_queryset(self.paginator, queryset, request, self)
+            if page is not None:
+                return self.get_paginated_response(await self.aserialize(page, many=True))
+        objects = [obj async for obj in queryset.aiterator(chunk_size=self.aiterator_chunk_size)]
+        return Response(await self.aserialize(objects, many=True))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return Response(await self.aserialize(await self.aget_object()))
+
+
+def _plain_response(response):
+    """
+    Tayyor (render qilingan) javobni oddiy HttpResponse ga o'giradi: Django ASGI handler
+    render() qilinadigan javobni qayta sync_to_async orqali chaqirmasligi uchun.
+    """
+    if not hasattr(response, 'render'):
+        return response
+    response.render()
+    plain = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        plain[header] = value
+    plain.cookies = response.cookies
+    return plain
+
+
+def async_read_view(viewset, actions, **initkwargs):
+    """
+    `actions` (router xaritasi) ichidagi GET amali async bajariladigan view. Boshqa
+    metodlar `viewset.as_view(actions)` ga uzatiladi.
+    """
+    actions = {method: action for method, action in actions.items() if hasattr(viewset, action)}
+    sync_view = viewset.as_view(actions, **initkwargs)
+    read_action = actions.get('get')
+    if read_action is not None and not hasattr(viewset, f'a{read_action}'):
+        read_action = None
+
+    async def view(request, *args, **kwargs):
+        if read_action is None or request.method not in ('GET', 'HEAD'):
+            return await sync_to_async(sync_view)(request, *args, **kwargs)
+        self = viewset(**initkwargs)
+        self.request = request
+        return _plain_response(await self.adispatch(request, read_action, *args, **kwargs))
+
+    view.cls = viewset
+    view.initkwargs = initkwargs
+    view.actions = actions
+    return csrf_exempt(view)
+
+
+def async_read_urls(router):
+    """Router'dagi AsyncReadMixin li ViewSet'lar uchun list/detail URL'lari (router nomlari bilan)."""
+    urls = []
+    for prefix, viewset, basename in router.registry:
+        if not issubclass(viewset, AsyncReadMixin):
+            continue
+        lookup = router.get_lookup_regex(viewset)
+        urls += [
+            re_path(rf'^{prefix}/$', async_read_view(viewset, LIST_ACTIONS), name=f'{basename}-list'),
+            re_path(rf'^{prefix}/{lookup}/$', async_read_view(viewset, DETAIL_ACTIONS), name=f'{basename}-detail'),
+        ]
+    return urls
+
+
+def router_urls(router):
+    """router.urls; ASYNC_READ_VIEWS yoqilgan bo'lsa oldida async o'qish URL'lari bilan."""
+    if getattr(settings, 'ASYNC_READ_VIEWS', False):
+        return async_read_urls(router) + router.urls
+    return router.urls
@@ -0,0 +1,220 @@
+"""
+API endpoint'lari benchmark'i (`manage.py bench`).
+
+Vaqtinchalik test bazasida sintetik ma'lumot yaratiladi va ilovalar router'laridagi har
+bir ViewSet'ning list va retrieve amallari har bir rol (superadmin, admin, talaba) nomidan
+test client orqali chaqiriladi. Har bir endpoint uchun p50/p95/p99 kechikish, SQL so'rovlar
+soni va javob hajmi yoziladi; rolga ruxsat etilmagan (2xx bo'lmagan) endpoint'lar
+o'lchanmaydi, faqat javob kodi yoziladi.
+Natija JSON ko'rinishida saqlanadi va oldingi natija (baseline) bilan solishtiriladi:
+kechikish yoki hajm chegaradan ko'proq oshsa, so'rovlar soni esa umuman oshsa, yoki
+oldin ishlagan endpoint endi xato qaytarsa regressiya hisoblanadi.
+"""
+import random
+from decimal import Decimal
+from importlib import import_module
+from time import perf_counter
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, reverse
+
+from accounts.models import User, UserProfile
+from accounts.tokens import RoleRefreshToken
+from dormitories.models import Dormitory, Floor, Room
+from payments.models import Month, PaymentForStudent
+from students.models import Application, District, Province, Student
+from universities.models import Faculty, University
+
+from .seed import CITIES, FIRST_NAMES, LAST_NAMES, MONTHS
+
+ROUTER_MODULES = ('accounts.urls', 'dormitories.urls', 'students.urls', 'payments.urls', 'universities.urls')
+PASSWORD = 'bench-password'
+
+
+def percentile(values, percent):
+    """Tartiblangan ro'yxatdagi percentil (nearest-rank)."""
+    index = max(0, min(len(values) - 1, round(percent / 100 * len(values)) - 1))
+    return values[index]
+
+
+def is_success(status):
+    return 200 <= status < 300
+
+
+def seed_dataset(scale=1.0, seed=0):
+    """
+    Benchmark uchun ma'lumot: `scale` ga mutanosib universitetlar, yotoqxonalar (qavat,
+    xona), talabalar, arizalar va to'lovlar. Model save() va signallari orqali yaratiladi,
+    shuning uchun hisoblagichlar, ledger va qidiruv indeksi ham to'ldiriladi.
+    Rol -> benchmark foydalanuvchisi qaytariladi.
+    """
+    rng = random.Random(seed)
+    password = make_password(PASSWORD)
+
+    def user(username, role):
+        return User.objects.create(username=username, email=f'{username}@example.com', password=password, role=role)
+
+    def person():
+        return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+    superadmin = user('bench-superadmin', User.Role.IS_SUPERADMIN)
+    months = [Month.objects.create(name=name) for name in MONTHS]
+    provinces = [Province.objects.create(name=f'{city} viloyati') for city in CITIES]
+    districts = [District.objects.create(name=f'{province.name} {i}-tuman', province=province)
+                 for province in provinces for i in range(1, 4)]
+
+    universities = [University.objects.create(name=f'Universitet {i}', city=rng.choice(CITIES))
+                    for i in range(1, max(1, round(3 * scale)) + 1)]
+    faculties = [Faculty.objects.create(name=f'Fakultet {i}', university=university)
+                 for university in universities for i in range(1, 5)]
+
+    admins = []
+    passport = 0
+    applicants = []
+    for d in range(1, max(1, round(4 * scale)) + 1):
+        admin = user(f'bench-admin-{d}', User.Role.IS_ADMIN)
+        UserProfile.objects.create(user=admin, phone_number=f'+99890{rng.randrange(10 ** 7):07d}')
+        admins.append(admin)
+        dormitory = Dormitory.objects.create(name=f'Yotoqxona {d}', address=f"{rng.choice(CITIES)}, {d}-uy",
+                                             number_of_floors=3, admin=admin, university=rng.choice(universities))
+        rooms = []
+        for f in range(1, 4):
+            floor = Floor.objects.create(name=str(f), dormitory=dormitory, gender_type=('male', 'female')[f % 2])
+            rooms += [Room.objects.create(dormitory=dormitory, floor=floor, room_number=f'{f}{r:02d}',
+                                          capacity=rng.randint(2, 4))
+                      for r in range(1, 9)]
+
+        for _ in range(15):
+            passport += 1
+            first_name, last_name = person()
+            applicant = user(f'bench-student-{passport}', User.Role.IS_STUDENT)
+            applicants.append(applicant)
+            Application.objects.create(student=applicant, first_name=first_name, last_name=last_name,
+                                       dormitory=dormitory, faculty=rng.choice(faculties),
+                                       province=rng.choice(provinces), district=rng.choice(districts),
+                                       passport_number=f'AA{passport:07d}',
+                                       phone_number=f'+99891{rng.randrange(10 ** 7):07d}')
+
+        for _ in range(30):
+            passport += 1
+            first_name, last_name = person()
+            room = rng.choice(rooms)
+            student = Student.objects.create(
+                name=first_name, last_name=last_name, dormitory=dormitory, faculty=rng.choice(faculties),
+                province=rng.choice(provinces), district=rng.choice(districts), floor_id=room.floor_id,
+                room=room if not room.is_full else None, passport_number=f'AB{passport:07d}',
+                phone_number=f'+99893{rng.randrange(10 ** 7):07d}',
+                emergency_contact_phone=f'+99894{rng.randrange(10 ** 7):07d}',
+            )
+            if student.room_id:
+                room.current_occupancy += 1
+            for _ in range(2):
+                amount = Decimal(rng.choice((300, 450, 600)) * 1000)
+                payment = PaymentForStudent.objects.create(student=student, amount=amount)
+                payment.month.add(*rng.sample(months, rng.randint(1, 2)))
+
+    return {User.Role.IS_SUPERADMIN: superadmin, User.Role.IS_ADMIN: admins[0], User.Role.IS_STUDENT: applicants[0]}
+
+
+def endpoints():
+    """(nom, ViewSet, list URL, detail URL nomi) - router'lardagi har bir ViewSet uchun."""
+    for module in ROUTER_MODULES:
+        for prefix, viewset, basename in import_module(module).router.registry:
+            try:
+                list_url = reverse(f'{basename}-list')
+            except NoReverseMatch:
+                continue
+            yield basename, viewset, list_url, f'{basename}-detail'
+
+
+def _first_pk(response, viewset, dormitory_id):
+    data = response.json()
+    if isinstance(data, dict):
+        data = data.get('results', [])
+    if not data or not isinstance(data[0], dict):
+        return None
+    if 'id' in data[0]:
+        return data[0]['id']
+    # id qaytarmaydigan serializerlar (bo'sh joylar, to'lov hisobi): querysetdagi birinchi obyekt
+    queryset = viewset.queryset
+    if dormitory_id is not None and hasattr(queryset, 'for_tenant'):
+        queryset = queryset.for_tenant(dormitory_id)
+    return queryset.order_by('pk').values_list('pk', flat=True).first()
+
+
+def measure(client, url, headers, iterations, warmup):
+    """Javob 2xx bo'lmasa o'lchanmaydi: (javob, {'status': kod})."""
+    response = client.get(url, headers=headers)
+    if not is_success(response.status_code):
+        return response, {'status': response.status_code}
+
+    for _ in range(warmup):
+        client.get(url, headers=headers)
+
+    latencies = []
+    for _ in range(iterations):
+        started = perf_counter()
+        response = client.get(url, headers=headers)
+        latencies.append(perf_counter() - started)
+    latencies.sort()
+
+    # So'rovlar alohida o'lchanadi: CaptureQueriesContext kechikishga qo'shilmasin
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, headers=headers)
+    return response, {
+        'status': response.status_code,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'queries': len(queries),
+        'bytes': len(response.content),
+    }
+
+
+def run(users, iterations=50, warmup=5, only=None):
+    """'<rol> <endpoint>' -> ko'rsatkichlar; `only` - nomida shu matnlardan biri bo'lgan endpoint'lar."""
+    client = Client()
+    results = {}
+    for role, user in users.items():
+        headers = {'authorization': f'Bearer {RoleRefreshToken.for_user(user).access_token}'}
+        dormitory_id = Dormitory.objects.filter(admin=user).values_list('pk', flat=True).first()
+        for basename, viewset, list_url, detail_name in endpoints():
+            if only and not any(part in basename for part in only):
+                continue
+            response, results[f'{role} {basename}-list'] = measure(client, list_url, headers, iterations, warmup)
+            if not is_success(response.status_code):
+                continue
+            pk = _first_pk(response, viewset, dormitory_id)
+            if pk is not None:
+                detail_url = reverse(detail_name, args=[pk])
+                _, results[f'{role} {basename}-detail'] = measure(client, detail_url, headers, iterations, warmup)
+    return results
+
+
+def compare(results, baseline, threshold=0.2, min_delta_ms=1.0):
+    """
+    Baseline bilan solishtirish: [(endpoint, ko'rsatkich, eski, yangi), ...].
+    Juda tez endpoint'larda shovqin regressiya deb hisoblanmasligi uchun kechikish
+    kamida `min_delta_ms` ga oshishi kerak. Baseline'da ham 2xx bo'lmagan natijalar solishtirilmaydi.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None or not is_success(previous['status']):
+            continue
+        if not is_success(current['status']):
+            # Oldin ishlagan endpoint endi xato qaytaradi (masalan 200 -> 403)
+            regressions.append((name, 'status', previous['status'], current['status']))
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms'):
+            if current[metric] > previous[metric] * (1 + threshold) and \
+                    current[metric] - previous[metric] >= min_delta_ms:
+                regressions.append((name, metric, previous[metric], current[metric]))
+        if current['queries'] > previous['queries']:
+            regressions.append((name, 'queries', previous['queries'], current['queries']))
+        if current['bytes'] > previous['bytes'] * (1 + threshold):
+            regressions.append((name, 'bytes', previous['bytes'], current['bytes']))
+    return regressions
@@ -0,0 +1,93 @@
+"""
+DATABASES['default'] va CACHES['default'] muhit o'zgaruvchilaridan (JOYBOR_DB_*, JOYBOR_CACHE_*).
+
+Sukut bo'yicha SQLite (db.sqlite3) - lokal ishlab chiqish va testlar uchun. Production'da
+JOYBOR_DB_ENGINE=postgresql: psycopg 3 va uning connection pool'i (Django `OPTIONS['pool']`).
+Pool o'chirilsa (JOYBOR_DB_POOL=0) ulanishlar CONN_MAX_AGE soniya davomida qayta ishlatiladi
+va har so'rov boshida tekshiriladi (CONN_HEALTH_CHECKS).
+
+Eksport va boshqa `iterator()` yo'llari PostgreSQL'da server-side cursor orqali o'qiydi.
+PgBouncer transaction rejimi ortida JOYBOR_DB_DISABLE_SERVER_SIDE_CURSORS=1 berilishi kerak.
+
+Kesh sukut bo'yicha jarayon ichidagi LocMemCache. Bir necha worker'li deploy'da ma'lumotnoma
+versiyalari (joybor.refdata) barcha jarayonlarga yetib borishi uchun umumiy backend kerak:
+JOYBOR_CACHE_BACKEND=redis (JOYBOR_CACHE_URL) yoki db (`manage.py createcachetable`).
+`manage.py check --deploy` umumiy bo'lmagan keshda xato beradi.
+"""
+from django.core.exceptions import ImproperlyConfigured
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+}
+
+ENGINES = {
+    'sqlite': 'django.db.backends.sqlite3',
+    'postgresql': 'django.db.backends.postgresql',
+}
+
+
+def _flag(environ, name, default):
+    return environ.get(name, '1' if default else '0') == '1'
+
+
+def _number(environ, name, default, cast=int):
+    value = environ.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        raise ImproperlyConfigured(f"{name} son bo'lishi kerak: {value!r}")
+
+
+def database_from_env(environ, base_dir):
+    engine = environ.get('JOYBOR_DB_ENGINE', 'sqlite')
+    if engine not in ENGINES:
+        raise ImproperlyConfigured(f"JOYBOR_DB_ENGINE: {engine!r}, mumkin bo'lganlari: {', '.join(ENGINES)}")
+
+    if engine == 'sqlite':
+        return {
+            'ENGINE': ENGINES[engine],
+            'NAME': environ.get('JOYBOR_DB_NAME') or base_dir / 'db.sqlite3',
+            'CONN_MAX_AGE': _number(environ, 'JOYBOR_DB_CONN_MAX_AGE', 0),
+        }
+
+    pool = _flag(environ, 'JOYBOR_DB_POOL', True)
+    options = {}
+    if pool:
+        options['pool'] = {
+            'min_size': _number(environ, 'JOYBOR_DB_POOL_MIN_SIZE', 2),
+            'max_size': _number(environ, 'JOYBOR_DB_POOL_MAX_SIZE', 10),
+            # Bo'sh ulanish kutilganda shuncha soniyadan keyin PoolTimeout
+            'timeout': _number(environ, 'JOYBOR_DB_POOL_TIMEOUT', 10, float),
+        }
+    return {
+        'ENGINE': ENGINES[engine],
+        'NAME': environ.get('JOYBOR_DB_NAME', 'joybor'),
+        'USER': environ.get('JOYBOR_DB_USER', 'joybor'),
+        'PASSWORD': environ.get('JOYBOR_DB_PASSWORD', ''),
+        'HOST': environ.get('JOYBOR_DB_HOST', 'localhost'),
+        'PORT': environ.get('JOYBOR_DB_PORT', '5432'),
+        # Pool bilan doimiy ulanishlar ishlatilmaydi: ulanish so'rov oxirida pool'ga qaytadi
+        'CONN_MAX_AGE': 0 if pool else _number(environ, 'JOYBOR_DB_CONN_MAX_AGE', 60),
+        'CONN_HEALTH_CHECKS': True,
+        'DISABLE_SERVER_SIDE_CURSORS': _flag(environ, 'JOYBOR_DB_DISABLE_SERVER_SIDE_CURSORS', False),
+        'OPTIONS': options,
+        'TEST': {'NAME': environ.get('JOYBOR_DB_TEST_NAME') or None},
+    }
+
+
+def cache_from_env(environ):
+    backend = environ.get('JOYBOR_CACHE_BACKEND', 'locmem')
+    if backend not in CACHE_BACKENDS:
+        raise ImproperlyConfigured(
+            f"JOYBOR_CACHE_BACKEND: {backend!r}, mumkin bo'lganlari: {', '.join(CACHE_BACKENDS)}"
+        )
+    locations = {
+        'locmem': 'joybor',
+        'redis': environ.get('JOYBOR_CACHE_URL', 'redis://localhost:6379/1'),
+        'db': environ.get('JOYBOR_CACHE_TABLE', 'joybor_cache'),
+    }
+    return {'BACKEND': CACHE_BACKENDS[backend], 'LOCATION': locations[backend]}
@@ -0,0 +1,153 @@
+"""
+Yuklangan rasmlar hosilalari: kichik (thumb) va o'rta (medium) o'lchamlar, har biri
+asl formatga yaqin (JPEG yoki shaffof bo'lsa PNG) va WebP ko'rinishida.
+
+Rasm saqlangach (post_save) fon vazifasi navbatga qo'yiladi (joybor.tasks,
+`images` navbati). Worker EXIF bo'yicha burilishni to'g'rilaydi, EXIF/metama'lumotlarni
+tashlab yuboradi va hosilalarni storage'ga yozadi. Natija modeldagi `<maydon>_variants`
+JSON ustuniga {'source': asl fayl nomi, 'thumb': ..., 'thumb_webp': ...} ko'rinishida
+yoziladi; `source` joriy faylga mos kelmaguncha serializerlar asl rasmni beradi.
+
+Mavjud fayllar uchun `manage.py generate_image_variants` (process pool, IMAGE_VARIANT_WORKERS).
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from io import BytesIO
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models.signals import post_save
+from django.dispatch import Signal
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from . import refdata
+
+# model -> rasm maydoni; hosilalar `<maydon>_variants` ustunida
+IMAGE_FIELDS = {
+    'students.Student': 'picture',
+    'students.Application': 'picture',
+    'accounts.UserProfile': 'profile_picture',
+    'dormitories.DormitoryImage': 'image',
+    'universities.University': 'logo',
+}
+
+# nom -> (o'lcham, kesish); kesilganda aynan shu o'lcham, aks holda shu chegaraga sig'diriladi
+VARIANTS = {
+    'thumb': ((200, 200), True),
+    'medium': ((800, 800), False),
+}
+
+# Hosilalar `update()` bilan yoziladi (post_save yo'q): ota obyektlarni yangilash uchun (sender=model, pk)
+variants_saved = Signal()
+
+
+def worker_count():
+    return getattr(settings, 'IMAGE_VARIANT_WORKERS', 2)
+
+
+def variant_keys():
+    return [key for variant in VARIANTS for key in (variant, f'{variant}_webp')]
+
+
+def variants_field_name(field_name):
+    return f'{field_name}_variants'
+
+
+def _variant_name(name, variant, extension):
+    stem = os.path.splitext(name)[0]
+    return f'variants/{stem}_{variant}.{extension}'
+
+
+def _save(storage, name, image, image_format, **options):
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    if storage.exists(name):
+        storage.delete(name)
+    return storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def generate_variants(name):
+    """Asl rasmdan hosilalarni yaratadi va {'source', variant: fayl nomi} qaytaradi. Bazaga tegmaydi."""
+    storage = default_storage
+    with storage.open(name, 'rb') as file:
+        image = Image.open(file)
+        image.load()
+
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    # EXIF, ICC va boshqa metama'lumotlar hosilaga o'tmaydi
+    image.info = {}
+
+    variants = {'source': name}
+    for variant, (size, crop) in VARIANTS.items():
+        if crop:
+            resized = ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+        else:
+            resized = image.copy()
+            resized.thumbnail(size, Image.Resampling.LANCZOS)
+
+        if has_alpha:
+            variants[variant] = _save(storage, _variant_name(name, variant, 'png'), resized, 'PNG', optimize=True)
+        else:
+            variants[variant] = _save(storage, _variant_name(name, variant, 'jpg'), resized, 'JPEG',
+                                      quality=85, optimize=True, progressive=True)
+        variants[f'{variant}_webp'] = _save(storage, _variant_name(name, variant, 'webp'), resized, 'WEBP',
+                                            quality=80, method=4)
+    return variants
+
+
+def save_variants(label, pk, field_name, variants):
+    """Natijani yozadi, agar shu orada rasm almashtirilmagan bo'lsa."""
+    model = apps.get_model(label)
+    updates = {variants_field_name(field_name): variants}
+    if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+        # update() auto_now ni yangilamaydi, ETag validatorlari uchun
+        updates['updated_at'] = timezone.now()
+    updated = model._base_manager.filter(pk=pk, **{field_name: variants['source']}).update(**updates)
+    if updated and refdata.is_reference_model(model):
+        refdata.bump_version(model)
+    if updated:
+        variants_saved.send(sender=model, pk=pk)
+    return updated
+
+
+def make_executor(workers):
+    # spawn: worker ota jarayonning baza ulanishlarini meros qilib olmaydi
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=django.setup,
+    )
+
+
+def schedule_variants(instance, field_name):
+    from .tasks import generate_image_variants
+
+    generate_image_variants.enqueue(instance._meta.label, instance.pk, field_name, getattr(instance, field_name).name)
+
+
+def needs_variants(instance, field_name):
+    deferred = instance.get_deferred_fields()
+    if field_name in deferred or variants_field_name(field_name) in deferred:
+        return False
+    name = getattr(instance, field_name).name
+    variants = getattr(instance, variants_field_name(field_name)) or {}
+    return bool(name) and variants.get('source') != name
+
+
+def _on_save(sender, instance, field_name, **kwargs):
+    if needs_variants(instance, field_name):
+        schedule_variants(instance, field_name)
+
+
+def connect_signals():
+    for label, field_name in IMAGE_FIELDS.items():
+        post_save.connect(partial(_on_save, field_name=field_name), sender=apps.get_model(label), weak=False,
+                          dispatch_uid=f'image-variants-{label}')
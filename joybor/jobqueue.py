@@ -0,0 +1,251 @@
+"""
+Loyiha bazasida saqlanadigan fon vazifalari navbati.
+
+Vazifa funksiyasi `@task` bilan ro'yxatdan o'tkaziladi (ilovalarning `tasks.py` modullari
+worker ishga tushganda avtomatik yuklanadi) va `func.enqueue(*args, **kwargs)` bilan
+navbatga qo'yiladi. Job qatori tranzaksiya commit bo'lgandan keyin yoziladi, shuning
+uchun bekor qilingan so'rov vazifa qoldirmaydi va worker hali ko'rinmaydigan
+ma'lumotni o'qimaydi. Argumentlar JSON ga aylanadigan bo'lishi kerak.
+
+`manage.py runworker` vazifalarni bajaradi:
+- vazifa bir vaqtda bitta worker'ga beriladi (shartli UPDATE), worker `timeout` soniya
+  ichida tugatmasa (masalan jarayon o'ldirilgan) vazifa boshqasiga qayta beriladi, urinishlar
+  `max_attempts` ga yetgan bo'lsa esa `failed` bo'ladi;
+- xato bo'lsa eksponensial kechikish bilan qayta uriniladi, `max_attempts` dan keyin
+  `failed` holatida qoladi;
+- JOB_QUEUE_CONCURRENCY har bir navbatda barcha worker'lar bo'ylab bir vaqtda
+  bajariladigan vazifalar sonini cheklaydi.
+
+JOB_QUEUE_EAGER = True bo'lsa vazifa commit'dan keyin shu jarayonda bajariladi (testlar).
+"""
+import logging
+import os
+import random
+import socket
+import threading
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.db.models import Count, Q
+from django.dispatch import Signal
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+# Worker to'xtashidan oldin (SMTP ulanishlarini yopish va h.k.)
+worker_stopped = Signal()
+
+
+class Task:
+    def __init__(self, name, func, queue, max_attempts, timeout):
+        self.name = name
+        self.func = func
+        self.queue = queue
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+
+
+def task(name=None, *, queue='default', max_attempts=5, timeout=300):
+    """Funksiyani fon vazifasi sifatida ro'yxatdan o'tkazadi va unga `enqueue` qo'shadi."""
+
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        _registry[task_name] = Task(task_name, func, queue, max_attempts, timeout)
+        func.enqueue = partial(enqueue, task_name)
+        return func
+
+    return decorator
+
+
+def get_task(name):
+    return _registry.get(name)
+
+
+def enqueue(name, *args, **kwargs):
+    """Vazifani joriy tranzaksiya commit bo'lgandan keyin navbatga qo'yadi."""
+    registered = _registry[name]
+
+    def submit():
+        if getattr(settings, 'JOB_QUEUE_EAGER', False):
+            registered.func(*args, **kwargs)
+            return
+        Job.objects.create(
+            name=name,
+            queue=registered.queue,
+            args=list(args),
+            kwargs=kwargs,
+            max_attempts=registered.max_attempts,
+            timeout=registered.timeout,
+            run_at=timezone.now(),
+        )
+
+    transaction.on_commit(submit)
+
+
+def _close_connections():
+    # Ochiq tranzaksiya ichida (TestCase) ulanish yopilmaydi
+    if not any(connection.in_atomic_block for connection in connections.all(initialized_only=True)):
+        close_old_connections()
+
+
+def retry_delay(attempts):
+    base = getattr(settings, 'JOB_RETRY_BASE_DELAY', 10)
+    cap = getattr(settings, 'JOB_RETRY_MAX_DELAY', 60 * 60)
+    delay = min(cap, base * 2 ** (attempts - 1))
+    # Bir vaqtda yiqilgan vazifalar bir vaqtda qaytmasligi uchun
+    return delay * random.uniform(0.5, 1.0)
+
+
+class Worker:
+    def __init__(self, queues=None, concurrency=1, poll_interval=1.0):
+        self.queues = queues or None
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}:{id(self):x}'
+        self.stopping = threading.Event()
+
+    def _available(self, now):
+        available = Job.objects.filter(
+            Q(status=Job.Status.QUEUED, run_at__lte=now) | Q(status=Job.Status.RUNNING, locked_until__lt=now)
+        )
+        if self.queues:
+            available = available.filter(queue__in=self.queues)
+        return available
+
+    def _free_slots(self, now):
+        """Navbat -> yana nechta vazifa olish mumkin (None - cheklanmagan)."""
+        limits = getattr(settings, 'JOB_QUEUE_CONCURRENCY', {})
+        if not limits:
+            return {}
+        running = dict(
+            Job.objects.filter(status=Job.Status.RUNNING, locked_until__gte=now, queue__in=limits)
+            .values_list('queue').annotate(count=Count('pk')).order_by()
+        )
+        return {queue: limit - running.get(queue, 0) for queue, limit in limits.items()}
+
+    def claim(self, limit):
+        """`limit` tagacha vazifani shu worker nomiga band qiladi."""
+        now = timezone.now()
+        free = self._free_slots(now)
+        candidates = (
+            self._available(now).order_by('run_at', 'pk')
+            .values_list('pk', 'queue', 'status', 'attempts', 'max_attempts', 'locked_until', 'timeout')
+        )[:limit * 4]
+        claimed = []
+        for pk, queue, status, attempts, max_attempts, locked_until, timeout in candidates:
+            if len(claimed) >= limit:
+                break
+            if status == Job.Status.RUNNING and attempts >= max_attempts:
+                # Worker'ni o'ldiradigan yoki osilib qoladigan vazifa cheksiz qayta berilmasin
+                expired = Job.objects.filter(pk=pk, status=status, attempts=attempts, locked_until=locked_until).update(
+                    status=Job.Status.FAILED,
+                    locked_until=None,
+                    last_error=f"Worker {timeout} soniya ichida tugatmadi (lease expired), "
+                               f"urinishlar: {attempts}/{max_attempts}.",
+                    updated_at=now,
+                )
+                if expired:
+                    logger.error("Job %s bajarilmadi: lease muddati tugadi (%s/%s)", pk, attempts, max_attempts)
+                continue
+            if free.get(queue, 1) <= 0:
+                continue
+            # Boshqa worker ulgurib olgan bo'lsa 0 qaytadi
+            won = Job.objects.filter(pk=pk, status=status, attempts=attempts, locked_until=locked_until).update(
+                status=Job.Status.RUNNING,
+                attempts=attempts + 1,
+                locked_until=now + timedelta(seconds=timeout),
+                locked_by=self.worker_id,
+                updated_at=now,
+            )
+            if won:
+                claimed.append(pk)
+                if queue in free:
+                    free[queue] -= 1
+        return list(Job.objects.filter(pk__in=claimed).order_by('run_at', 'pk'))
+
+    def _owned(self, job):
+        return Job.objects.filter(pk=job.pk, locked_by=self.worker_id, attempts=job.attempts)
+
+    def run_job(self, job):
+        registered = get_task(job.name)
+        try:
+            if registered is None:
+                raise LookupError(f"Ro'yxatdan o'tmagan vazifa: {job.name}")
+            registered.func(*job.args, **job.kwargs)
+        except Exception:
+            error = traceback.format_exc()
+            now = timezone.now()
+            if registered is not None and job.attempts < job.max_attempts:
+                logger.warning("%s qayta uriniladi (%s/%s)", job, job.attempts, job.max_attempts)
+                self._owned(job).update(
+                    status=Job.Status.QUEUED,
+                    run_at=now + timedelta(seconds=retry_delay(job.attempts)),
+                    locked_until=None,
+                    locked_by='',
+                    last_error=error,
+                    updated_at=now,
+                )
+            else:
+                logger.error("%s bajarilmadi:\n%s", job, error)
+                self._owned(job).update(status=Job.Status.FAILED, locked_until=None, last_error=error, updated_at=now)
+        else:
+            self._owned(job).delete()
+        finally:
+            _close_connections()
+
+    def run(self, burst=False):
+        """
+        Vazifalarni `stop()` chaqirilguncha bajaradi. burst=True bo'lsa navbatda bajarilishi
+        mumkin bo'lgan vazifa qolmaganda qaytadi.
+        """
+        autodiscover_modules('tasks')
+        logger.info("Worker %s ishga tushdi (navbatlar: %s)", self.worker_id, self.queues or 'barchasi')
+        try:
+            if self.concurrency == 1:
+                self._run_serial(burst)
+            else:
+                self._run_pool(burst)
+        finally:
+            worker_stopped.send(sender=self.__class__, worker=self)
+            _close_connections()
+
+    def _run_serial(self, burst):
+        while not self.stopping.is_set():
+            jobs = self.claim(1)
+            for job in jobs:
+                self.run_job(job)
+            if not jobs:
+                if burst:
+                    return
+                _close_connections()
+                self.stopping.wait(self.poll_interval)
+
+    def _run_pool(self, burst):
+        active = set()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='job') as pool:
+            while not self.stopping.is_set():
+                jobs = self.claim(self.concurrency - len(active)) if len(active) < self.concurrency else []
+                active.update(pool.submit(self.run_job, job) for job in jobs)
+                if not jobs and not active and burst:
+                    return
+                if active:
+                    # Hamma o'rin band bo'lsa bittasi tugashini, aks holda yangi vazifani kutadi
+                    timeout = None if len(active) >= self.concurrency else self.poll_interval
+                    active = wait(active, timeout=timeout, return_when=FIRST_COMPLETED).not_done
+                elif not jobs:
+                    _close_connections()
+                    self.stopping.wait(self.poll_interval)
+            # To'xtatilganda boshlangan vazifalar tugatiladi
+            wait(active)
+
+    def stop(self):
+        self.stopping.set()
@@ -0,0 +1,95 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from joybor import bench
+
+
+class Command(BaseCommand):
+    help = ("API endpoint'lari benchmark'i: vaqtinchalik test bazasida sintetik ma'lumot yaratadi, har bir "
+            "router endpoint'ini (list, retrieve) chaqiradi va p50/p95/p99, SQL so'rovlar soni va javob "
+            "hajmini baseline bilan solishtiradi. Asosiy bazaga tegmaydi.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help="Ma'lumot hajmi koeffitsienti.")
+        parser.add_argument('--seed', type=int, default=0, help="Tasodifiy ma'lumot uchun seed.")
+        parser.add_argument('--iterations', type=int, default=50, help="Har bir endpoint uchun o'lchovlar soni.")
+        parser.add_argument('--warmup', type=int, default=5, help="O'lchovdan oldingi so'rovlar soni.")
+        parser.add_argument('--endpoint', action='append', dest='endpoints',
+                            help="Faqat nomida shu matn bo'lgan endpoint'lar (bir necha marta berish mumkin).")
+        parser.add_argument('--output', help="Natijani shu JSON faylga yozish.")
+        parser.add_argument('--baseline', default=getattr(settings, 'BENCH_BASELINE_PATH', None),
+                            help="Solishtiriladigan natija fayli (sukut bo'yicha BENCH_BASELINE_PATH).")
+        parser.add_argument('--update-baseline', action='store_true', help="Natijani baseline sifatida saqlash.")
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help="Kechikish va hajm uchun ruxsat etilgan o'sish (0.2 = 20%%).")
+        parser.add_argument('--fail-on-regression', action='store_true',
+                            help="Regressiya bo'lsa xato bilan chiqish (CI uchun).")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            users = bench.seed_dataset(scale=options['scale'], seed=options['seed'])
+            results = bench.run(users, iterations=max(1, options['iterations']), warmup=options['warmup'],
+                                only=options['endpoints'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'scale': options['scale'],
+                'seed': options['seed'],
+                'iterations': options['iterations'],
+            },
+            'results': results,
+        }
+        self.print_results(results)
+
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, indent=2))
+
+        baseline_path = Path(options['baseline']) if options['baseline'] else None
+        if options['update_baseline']:
+            if baseline_path is None:
+                raise CommandError("Baseline fayli ko'rsatilmagan (--baseline yoki BENCH_BASELINE_PATH).")
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(report, indent=2))
+            self.stdout.write(self.style.SUCCESS(f"Baseline saqlandi: {baseline_path}"))
+            return
+
+        if baseline_path is None or not baseline_path.exists():
+            self.stdout.write("Baseline topilmadi, solishtirilmadi.")
+            return
+        baseline = json.loads(baseline_path.read_text())
+        if baseline['meta'].get('scale') != options['scale']:
+            self.stdout.write(self.style.WARNING("Baseline boshqa --scale bilan olingan."))
+        regressions = bench.compare(results, baseline['results'], threshold=options['threshold'])
+        for name, metric, previous, current in regressions:
+            self.stdout.write(self.style.ERROR(f"REGRESSIYA {name} {metric}: {previous} -> {current}"))
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("Regressiya yo'q."))
+        elif options['fail_on_regression']:
+            raise CommandError(f"{len(regressions)} ta regressiya.")
+
+    def print_results(self, results):
+        width = max(len(name) for name in results) if results else 10
+        self.stdout.write(f"{'endpoint':<{width}} {'kod':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+                          f"{'SQL':>4} {'bayt':>8}")
+        for name, result in results.items():
+            if not bench.is_success(result['status']):
+                # Rolga ruxsat yo'q yoki xato: o'lchanmagan
+                self.stdout.write(f"{name:<{width}} {result['status']:>4} {'-':>8} {'-':>8} {'-':>8} {'-':>4} {'-':>8}")
+                continue
+            self.stdout.write(
+                f"{name:<{width}} {result['status']:>4} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+                f"{result['p99_ms']:>8.2f} {result['queries']:>4} {result['bytes']:>8}"
+            )
@@ -0,0 +1,238 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from itertools import cycle, islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from accounts.tokens import RoleRefreshToken
+from joybor.bench import percentile
+
+DEFAULT_PATHS = [
+    '/dormitories/dormitory/',
+    '/dormitories/room/',
+    '/universities/university/',
+    '/universities/faculty/',
+    '/accounts/userprofile/',
+]
+MODES = ('wsgi', 'asgi')
+TOKEN_ENV = 'JOYBOR_BENCH_TOKEN'
+
+
+def _summary(results, elapsed):
+    latencies = sorted(latency for latency, _, _ in results)
+    statuses = {}
+    for _, status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        'requests': len(results),
+        'errors': sum(1 for _, status, _ in results if status >= 400),
+        'statuses': statuses,
+        'rps': len(results) / elapsed if elapsed else 0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': latencies[-1] * 1000,
+        'bytes': sum(size for _, _, size in results) // len(results),
+    }
+
+
+def _split(path):
+    path, _, query = path.partition('?')
+    return path, query
+
+
+def run_wsgi(paths, concurrency, token):
+    """Oqimli WSGI server (gunicorn gthread kabi): `concurrency` ta oqim WSGIHandler ni chaqiradi."""
+    from django.core.handlers.wsgi import WSGIHandler
+
+    handler = WSGIHandler()
+
+    def request(path):
+        path, query = _split(path)
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'SCRIPT_NAME': '',
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': 'localhost',
+            'HTTP_AUTHORIZATION': f'Bearer {token}',
+            'wsgi.input': BytesIO(),
+            'wsgi.errors': sys.stderr,
+            'wsgi.url_scheme': 'http',
+        }
+        status = []
+        start = time.perf_counter()
+        response = handler(environ, lambda line, headers, exc_info=None: status.append(line))
+        try:
+            size = sum(len(chunk) for chunk in response)
+        finally:
+            # request_finished -> baza ulanishi yopiladi, server kabi
+            response.close()
+        return time.perf_counter() - start, int(status[0][:3]), size
+
+    def run(batch):
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(request, batch))
+
+    return run
+
+
+def run_asgi(paths, concurrency, token):
+    """ASGI server (uvicorn kabi): bitta event loop'da `concurrency` ta parallel so'rov."""
+    from django.core.handlers.asgi import ASGIHandler
+
+    handler = ASGIHandler()
+
+    async def request(path):
+        path, query = _split(path)
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'root_path': '',
+            'headers': [(b'host', b'localhost'), (b'authorization', f'Bearer {token}'.encode())],
+            'client': ('127.0.0.1', 0),
+            'server': ('localhost', 80),
+        }
+        messages = asyncio.Queue()
+        messages.put_nowait({'type': 'http.request', 'body': b'', 'more_body': False})
+        status = []
+        size = 0
+
+        async def send(message):
+            nonlocal size
+            if message['type'] == 'http.response.start':
+                status.append(message['status'])
+            elif message['type'] == 'http.response.body':
+                size += len(message.get('body', b''))
+
+        start = time.perf_counter()
+        # Tanadan keyin receive() mijoz uzilguncha kutadi
+        await handler(scope, messages.get, send)
+        return time.perf_counter() - start, status[0], size
+
+    async def run_batch(batch):
+        pending = iter(batch)
+        results = []
+
+        async def client():
+            for path in pending:
+                results.append(await request(path))
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        return results
+
+    return lambda batch: asyncio.run(run_batch(batch))
+
+
+RUNNERS = {'wsgi': run_wsgi, 'asgi': run_asgi}
+
+
+class Command(BaseCommand):
+    help = ("O'qish endpoint'larini bir vaqtdagi so'rovlar ostida WSGI (sinxron ViewSet'lar) va ASGI "
+            "(joybor.asyncviews) orqali o'lchaydi: so'rov/soniya va kechikish (p50/p95/p99). Har bir "
+            "rejim alohida jarayonda, server o'rniga Django handler'lari to'g'ridan-to'g'ri chaqiriladi. "
+            "Faqat o'qiydi.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, help="So'rovlar shu foydalanuvchi nomidan (username).")
+        parser.add_argument('--path', action='append', dest='paths',
+                            help="O'lchanadigan yo'l (bir necha marta berish mumkin). Sukut bo'yicha "
+                                 "asosiy list endpoint'lari.")
+        parser.add_argument('--requests', type=int, default=1000, help="Har bir rejimda so'rovlar soni.")
+        parser.add_argument('--concurrency', type=int, default=32, help="Bir vaqtdagi so'rovlar soni.")
+        parser.add_argument('--warmup', type=int, default=20, help="O'lchovdan oldingi so'rovlar soni.")
+        parser.add_argument('--mode', choices=MODES, action='append', dest='modes',
+                            help="Faqat shu rejim(lar). Sukut bo'yicha ikkalasi.")
+        parser.add_argument('--json', action='store_true', help="Natijani JSON ko'rinishida chiqarish.")
+        parser.add_argument('--worker', choices=MODES, help="(ichki) Bitta rejimni shu jarayonda o'lchash.")
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or DEFAULT_PATHS
+        if options['worker']:
+            return self.run_worker(options['worker'], paths, options)
+
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"Foydalanuvchi topilmadi: {options['user']}")
+        token = str(RoleRefreshToken.for_user(user).access_token)
+
+        results = {}
+        for mode in options['modes'] or MODES:
+            results[mode] = self.spawn(mode, paths, token, options)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.report(results, options)
+
+    def spawn(self, mode, paths, token, options):
+        """Rejimni yangi jarayonda o'lchaydi: ASYNC_READ_VIEWS URLconf yuklanganda o'qiladi."""
+        command = [
+            sys.executable, sys.argv[0], 'bench_asgi', '--worker', mode, '--user', options['user'],
+            '--requests', str(options['requests']), '--concurrency', str(options['concurrency']),
+            '--warmup', str(options['warmup']),
+        ]
+        for path in paths:
+            command += ['--path', path]
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'joybor.settings'),
+            'JOYBOR_ASYNC_READ_VIEWS': '1' if mode == 'asgi' else '0',
+            TOKEN_ENV: token,
+        }
+        process = subprocess.run(command, env=env, capture_output=True, text=True)
+        if process.returncode != 0:
+            raise CommandError(f"{mode} o'lchovi bajarilmadi:\n{process.stderr}")
+        return json.loads(process.stdout)
+
+    def run_worker(self, mode, paths, options):
+        if (mode == 'asgi') != bool(getattr(settings, 'ASYNC_READ_VIEWS', False)):
+            raise CommandError("ASYNC_READ_VIEWS rejimga mos emas (JOYBOR_ASYNC_READ_VIEWS).")
+        run = RUNNERS[mode](paths, max(1, options['concurrency']), os.environ[TOKEN_ENV])
+
+        run(list(islice(cycle(paths), options['warmup'])))
+        batch = list(islice(cycle(paths), max(1, options['requests'])))
+        start = time.perf_counter()
+        results = run(batch)
+        elapsed = time.perf_counter() - start
+
+        summary = _summary(results, elapsed)
+        summary['paths'] = {}
+        for path in paths:
+            summary['paths'][path] = _summary([result for p, result in zip(batch, results) if p == path], elapsed)
+        self.stdout.write(json.dumps(summary))
+
+    def report(self, results, options):
+        self.stdout.write(f"{options['requests']} so'rov, bir vaqtda {options['concurrency']}")
+        self.stdout.write(f"{'rejim':<6} {'so`rov/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+                          f"{'max ms':>9} {'xato':>6}")
+        for mode, summary in results.items():
+            self.stdout.write(
+                f"{mode:<6} {summary['rps']:>10.1f} {summary['p50_ms']:>9.1f} {summary['p95_ms']:>9.1f} "
+                f"{summary['p99_ms']:>9.1f} {summary['max_ms']:>9.1f} {summary['errors']:>6}"
+            )
+            if summary['errors']:
+                self.stdout.write(self.style.WARNING(f"  {mode}: javob kodlari {summary['statuses']}"))
+        if set(MODES) <= results.keys() and results['wsgi']['rps']:
+            self.stdout.write(
+                f"asgi/wsgi: so'rov/s x{results['asgi']['rps'] / results['wsgi']['rps']:.2f}, "
+                f"p99 x{results['asgi']['p99_ms'] / results['wsgi']['p99_ms']:.2f}"
+            )
@@ -0,0 +1,141 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, transaction
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from joybor import bench
+from payments.models import Month, PaymentForStudent
+from students.models import Student
+
+# Rejim -> worker jarayoni uchun muhit (joybor.database)
+MODES = {
+    'fresh': {'JOYBOR_DB_POOL': '0', 'JOYBOR_DB_CONN_MAX_AGE': '0'},
+    'persistent': {'JOYBOR_DB_POOL': '0', 'JOYBOR_DB_CONN_MAX_AGE': '600'},
+    'pool': {'JOYBOR_DB_POOL': '1'},
+}
+
+
+class Command(BaseCommand):
+    help = ("Bir vaqtda yozuvchi oqimlar ostida baza ulanishlari benchmark'i: har bir 'so'rov' to'lov yozadi "
+            "(ledger signallari bilan) va so'rov oxiridagi kabi close_old_connections() chaqiradi. "
+            "Rejimlar: fresh (har so'rovga yangi ulanish), persistent (CONN_MAX_AGE), pool (psycopg pool, "
+            "faqat PostgreSQL). Vaqtinchalik test bazasida ishlaydi, asosiy bazaga tegmaydi.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writes', type=int, default=2000, help="Har bir rejimda yozuvlar soni.")
+        parser.add_argument('--concurrency', type=int, default=16, help="Bir vaqtda yozuvchi oqimlar soni.")
+        parser.add_argument('--mode', choices=MODES, action='append', dest='modes',
+                            help="Faqat shu rejim(lar). Sukut bo'yicha bazaga mos barcha rejimlar.")
+        parser.add_argument('--json', action='store_true', help="Natijani JSON ko'rinishida chiqarish.")
+        parser.add_argument('--worker', choices=MODES, help="(ichki) Bitta rejimni shu jarayonda o'lchash.")
+
+    def handle(self, *args, **options):
+        if options['worker']:
+            return self.run_worker(options)
+
+        modes = options['modes'] or [mode for mode in MODES if mode != 'pool' or connection.vendor == 'postgresql']
+        if 'pool' in modes and connection.vendor != 'postgresql':
+            raise CommandError("pool rejimi faqat PostgreSQL uchun (JOYBOR_DB_ENGINE=postgresql).")
+
+        setup_test_environment()
+        if connection.vendor == 'sqlite':
+            # Worker jarayonlari in-memory bazani ko'rmaydi
+            connection.settings_dict['TEST']['NAME'] = str(settings.BASE_DIR / 'bench_db.sqlite3')
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            bench.seed_dataset()
+            test_name = connection.settings_dict['NAME']
+            connection.close()
+            results = {mode: self.spawn(mode, test_name, options) for mode in modes}
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.report(results, options)
+
+    def spawn(self, mode, test_name, options):
+        """Rejimni yangi jarayonda o'lchaydi: DATABASES sozlamalari faqat ishga tushishda o'qiladi."""
+        command = [
+            sys.executable, sys.argv[0], 'bench_db', '--worker', mode,
+            '--writes', str(options['writes']), '--concurrency', str(options['concurrency']),
+        ]
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'joybor.settings'),
+            'JOYBOR_DB_NAME': str(test_name),
+            **MODES[mode],
+        }
+        if mode == 'pool':
+            # Pool hajmi oqimlar sonidan kam bo'lsa, o'lchov kutishni ham o'z ichiga oladi
+            env.setdefault('JOYBOR_DB_POOL_MAX_SIZE', str(options['concurrency']))
+        process = subprocess.run(command, env=env, capture_output=True, text=True)
+        if process.returncode != 0:
+            raise CommandError(f"{mode} o'lchovi bajarilmadi:\n{process.stderr}")
+        return json.loads(process.stdout)
+
+    def run_worker(self, options):
+        student_ids = list(Student.objects.values_list('pk', flat=True))
+        month_ids = list(Month.objects.values_list('pk', flat=True))
+        if not student_ids or not month_ids:
+            raise CommandError("Bazada talaba yoki oy yo'q.")
+        close_old_connections()
+
+        def write(index):
+            start = time.perf_counter()
+            try:
+                with transaction.atomic():
+                    payment = PaymentForStudent.objects.create(student_id=student_ids[index % len(student_ids)],
+                                                               amount=Decimal(300000))
+                    payment.month.add(month_ids[index % len(month_ids)])
+                failed = False
+            except Exception:
+                failed = True
+            finally:
+                # request_finished kabi: CONN_MAX_AGE bo'yicha yopadi yoki ulanishni pool'ga qaytaradi
+                close_old_connections()
+            return time.perf_counter() - start, failed
+
+        writes = max(1, options['writes'])
+        with ThreadPoolExecutor(max_workers=max(1, options['concurrency'])) as pool:
+            start = time.perf_counter()
+            results = list(pool.map(write, range(writes)))
+            elapsed = time.perf_counter() - start
+
+        latencies = sorted(latency for latency, _ in results)
+        self.stdout.write(json.dumps({
+            'writes': writes,
+            'errors': sum(1 for _, failed in results if failed),
+            'wps': writes / elapsed if elapsed else 0,
+            'p50_ms': bench.percentile(latencies, 50) * 1000,
+            'p95_ms': bench.percentile(latencies, 95) * 1000,
+            'p99_ms': bench.percentile(latencies, 99) * 1000,
+            'max_ms': latencies[-1] * 1000,
+        }))
+
+    def report(self, results, options):
+        self.stdout.write(f"{connection.vendor}: {options['writes']} yozuv, "
+                          f"bir vaqtda {options['concurrency']} oqim")
+        self.stdout.write(f"{'rejim':<11} {'yozuv/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+                          f"{'max ms':>9} {'xato':>6}")
+        for mode, summary in results.items():
+            self.stdout.write(
+                f"{mode:<11} {summary['wps']:>9.1f} {summary['p50_ms']:>9.1f} {summary['p95_ms']:>9.1f} "
+                f"{summary['p99_ms']:>9.1f} {summary['max_ms']:>9.1f} {summary['errors']:>6}"
+            )
+        fresh = results.get('fresh')
+        if fresh and fresh['wps']:
+            for mode in ('persistent', 'pool'):
+                if mode in results:
+                    self.stdout.write(f"{mode}/fresh: yozuv/s x{results[mode]['wps'] / fresh['wps']:.2f}, "
+                                      f"p99 x{results[mode]['p99_ms'] / fresh['p99_ms']:.2f}")
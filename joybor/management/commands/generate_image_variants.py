@@ -0,0 +1,51 @@
+from functools import partial
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from joybor import images
+
+
+class Command(BaseCommand):
+    help = ("Mavjud rasmlar uchun hosilalarni (thumbnail, WebP) yaratadi. "
+            "Sukut bo'yicha faqat hosilasi yo'q yoki eskirgan rasmlar qayta ishlanadi.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Barcha rasmlar uchun qayta yaratish.")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Jarayonlar soni (sukut bo'yicha IMAGE_VARIANT_WORKERS, 0 - shu jarayonda).")
+
+    def _pending(self, model, field_name, force):
+        variants_field = images.variants_field_name(field_name)
+        queryset = model._base_manager.exclude(Q(**{f'{field_name}__isnull': True}) | Q(**{field_name: ''}))
+        for pk, name, variants in queryset.values_list('pk', field_name, variants_field).order_by('pk').iterator():
+            if force or (variants or {}).get('source') != name:
+                yield pk, name
+
+    def handle(self, *args, **options):
+        workers = options['workers'] if options['workers'] is not None else images.worker_count()
+        executor = images.make_executor(workers) if workers > 0 else None
+        try:
+            for label, field_name in images.IMAGE_FIELDS.items():
+                model = apps.get_model(label)
+                pending = list(self._pending(model, field_name, options['force']))
+                if executor:
+                    results = [executor.submit(images.generate_variants, name).result for _, name in pending]
+                else:
+                    results = [partial(images.generate_variants, name) for _, name in pending]
+
+                done = failed = 0
+                for (pk, name), result in zip(pending, results):
+                    try:
+                        variants = result()
+                    except Exception as exc:
+                        failed += 1
+                        self.stderr.write(f"{label} #{pk} ({name}): {exc}")
+                        continue
+                    done += images.save_variants(label, pk, field_name, variants)
+                self.stdout.write(f"{label}.{field_name}: {done} ta tayyor, {failed} ta xato")
+        finally:
+            if executor:
+                executor.shutdown()
+        self.stdout.write(self.style.SUCCESS("Rasm hosilalari yaratildi."))
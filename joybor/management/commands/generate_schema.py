@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from joybor.schema import generate_schema, schema_path, write_schema
+
+
+class Command(BaseCommand):
+    help = "OpenAPI (swagger.json) sxemasini generatsiya qilib diskka yozadi. Deploy yoki ishga tushishda chaqiriladi."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help="Fayl yo'li (sukut bo'yicha settings.OPENAPI_SCHEMA_PATH).")
+
+    def handle(self, *args, **options):
+        path = options['output'] or schema_path()
+        digest = write_schema(generate_schema(), path)
+        self.stdout.write(self.style.SUCCESS(f"Sxema yozildi: {path} (sha256 {digest[:12]})"))
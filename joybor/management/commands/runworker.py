@@ -0,0 +1,28 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from joybor.jobqueue import Worker
+
+
+class Command(BaseCommand):
+    help = ("Fon vazifalarini (joybor.jobqueue) bajaradi. SIGTERM/SIGINT olganda yangi vazifa olmaydi, "
+            "boshlanganlarini tugatib chiqadi.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queue', action='append', dest='queues',
+                            help="Faqat shu navbat(lar) (bir necha marta berish mumkin).")
+        parser.add_argument('--concurrency', type=int, default=4, help="Bir vaqtda bajariladigan vazifalar soni.")
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help="Navbat bo'sh bo'lganda tekshirish oralig'i (soniya).")
+        parser.add_argument('--burst', action='store_true', help="Navbat bo'shagach chiqish (cron, deploy).")
+
+    def handle(self, *args, **options):
+        worker = Worker(queues=options['queues'], concurrency=options['concurrency'],
+                        poll_interval=options['poll_interval'])
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: worker.stop())
+
+        self.stdout.write(f"Worker {worker.worker_id} ishga tushdi")
+        worker.run(burst=options['burst'])
+        self.stdout.write(self.style.SUCCESS("Worker to'xtadi."))
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from joybor.seed import PASSWORD, Seeder
+
+
+class Command(BaseCommand):
+    help = ("Yuklama testlari uchun katta hajmdagi sintetik ma'lumot (bulk_create, bitta umumiy parol hashi). "
+            "Bo'sh bazaga mo'ljallangan; bir xil --seed bir xil ma'lumot beradi.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help="Tasodifiy ma'lumot uchun seed.")
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help="Universitet, yotoqxona, talaba va ariza sonlari koeffitsienti (0.01 - tez sinov).")
+        parser.add_argument('--universities', type=int, default=300)
+        parser.add_argument('--faculties-per-university', type=int, default=8)
+        parser.add_argument('--dormitories', type=int, default=2000)
+        parser.add_argument('--floors', type=int, default=5, help="Har bir yotoqxonada qavatlar soni.")
+        parser.add_argument('--rooms-per-floor', type=int, default=20)
+        parser.add_argument('--students', type=int, default=1_000_000)
+        parser.add_argument('--applications', type=int, default=100_000)
+        parser.add_argument('--payments-per-student', type=int, default=1, help="O'rtacha to'lovlar soni.")
+        parser.add_argument('--skip-search-index', action='store_true',
+                            help="Qidiruv indeksini yozmaslik (keyin `rebuild_search_index` bilan quriladi).")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Bitta INSERT/tranzaksiyadagi yozuvlar.")
+
+    def handle(self, *args, **options):
+        scale = options['scale']
+        counts = {
+            name: max(1, round(options[name] * scale))
+            for name in ('universities', 'dormitories', 'students', 'applications')
+        }
+        started = time.monotonic()
+
+        def log(message):
+            self.stdout.write(f"[{time.monotonic() - started:7.1f}s] {message}")
+
+        seeder = Seeder(seed=options['seed'], batch_size=options['batch_size'],
+                        search_index=not options['skip_search_index'], log=log)
+        try:
+            seeder.run(
+                faculties_per_university=options['faculties_per_university'],
+                floors=options['floors'],
+                rooms_per_floor=options['rooms_per_floor'],
+                payments_per_student=options['payments_per_student'],
+                **counts,
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f"Tayyor ({time.monotonic() - started:.1f}s). Barcha foydalanuvchilar paroli: {PASSWORD}"
+        ))
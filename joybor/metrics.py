@@ -0,0 +1,318 @@
+"""
+Endpoint'lar bo'yicha ishlash ko'rsatkichlari, Prometheus matn formatida (/metrics).
+
+MetricsMiddleware har bir so'rovni route nomi (resolver_match.view_name) va metod
+bo'yicha yozadi: so'rovlar soni, kechikish va javob hajmi gistogrammalari, SQL so'rovlar
+soni va vaqti (har bir ulanishga qo'yiladigan execute wrapper orqali), serializer
+vaqti (`serializer.data`). So'rov ko'rsatkichlari ContextVar da yig'iladi, shuning
+uchun sync_to_async oqimlaridagi SQL ham o'z so'roviga yoziladi.
+
+Qiymatlar jarayon ichidagi registrda lock ostida yig'iladi. Bir necha jarayonli
+serverda (gunicorn, bir necha uvicorn worker) METRICS_DIR beriladi: har bir jarayon
+o'z qiymatlarini vaqti-vaqti bilan shu katalogdagi faylga yozadi, /metrics esa barcha
+fayllarni qo'shib beradi. To'xtagan jarayonlarning fayllari ham hisobga olinadi
+(hisoblagichlar kamaymasligi uchun), katalog deploy paytida tozalanadi.
+"""
+import atexit
+import json
+import os
+import threading
+import uuid
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from time import monotonic, perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from rest_framework.serializers import BaseSerializer
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# nom -> (tur, tavsif, gistogramma chegaralari)
+METRICS = {
+    'joybor_http_requests_total': ('counter', "So'rovlar soni.", None),
+    'joybor_http_request_duration_seconds': ('histogram', "So'rovning to'liq bajarilish vaqti.", LATENCY_BUCKETS),
+    'joybor_http_response_size_bytes': ('histogram', "Javob tanasi hajmi (streaming javoblarsiz).", SIZE_BUCKETS),
+    'joybor_db_queries_total': ('counter', "So'rov davomida bajarilgan SQL so'rovlar soni.", None),
+    'joybor_db_query_duration_seconds_total': ('counter', "SQL so'rovlarning umumiy vaqti.", None),
+    'joybor_serializer_duration_seconds_total': ('counter', "serializer.data ning umumiy vaqti.", None),
+}
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestStats:
+    __slots__ = ('queries', 'query_time', 'serializer_time', 'in_serializer')
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+        self.serializer_time = 0.0
+        self.in_serializer = False
+
+
+class Registry:
+    """(metrika, yorliqlar) -> qiymat; gistogramma uchun [chegaralar bo'yicha sonlar..., yig'indi, son]."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        # PID qayta ishlatilsa ham eski jarayon fayli ustiga yozilmasligi uchun
+        self._file_id = f'{self._pid}-{uuid.uuid4().hex[:8]}'
+        self._values = {}
+        self._flushed_at = monotonic()
+
+    def _check_fork(self):
+        # fork qilingan jarayon ota jarayon qiymatlarini takrorlamaydi
+        if self._pid != os.getpid():
+            self._reset()
+
+    def _inc(self, name, labels, value):
+        key = (name, labels)
+        self._values[key] = self._values.get(key, 0) + value
+
+    def _observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, labels)
+        series = self._values.get(key)
+        if series is None:
+            series = self._values[key] = [0] * (len(buckets) + 3)
+        series[bisect_left(buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def record_request(self, route, method, status, duration, stats, size=None):
+        labels = (('route', route), ('method', method))
+        with self._lock:
+            self._check_fork()
+            self._inc('joybor_http_requests_total', labels + (('status', str(status)),), 1)
+            self._observe('joybor_http_request_duration_seconds', labels, duration)
+            if size is not None:
+                self._observe('joybor_http_response_size_bytes', labels, size)
+            self._inc('joybor_db_queries_total', labels, stats.queries)
+            self._inc('joybor_db_query_duration_seconds_total', labels, stats.query_time)
+            self._inc('joybor_serializer_duration_seconds_total', labels, stats.serializer_time)
+
+    def snapshot(self):
+        with self._lock:
+            self._check_fork()
+            return [
+                [name, [list(label) for label in labels], list(value) if isinstance(value, list) else value]
+                for (name, labels), value in self._values.items()
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    # Ko'p jarayonli rejim (METRICS_DIR)
+
+    def file_path(self, directory):
+        return Path(directory) / f'{self._file_id}.json'
+
+    def flush(self, force=False):
+        directory = metrics_dir()
+        if not directory:
+            return
+        with self._lock:
+            if not force and monotonic() - self._flushed_at < flush_interval():
+                return
+            self._flushed_at = monotonic()
+        path = self.file_path(directory)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(f'.{threading.get_ident()}.tmp')
+        temporary.write_text(json.dumps(self.snapshot()))
+        os.replace(temporary, path)
+
+
+registry = Registry()
+
+
+def metrics_dir():
+    return getattr(settings, 'METRICS_DIR', None)
+
+
+def flush_interval():
+    return getattr(settings, 'METRICS_FLUSH_INTERVAL', 5)
+
+
+def collect():
+    """Shu jarayon va (METRICS_DIR bo'lsa) boshqa jarayonlar qiymatlari yig'indisi."""
+    samples = registry.snapshot()
+    directory = metrics_dir()
+    if directory and Path(directory).is_dir():
+        own = registry.file_path(directory).name
+        for path in Path(directory).glob('*.json'):
+            if path.name == own:
+                continue
+            try:
+                samples += json.loads(path.read_text())
+            except (OSError, ValueError):
+                # yozilayotgan yoki buzilgan fayl keyingi so'rovda o'qiladi
+                continue
+
+    merged = {}
+    for name, labels, value in samples:
+        if name not in METRICS:
+            continue
+        key = (name, tuple(tuple(label) for label in labels))
+        if isinstance(value, list):
+            current = merged.setdefault(key, [0] * len(value))
+            merged[key] = [a + b for a, b in zip(current, value)]
+        else:
+            merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _number(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return repr(value)
+
+
+def render(merged=None):
+    """Prometheus matn formati (0.0.4)."""
+    merged = collect() if merged is None else merged
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        series = sorted((labels, value) for (metric, labels), value in merged.items() if metric == name)
+        if not series:
+            continue
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in series:
+            if kind == 'counter':
+                lines.append(f'{name}{_labels(labels)} {_number(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(list(buckets) + ['+Inf'], value):
+                cumulative += count
+                lines.append(f'{name}_bucket{_labels(labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{name}_sum{_labels(labels)} {_number(value[-2])}')
+            lines.append(f'{name}_count{_labels(labels)} {value[-1]}')
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponse(status=401)
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
+
+
+def _route(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        # 404: noma'lum yo'llar alohida qatorlar ochmasligi uchun
+        return 'unmatched'
+    return match.view_name or match.route
+
+
+def _response_size(response):
+    if getattr(response, 'streaming', False):
+        return None
+    return len(response.content)
+
+
+class MetricsMiddleware:
+    """MIDDLEWARE ro'yxatida birinchi turadi: boshqa middleware'lar vaqti ham hisobga olinadi."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _finish(self, request, response, started, stats):
+        registry.record_request(_route(request), request.method, response.status_code,
+                                perf_counter() - started, stats, _response_size(response))
+        registry.flush()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._finish(request, response, started, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._finish(request, response, started, stats)
+        return response
+
+
+def record_query(execute, sql, params, many, context):
+    """connection.execute_wrappers uchun: joriy so'rovning SQL soni va vaqti."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.query_time += perf_counter() - started
+
+
+def _install_query_wrapper(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def _timed_data(data):
+    @wraps(data.fget)
+    def timed(serializer):
+        stats = _current.get()
+        # Ichma-ich serializer'lar tashqi serializer vaqtiga kiradi
+        if stats is None or stats.in_serializer:
+            return data.fget(serializer)
+        stats.in_serializer = True
+        started = perf_counter()
+        try:
+            return data.fget(serializer)
+        finally:
+            stats.serializer_time += perf_counter() - started
+            stats.in_serializer = False
+
+    return property(timed)
+
+
+def connect_signals():
+    connection_created.connect(_install_query_wrapper, dispatch_uid='joybor-metrics-query-wrapper')
+    if not getattr(BaseSerializer.data.fget, '__wrapped__', None):
+        BaseSerializer.data = _timed_data(BaseSerializer.data)
+    atexit.register(registry.flush, force=True)
@@ -0,0 +1,462 @@
+import csv
+import hashlib
+import re
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework import serializers
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from . import refdata
+from .serializers import parse_field_tree
+
+DISPLAY_METHOD_RE = re.compile(r'^get_(?P<field>\w+)_display$')
+
+
+def _get_model_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _nested_serializer(field):
+    """Ichma-ich serializer bo'lsa (many=True bo'lsa ham) uni qaytaradi."""
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    if isinstance(field, serializers.BaseSerializer):
+        return field
+    return None
+
+
+class QuerysetPlan:
+    """
+    Serializer maydonlaridan kelib chiqib queryset uchun select_related,
+    prefetch_related va only() ro'yxatlarini yig'adi.
+    """
+
+    def __init__(self, serializer, model):
+        self.select_related = set()
+        self.prefetch_related = set()
+        self.only = self._walk(serializer, model, prefix='', in_prefetch=False)
+
+    def _walk(self, serializer, model, prefix, in_prefetch):
+        """
+        Serializerni aylanib chiqadi. only() uchun yo'llar ro'yxatini qaytaradi,
+        agar bu darajada qaysi ustunlar kerakligini aniqlab bo'lmasa None qaytaradi.
+        """
+        only = {model._meta.pk.name}
+        safe = True
+
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+
+            if field.source == '*':
+                nested = _nested_serializer(field)
+                if nested is None:
+                    # SerializerMethodField va shunga o'xshashlar istalgan ustunni o'qishi mumkin
+                    safe = False
+                    continue
+                nested_only = self._walk(nested, model, prefix, in_prefetch)
+                if nested_only is None:
+                    safe = False
+                else:
+                    only.update(nested_only)
+                continue
+
+            attr = field.source_attrs[0]
+            model_field = _get_model_field(model, attr)
+
+            if model_field is None:
+                match = DISPLAY_METHOD_RE.match(attr)
+                if match and _get_model_field(model, match.group('field')) is not None:
+                    only.add(match.group('field'))
+                else:
+                    safe = False
+                continue
+
+            if not model_field.is_relation:
+                only.add(attr)
+                # ImageVariantsField kabi maydonlar yonidagi ustunni ham o'qiydi
+                only.update(getattr(field, 'extra_columns', ()))
+                continue
+
+            if model_field.concrete and attr == model_field.attname != model_field.name:
+                # source='university_id': bog'langan obyekt emas, faqat ustunning o'zi o'qiladi
+                only.add(model_field.name)
+                continue
+
+            path = prefix + attr
+            nested = _nested_serializer(field)
+
+            if model_field.many_to_many or model_field.one_to_many:
+                self.prefetch_related.add(path)
+                if nested is not None:
+                    self._walk(nested, model_field.related_model, path + '__', in_prefetch=True)
+                continue
+
+            needs_object = nested is not None or len(field.source_attrs) > 1 or not (
+                isinstance(field, serializers.PrimaryKeyRelatedField) and field.use_pk_only_optimization()
+            )
+            if not needs_object:
+                # PrimaryKeyRelatedField faqat <field>_id ustunini o'qiydi
+                only.add(attr)
+                continue
+
+            if in_prefetch:
+                self.prefetch_related.add(path)
+            else:
+                self.select_related.add(path)
+
+            if not model_field.concrete:
+                # Teskari OneToOne bog'lanishni only() ga qo'shib bo'lmaydi
+                safe = False
+                if nested is not None:
+                    self._walk(nested, model_field.related_model, path + '__', in_prefetch)
+                continue
+
+            only.add(attr)
+            if nested is not None:
+                nested_only = self._walk(nested, model_field.related_model, path + '__', in_prefetch)
+                if nested_only is not None:
+                    only.update(f'{attr}__{name}' for name in nested_only)
+
+        return only if safe else None
+
+    def apply(self, queryset, use_only=True):
+        if self.select_related:
+            queryset = queryset.select_related(*sorted(self.select_related))
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*sorted(self.prefetch_related))
+        if use_only and self.only is not None:
+            queryset = queryset.only(*sorted(self.only))
+        return queryset
+
+
+class OptimizedQuerysetMixin:
+    """
+    ViewSet uchun mixin: serializerdagi ichma-ich va bog'langan maydonlarni o'qib,
+    querysetga mos select_related / prefetch_related / only() qo'llaydi.
+
+    Serializer ichida ko'rinmaydigan bog'lanishlar (masalan SerializerMethodField
+    ichida ishlatiladiganlari) `extra_select_related` va `extra_prefetch_related`,
+    serializerda bo'lmasa ham o'qilishi kerak ustunlar `extra_only` orqali qo'shiladi.
+    """
+    extra_select_related = ()
+    extra_prefetch_related = ()
+    extra_only = ()
+
+    def optimize_queryset(self, queryset):
+        serializer = self.get_serializer()
+        plan = QuerysetPlan(serializer, queryset.model)
+        plan.select_related.update(self.extra_select_related)
+        plan.prefetch_related.update(self.extra_prefetch_related)
+        if plan.only is not None:
+            plan.only.update(path.split('__')[0] for path in self.extra_select_related)
+            for path in self.extra_only:
+                # Bog'langan obyekt ustuni faqat u ham only() bilan cheklangan bo'lsa qo'shiladi,
+                # aks holda obyektning qolgan ustunlari kechiktirilib qoladi
+                prefix = path.rpartition('__')[0]
+                if not prefix or any(name.startswith(f'{prefix}__') for name in plan.only):
+                    plan.only.add(path)
+        # Yozish amallarida instance to'liq bo'lishi kerak, shuning uchun only() faqat o'qishda
+        return plan.apply(queryset, use_only=self.request.method in SAFE_METHODS)
+
+    def filter_queryset(self, queryset):
+        if not getattr(self, 'swagger_fake_view', False):
+            queryset = self.optimize_queryset(queryset)
+        return super().filter_queryset(queryset)
+
+
+class PreconditionFailed(APIException):
+    status_code = 412
+    default_detail = "Obyekt siz olgan nusxadan keyin o'zgargan. Qayta yuklab, keyin o'zgartiring."
+    default_code = 'precondition_failed'
+
+
+class ConditionalRequestMixin:
+    """
+    ViewSet uchun HTTP shartli so'rovlar (ETag, Last-Modified, If-None-Match, If-Match).
+
+    Validator serializatsiyadan oldin hisoblanadi:
+    - list: filtrlangan querysetdagi Max(updated_at) va Count, bitta aggregate so'rov bilan.
+      Bog'langan jadvallardagi o'zgarishlar hisobga olinmaydi, shuning uchun ETag kuchsiz (W/).
+    - retrieve va yozish amallari: obyektning updated_at i va `expand`/`fields` parametrlari
+      (har xil ko'rinish - har xil ETag). `?expand=` bilan kengaytirilgan ForeignKey obyektlarining
+      updated_at i ham qo'shiladi va ETag kuchsiz bo'ladi. Teskari bog'lanishlar (masalan
+      yotoqxona rasmlari) o'zgarganda ota obyektning updated_at i yangilanishi kerak.
+    GET/HEAD da validator mos kelsa 304 qaytadi, update/partial_update/destroy da If-Match
+    (yoki If-Unmodified-Since) joriy holatga mos kelmasa 412 qaytadi.
+
+    OptimizedQuerysetMixin dan oldin qo'yiladi, shunda only() updated_at ni (kengaytirilgan
+    obyektlarnikini ham) o'qiydi.
+    """
+    updated_at_field = 'updated_at'
+
+    def get_object(self):
+        # Validator va amalning o'zi bitta obyektdan foydalanadi, qayta so'rov yo'q
+        if getattr(self, '_conditional_object', None) is None:
+            self._conditional_object = super().get_object()
+        return self._conditional_object
+
+    @staticmethod
+    def _make_etag(*parts, weak=False):
+        digest = hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()[:32]
+        return f'{"W/" if weak else ""}"{digest}"'
+
+    def _list_stats(self):
+        return {'last': Max(self.updated_at_field), 'count': Count('pk')}
+
+    def _list_validators(self, queryset, stats):
+        last = stats['last']
+        etag = self._make_etag(queryset.model._meta.label, stats['count'], last and last.isoformat(), weak=True)
+        return etag, last and int(last.timestamp())
+
+    def get_list_validators(self, queryset):
+        return self._list_validators(queryset, queryset.order_by().aggregate(**self._list_stats()))
+
+    async def aget_list_validators(self, queryset):
+        return self._list_validators(queryset, await queryset.order_by().aaggregate(**self._list_stats()))
+
+    def _expanded_relations(self, model, tree, prefix=''):
+        """`?expand=` dagi ForeignKey/OneToOne yo'llari va modellari: [('floor', Floor), ('floor__dormitory', ...)]."""
+        relations = []
+        for name, children in sorted(tree.items()):
+            field = _get_model_field(model, name)
+            if field is None or not field.is_relation or not field.concrete or field.many_to_many:
+                continue
+            relations.append((prefix + name, field.related_model))
+            relations += self._expanded_relations(field.related_model, children, f'{prefix}{name}__')
+        return relations
+
+    def get_expanded_relations(self, model):
+        request = getattr(self, 'request', None)
+        expand = request.query_params.get('expand', '') if request is not None else ''
+        return self._expanded_relations(model, parse_field_tree(expand))
+
+    @property
+    def extra_only(self):
+        model = self.queryset.model if self.queryset is not None else None
+        expanded = self.get_expanded_relations(model) if model is not None else []
+        return (self.updated_at_field, *(
+            f'{path}__{self.updated_at_field}' for path, related_model in expanded
+            if _get_model_field(related_model, self.updated_at_field) is not None
+        ))
+
+    def _expanded_versions(self, instance):
+        versions = []
+        for path, _ in self.get_expanded_relations(type(instance)):
+            related = instance
+            for name in path.split('__'):
+                related = getattr(related, name) if related is not None else None
+            if related is not None:
+                updated_at = getattr(related, self.updated_at_field, None)
+                versions.append(f'{path}:{related.pk}:{updated_at and updated_at.isoformat()}')
+        return versions
+
+    def get_object_validators(self, instance):
+        updated_at = getattr(instance, self.updated_at_field)
+        request = getattr(self, 'request', None)
+        params = request.query_params if request is not None else {}
+        expand, fields = params.get('expand', ''), params.get('fields', '')
+        etag = self._make_etag(
+            instance._meta.label, instance.pk, updated_at and updated_at.isoformat(), expand, fields,
+            *self._expanded_versions(instance), weak=bool(expand),
+        )
+        return etag, updated_at and int(updated_at.timestamp())
+
+    def check_preconditions(self, request, etag, last_modified):
+        """Javob tayyor bo'lsa (304) uni qaytaradi, 412 holatida xato ko'taradi, aks holda None."""
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None and response.status_code == PreconditionFailed.status_code:
+            raise PreconditionFailed()
+        return response
+
+    @staticmethod
+    def set_validators(response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # Brauzer javobni evristik keshlamasin, har safar validator bilan tekshirsin
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = self.get_list_validators(self.filter_queryset(self.get_queryset()))
+        response = self.check_preconditions(request, etag, last_modified)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        etag, last_modified = self.get_object_validators(self.get_object())
+        response = self.check_preconditions(request, etag, last_modified)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+    # AsyncReadMixin bilan (joybor.asyncviews)
+    async def aget_object(self):
+        if getattr(self, '_conditional_object', None) is None:
+            self._conditional_object = await super().aget_object()
+        return self._conditional_object
+
+    async def alist(self, request, *args, **kwargs):
+        etag, last_modified = await self.aget_list_validators(self.filter_queryset(self.get_queryset()))
+        response = self.check_preconditions(request, etag, last_modified)
+        if response is None:
+            response = await super().alist(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        etag, last_modified = self.get_object_validators(await self.aget_object())
+        response = self.check_preconditions(request, etag, last_modified)
+        if response is None:
+            response = await super().aretrieve(request, *args, **kwargs)
+        return self.set_validators(response, etag, last_modified)
+
+    def update(self, request, *args, **kwargs):
+        instance = self.get_object()
+        self.check_preconditions(request, *self.get_object_validators(instance))
+        response = super().update(request, *args, **kwargs)
+        return self.set_validators(response, *self.get_object_validators(instance))
+
+    def destroy(self, request, *args, **kwargs):
+        self.check_preconditions(request, *self.get_object_validators(self.get_object()))
+        return super().destroy(request, *args, **kwargs)
+
+
+class ReferenceListMixin:
+    """
+    Ma'lumotnoma ViewSet'lari uchun: list() javobi bazadan emas, joybor.refdata keshidan
+    quriladi (tartib modelning Meta.ordering i bo'yicha).
+
+    `reference_filter_params` dagi parametrlar ({'university': 'university_id'}) xotirada
+    qo'llanadi. Boshqa parametr (qidiruv, ordering ...) kelsa odatiy list() ishlaydi.
+    """
+    reference_filter_params = {}
+    reference_passthrough_params = ('expand', 'fields', 'format')
+
+    def _can_use_reference_table(self, request):
+        allowed = set(self.reference_passthrough_params) | set(self.reference_filter_params)
+        if self.paginator is not None:
+            allowed.update(filter(None, [
+                getattr(self.paginator, 'page_query_param', None),
+                getattr(self.paginator, 'page_size_query_param', None),
+            ]))
+        return all(name in allowed for name in request.query_params)
+
+    def _filter_reference_objects(self, request, objects):
+        model = self.queryset.model
+        for param, attname in self.reference_filter_params.items():
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                value = model._meta.get_field(attname).to_python(value)
+            except DjangoValidationError:
+                return None
+            objects = [obj for obj in objects if getattr(obj, attname) == value]
+        return objects
+
+    def get_reference_objects(self, request):
+        """Keshdan olingan obyektlar ro'yxati yoki so'rovni keshdan berib bo'lmasa None."""
+        if not self._can_use_reference_table(request):
+            return None
+        return self._filter_reference_objects(request, refdata.get_table(self.queryset.model).objects)
+
+    async def aget_reference_objects(self, request):
+        if not self._can_use_reference_table(request):
+            return None
+        return self._filter_reference_objects(request, (await refdata.aget_table(self.queryset.model)).objects)
+
+    def list(self, request, *args, **kwargs):
+        objects = self.get_reference_objects(request)
+        if objects is None:
+            return super().list(request, *args, **kwargs)
+
+        page = self.paginate_queryset(objects)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(objects, many=True).data)
+
+    # AsyncReadMixin bilan (joybor.asyncviews)
+    async def alist(self, request, *args, **kwargs):
+        objects = await self.aget_reference_objects(request)
+        if objects is None:
+            return await super().alist(request, *args, **kwargs)
+
+        page = self.paginate_queryset(objects)
+        if page is not None:
+            return self.get_paginated_response(await self.aserialize(page, many=True))
+        return Response(await self.aserialize(objects, many=True))
+
+
+class _Echo:
+    """csv.writer uchun bufer: yozilgan qatorni shunchaki qaytaradi."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(rows, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([row[field] for field in fields])
+
+
+def _ndjson_lines(rows, fields):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(row) + '\n'
+
+
+class ExportMixin:
+    """
+    ViewSet uchun `GET .../export/?file_format=csv|ndjson` amali.
+
+    List bilan bir xil filter, qidiruv va tartiblash qo'llanadi, lekin sahifalanmaydi.
+    Qatorlar `.values()` ko'rinishida `iterator(chunk_size=...)` orqali o'qilib, javobga
+    oqim sifatida yoziladi, shuning uchun xotira sarfi qatorlar soniga bog'liq emas.
+    PostgreSQL'da iterator server-side cursor ochadi (joybor.database), chunk_size - bitta
+    FETCH dagi qatorlar soni.
+    Ustunlar `export_fields` da beriladi, bo'lmasa modelning oddiy ustunlari olinadi.
+    """
+    export_fields = None
+    export_chunk_size = 2000
+    export_formats = {
+        'csv': ('text/csv; charset=utf-8', _csv_lines),
+        'ndjson': ('application/x-ndjson; charset=utf-8', _ndjson_lines),
+    }
+
+    def get_export_fields(self, model):
+        if self.export_fields is not None:
+            return list(self.export_fields)
+        return [field.name for field in model._meta.concrete_fields]
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in self.export_formats:
+            raise ValidationError({'file_format': f"Faqat {', '.join(self.export_formats)} formatlari mavjud."})
+        content_type, render = self.export_formats[file_format]
+
+        queryset = self.filter_queryset(self.get_queryset())
+        fields = self.get_export_fields(queryset.model)
+        # values() bilan prefetch ishlamaydi, select_related/only esa e'tiborsiz qoldiriladi
+        rows = queryset.prefetch_related(None).values(*fields).iterator(chunk_size=self.export_chunk_size)
+
+        response = StreamingHttpResponse(render(rows, fields), content_type=content_type)
+        filename = f'{queryset.model._meta.model_name}.{file_format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
@@ -0,0 +1,157 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CursorOrPageNumberPagination(PageNumberPagination):
+    """
+    Sukut bo'yicha oddiy PageNumberPagination. `?pagination=cursor` (yoki `?cursor=`)
+    berilsa keyset pagination ishlaydi: COUNT(*) va OFFSET yo'q, har qanday chuqurlikdagi
+    sahifa birinchi sahifa bilan bir xil turadi.
+
+    Tartib view'dagi `cursor_ordering` dan olinadi, masalan ('-created_at', '-id').
+    Oxirgi maydon yagona (odatda id) bo'lishi va shu tartibga mos indeks bo'lishi kerak.
+    Kursor rejimida ?ordering= e'tiborsiz qoldiriladi.
+    """
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = "Noto'g'ri kursor."
+
+    def is_cursor_mode(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.is_cursor_mode(request)
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = [(name.lstrip('-'), name.startswith('-')) for name in view.cursor_ordering]
+        self.model = queryset.model
+        values, reverse = self.decode_cursor(request)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [(name, not descending) for name, descending in ordering]
+        queryset = queryset.order_by(*[('-' if descending else '') + name for name, descending in ordering])
+        if values is not None:
+            queryset = queryset.filter(self._after(ordering, values))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Orqaga yurilganda "keyingi" sahifa doim bor, oldinga yurilganda "oldingi" ham
+        self.has_next = has_more if not reverse else values is not None
+        self.has_previous = values is not None if not reverse else has_more
+        self.page_rows = rows
+        return rows
+
+    @staticmethod
+    def _after(ordering, values):
+        """(a, b, id) > (x, y, z) shartini tartib yo'nalishlarini hisobga olib quradi."""
+        condition = Q()
+        for index, (name, descending) in enumerate(ordering):
+            step = Q(**{f"{name}__{'lt' if descending else 'gt'}": values[index]})
+            for previous, (previous_name, _) in enumerate(ordering[:index]):
+                step &= Q(**{previous_name: values[previous]})
+            condition |= step
+        return condition
+
+    def _position(self, row):
+        return [getattr(row, name) for name, _ in self.ordering]
+
+    def encode_cursor(self, values, reverse):
+        # default=str: sana mikrosekundlari bilan saqlanadi (DjangoJSONEncoder ularni qisqartiradi)
+        payload = json.dumps({'v': values, 'r': int(reverse)}, default=str)
+        cursor = urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        url = replace_query_param(url, self.mode_query_param, 'cursor')
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+            values = [
+                self.model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(self.ordering, payload['v'], strict=True)
+            ]
+            return values, bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, AttributeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not self.has_next or not self.page_rows:
+            return None
+        return self.encode_cursor(self._position(self.page_rows[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.cursor_mode:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page_rows:
+            return None
+        return self.encode_cursor(self._position(self.page_rows[0]), reverse=True)
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+async def apaginate_queryset(pagination, queryset, request, view):
+    """
+    `pagination.paginate_queryset()` ning async varianti (joybor.asyncviews). Sahifali
+    PageNumberPagination da COUNT va sahifa qatorlari async ORM bilan o'qiladi, boshqa
+    rejimlar (kursor va h.k.) sinxron kod orqali bajariladi.
+    """
+    if not isinstance(pagination, PageNumberPagination) or (
+        isinstance(pagination, CursorOrPageNumberPagination) and pagination.is_cursor_mode(request)
+    ):
+        return await sync_to_async(pagination.paginate_queryset)(queryset, request, view)
+
+    pagination.cursor_mode = False
+    pagination.request = request
+    page_size = pagination.get_page_size(request)
+    if not page_size:
+        return None
+
+    paginator = pagination.django_paginator_class(queryset, page_size)
+    # Paginator.count cached_property, page() uni qayta hisoblamaydi
+    paginator.count = await queryset.acount()
+    page_number = pagination.get_page_number(request, paginator)
+    try:
+        pagination.page = paginator.page(page_number)
+    except InvalidPage as exc:
+        raise NotFound(pagination.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+    if paginator.num_pages > 1 and pagination.template is not None:
+        pagination.display_page_controls = True
+
+    page = pagination.page
+    page.object_list = [obj async for obj in page.object_list.aiterator(chunk_size=page_size)]
+    return list(page)
@@ -0,0 +1,210 @@
+"""
+Ma'lumotnoma jadvallari (universitetlar, fakultetlar, viloyatlar, tumanlar, oylar) keshi.
+
+Bu jadvallar deyarli o'zgarmaydi, shuning uchun ular to'liq holda bir marta o'qiladi:
+- qatorlar umumiy keshda (`default` backend) `refdata:<model>:<versiya>` kalitida turadi;
+- har bir jarayon shu versiya uchun qurilgan obyektlarni xotirada saqlaydi, keyingi
+  murojaatlar faqat keshdagi versiya raqamini tekshiradi, bazaga bormaydi.
+
+Jadval o'zgarganda (post_save/post_delete) versiya almashtiriladi va barcha jarayonlar
+keyingi murojaatda yangi ma'lumotni oladi. Signal chiqarmaydigan o'zgarishlardan
+(`update()`, `bulk_create()`, data migration) keyin `bump_version(Model)` chaqiriladi.
+
+Versiyalar barcha jarayonlarga yetishi uchun `default` kesh umumiy bo'lishi kerak (Redis yoki
+DatabaseCache, joybor.database). Jarayon ichidagi LocMemCache'da versiya kaliti
+REFDATA_LOCAL_VERSION_TIMEOUT soniyadan keyin eskiradi, ya'ni boshqa worker'dagi o'zgarish
+shu muddat ichida ko'rinadi; `manage.py check --deploy` bunday keshda xato beradi.
+
+Qaytariladigan obyektlar jarayon bo'ylab umumiy, ularni o'zgartirmaslik kerak.
+"""
+from uuid import uuid4
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, register
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.connection import ConnectionProxy
+
+REFERENCE_MODELS = (
+    'universities.University',
+    'universities.Faculty',
+    'students.Province',
+    'students.District',
+    'payments.Month',
+)
+
+# model label -> (versiya, ReferenceTable)
+_tables = {}
+
+
+def _timeout():
+    return getattr(settings, 'REFDATA_CACHE_TIMEOUT', 60 * 60 * 24)
+
+
+def is_shared_cache(backend):
+    """Kesh boshqa jarayonlar bilan umumiymi (LocMemCache va DummyCache - yo'q)."""
+    return not isinstance(backend, (LocMemCache, DummyCache))
+
+
+def _version_timeout():
+    backend = caches[DEFAULT_CACHE_ALIAS] if isinstance(cache, ConnectionProxy) else cache
+    if is_shared_cache(backend):
+        return None
+    # Boshqa jarayonning bump'i bu yerga yetmaydi: versiya muddat o'tgach qaytadan o'qiladi
+    return getattr(settings, 'REFDATA_LOCAL_VERSION_TIMEOUT', 30)
+
+
+def _version_key(label):
+    return f'refdata:version:{label}'
+
+
+def _rows_key(label, version):
+    return f'refdata:{label}:{version}'
+
+
+def reference_models():
+    return [apps.get_model(label) for label in REFERENCE_MODELS]
+
+
+def is_reference_model(model):
+    return model._meta.label in REFERENCE_MODELS
+
+
+def _parent_fields(model):
+    """Boshqa ma'lumotnoma jadvaliga ishora qiluvchi ForeignKey'lar (Faculty.university ...)."""
+    return [
+        field for field in model._meta.concrete_fields
+        if field.many_to_one and is_reference_model(field.related_model)
+    ]
+
+
+def _dependents(model):
+    """Modelning o'zi va unga ForeignKey orqali bog'langan ma'lumotnoma modellari."""
+    return [model] + [
+        other for other in reference_models()
+        if any(field.related_model is model for field in _parent_fields(other))
+    ]
+
+
+class ReferenceTable:
+    def __init__(self, model, objects):
+        self.model = model
+        self.objects = objects
+        self._by_pk = {obj.pk: obj for obj in objects}
+        self._groups = {}
+
+    def get(self, pk):
+        return self._by_pk.get(pk)
+
+    def children(self, attname, value):
+        """`attname` ustuni `value` ga teng obyektlar, masalan children('university_id', 3)."""
+        if attname not in self._groups:
+            groups = {}
+            for obj in self.objects:
+                groups.setdefault(getattr(obj, attname), []).append(obj)
+            self._groups[attname] = groups
+        return self._groups[attname].get(value, [])
+
+    def filter(self, **attrs):
+        return [obj for obj in self.objects if all(getattr(obj, name) == value for name, value in attrs.items())]
+
+
+def _current_version(label):
+    version = cache.get(_version_key(label))
+    if version is None:
+        # Kesh bo'sh (yangi ishga tushish yoki siqib chiqarilgan): versiyani birinchi bo'lib qo'ygan yutadi
+        cache.add(_version_key(label), uuid4().hex, _version_timeout())
+        version = cache.get(_version_key(label))
+    return version
+
+
+def _load_rows(model, version):
+    key = _rows_key(model._meta.label, version)
+    rows = cache.get(key)
+    if rows is None:
+        names = [field.attname for field in model._meta.concrete_fields]
+        queryset = model._base_manager.order_by(*(model._meta.ordering or ['pk']))
+        rows = (names, list(queryset.values_list(*names)))
+        cache.set(key, rows, _timeout())
+    return rows
+
+
+def _build_table(model, version):
+    names, rows = _load_rows(model, version)
+    objects = [model.from_db(DEFAULT_DB_ALIAS, names, row) for row in rows]
+    # Faculty.university kabi bog'lanishlar ham so'rovsiz ishlashi uchun
+    for field in _parent_fields(model):
+        parents = get_table(field.related_model)
+        for obj in objects:
+            field.set_cached_value(obj, parents.get(getattr(obj, field.attname)))
+    return ReferenceTable(model, objects)
+
+
+def get_table(model):
+    label = model._meta.label
+    version = _current_version(label)
+    cached = _tables.get(label)
+    if cached is None or cached[0] != version:
+        cached = (version, _build_table(model, version))
+        _tables[label] = cached
+    return cached[1]
+
+
+async def aget_table(model):
+    """get_table() ning async varianti: jadval joriy bo'lsa bazaga (va oqimga) o'tilmaydi."""
+    label = model._meta.label
+    cached = _tables.get(label)
+    if cached is not None and cached[0] == _current_version(label):
+        return cached[1]
+    return await sync_to_async(get_table)(model)
+
+
+def get_object(model, pk):
+    return get_table(model).get(pk)
+
+
+def _bump(labels):
+    for label in labels:
+        cache.set(_version_key(label), uuid4().hex, _version_timeout())
+
+
+def bump_version(model):
+    """Model va unga bog'liq ma'lumotnoma jadvallarining keshini eskirgan deb belgilaydi."""
+    labels = [dependent._meta.label for dependent in _dependents(model)]
+    _bump(labels)
+    # Tranzaksiya tugashidan oldin boshqa jarayon eski qatorlarni yangi versiya bilan
+    # keshlab qo'ygan bo'lishi mumkin, shuning uchun commit'dan keyin yana bir marta
+    transaction.on_commit(lambda: _bump(labels))
+
+
+def clear():
+    """Jarayondagi jadvallarni va umumiy keshdagi versiyalarni tashlab yuboradi."""
+    _tables.clear()
+    cache.delete_many([_version_key(label) for label in REFERENCE_MODELS])
+
+
+def _on_change(sender, **kwargs):
+    bump_version(sender)
+
+
+def connect_signals():
+    for model in reference_models():
+        post_save.connect(_on_change, sender=model, dispatch_uid=f'refdata-save-{model._meta.label}')
+        post_delete.connect(_on_change, sender=model, dispatch_uid=f'refdata-delete-{model._meta.label}')
+
+
+@register(deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    if is_shared_cache(caches[DEFAULT_CACHE_ALIAS]):
+        return []
+    return [Error(
+        "`default` kesh jarayonlar o'rtasida umumiy emas: ma'lumotnoma o'zgarishlari boshqa "
+        "worker'larga REFDATA_LOCAL_VERSION_TIMEOUT kechikish bilan yetadi.",
+        hint="JOYBOR_CACHE_BACKEND=redis (JOYBOR_CACHE_URL) yoki JOYBOR_CACHE_BACKEND=db o'rnating.",
+        id='joybor.E001',
+    )]
@@ -0,0 +1,120 @@
+"""
+OpenAPI sxemasi.
+
+Sxema `manage.py generate_schema` bilan deploy/ishga tushishda bir marta yaratilib,
+OPENAPI_SCHEMA_PATH ga (yonida sha256 xeshi bilan) yoziladi. `swagger.json` uni diskdan
+ETag va Cache-Control bilan beradi, drf_yasg har so'rovda viewset'larni qayta tahlil qilmaydi.
+Har so'rovda generatsiya faqat OPENAPI_SCHEMA_LIVE = True (debug) rejimida.
+"""
+import hashlib
+import logging
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.views.decorators.http import condition
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+from rest_framework.request import Request
+
+logger = logging.getLogger(__name__)
+
+API_INFO = openapi.Info(
+    title="Joy Bor API",
+    default_version='v1',
+    description="Yotoqxona tizimi uchun API",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="vohobjonovsardorbek2005@gmail.com"),
+    license=openapi.License(name="BSD License"),
+)
+
+schema_view = get_schema_view(
+    API_INFO,
+    public=True,
+    permission_classes=(permissions.AllowAny,),
+)
+
+# (fayl yo'li, mtime) -> (kontent, xesh); fayl o'zgarmaguncha qayta o'qilmaydi
+_loaded = {}
+
+
+def schema_path():
+    return Path(settings.OPENAPI_SCHEMA_PATH)
+
+
+def _hash_path(path):
+    return path.with_name(path.name + '.sha256')
+
+
+def generate_schema():
+    """Sxemani generatsiya qilib JSON (bytes) ko'rinishida qaytaradi."""
+    # Viewset'lar get_queryset/get_serializer_context da self.request ni o'qiydi, shuning uchun anonim so'rov
+    http_request = HttpRequest()
+    http_request.method = 'GET'
+    generator = schema_view.generator_class(API_INFO, url='http://localhost')
+    schema = generator.get_schema(request=Request(http_request), public=True)
+    # Host yozilmaydi: UI va mijozlar sxemani bergan serverning o'ziga murojaat qiladi
+    schema.pop('host', None)
+    schema.pop('schemes', None)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+def write_schema(content, path=None):
+    """Sxemani va uning sha256 xeshini atomar yozadi, xeshni qaytaradi."""
+    path = Path(path or schema_path())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256(content).hexdigest()
+    for target, data in ((path, content), (_hash_path(path), digest.encode())):
+        tmp = target.with_name(target.name + '.tmp')
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+    return digest
+
+
+def load_schema():
+    """Diskdagi sxema va xeshini qaytaradi. Fayl bo'lmasa sxema bir marta xotirada quriladi."""
+    path = schema_path()
+    try:
+        key = (str(path), path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        key = (str(path), None)
+
+    if key not in _loaded:
+        if key[1] is None:
+            logger.warning("%s topilmadi, sxema xotirada quriladi. Deploy'da `manage.py generate_schema` "
+                           "ni ishga tushiring.", path)
+            content = generate_schema()
+            digest = hashlib.sha256(content).hexdigest()
+        else:
+            content = path.read_bytes()
+            try:
+                digest = _hash_path(path).read_text().strip()
+            except FileNotFoundError:
+                digest = hashlib.sha256(content).hexdigest()
+        _loaded.clear()
+        _loaded[key] = (content, digest)
+    return _loaded[key]
+
+
+def _schema_etag(request):
+    return load_schema()[1]
+
+
+@condition(etag_func=_schema_etag)
+def _prebuilt_schema(request):
+    content, _ = load_schema()
+    response = HttpResponse(content, content_type='application/json')
+    response['Cache-Control'] = f'public, max-age={settings.OPENAPI_SCHEMA_MAX_AGE}'
+    return response
+
+
+_live_schema = schema_view.without_ui(cache_timeout=0)
+
+
+def schema_json(request, *args, **kwargs):
+    if settings.OPENAPI_SCHEMA_LIVE:
+        return _live_schema(request, *args, **kwargs)
+    return _prebuilt_schema(request)
@@ -0,0 +1,291 @@
+"""
+Yuklama testlari uchun katta hajmdagi sintetik ma'lumot (`manage.py seed`).
+
+Yozuvlar model save() va signallarisiz, katta partiyalarda `bulk_create` bilan
+yoziladi. Shuning uchun save()/signal orqali yuritiladigan hosila ma'lumotlar shu
+yerning o'zida hisoblanadi va birga yoziladi:
+- xona, qavat va yotoqxona bandlik hisoblagichlari hamda bo'sh joylar indeksi
+  (talabalar xonalarga oldindan rejalashtirilgan o'rinlar bo'yicha joylashtiriladi);
+- to'lov oylari (PaymentForStudent.month) bog'lanish jadvaliga to'g'ridan-to'g'ri
+  yoziladi, StudentBalance esa payments.ledger.split_amount bilan hisoblanadi;
+- talaba va arizalar qidiruv indeksi (SearchDocument);
+- ma'lumotnoma keshi versiyasi (joybor.refdata).
+
+Barcha foydalanuvchilar bitta oldindan hisoblangan parol hashini oladi: har biriga
+PBKDF2 hisoblash soatlab vaqt oladi. Natija bo'sh bazada bir xil seed uchun bir xil.
+"""
+import random
+import string
+from collections import Counter, defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from itertools import islice, product
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import User, UserProfile
+from dormitories.models import Dormitory, DormitoryVacancy, Floor, Room
+from payments.ledger import split_amount
+from payments.models import Month, PaymentForStudent, PaymentMethod, StudentBalance
+from students.models import Application, District, Province, SearchDocument, Student
+from students.search import build_document, document_kind
+from universities.models import Faculty, University
+
+from . import refdata
+
+PASSWORD = 'seed-password'
+USERNAME_PREFIX = 'seed-'
+MONTHS = ('Sentabr', 'Oktabr', 'Noyabr', 'Dekabr', 'Yanvar', 'Fevral', 'Mart', 'Aprel', 'May', 'Iyun')
+CITIES = ('Toshkent', 'Samarqand', 'Buxoro', 'Andijon', 'Namangan', "Farg'ona", 'Nukus', 'Qarshi', 'Jizzax',
+          'Navoiy', 'Termiz', 'Guliston', 'Urganch')
+FIRST_NAMES = ('Aziz', 'Bekzod', 'Dilnoza', 'Gulnora', 'Jasur', 'Madina', "O'tkir", 'Sevara', 'Shahzod', 'Zarina',
+               'Abdulla', 'Kamola', 'Sardor', 'Nilufar', 'Javohir', 'Malika', 'Otabek', 'Shahnoza', 'Ulugbek')
+LAST_NAMES = ('Karimov', 'Rahimova', 'Toshmatov', "G'aniyeva", 'Yusupov', 'Qodirova', 'Ergashev', 'Nazarova',
+              'Abdullayev', 'Saidova', 'Xolmatov', 'Mirzayeva', "Qo'chqorov", 'Tursunova')
+MIDDLE_NAMES = ('Akmalovich', 'Bahodirovna', 'Erkinovich', 'Farhodovna', 'Rustamovich', 'Shavkatovna', None)
+FACULTY_NAMES = ('Dasturiy injiniring', 'Kompyuter injiniringi', 'Iqtisodiyot', 'Matematika', 'Fizika',
+                 'Filologiya', 'Tarix', 'Huquqshunoslik', 'Pedagogika', 'Biologiya', 'Kimyo', 'Arxitektura')
+# O'zbekiston mobil operatorlari kodlari: +998 XX XXXXXXX
+PHONE_CODES = ('33', '50', '55', '77', '88', '90', '91', '93', '94', '95', '97', '98', '99')
+AMOUNTS = (300000, 450000, 600000, 900000)
+
+PASSPORT_SERIES = [''.join(letters) for letters in product(string.ascii_uppercase, repeat=2)]
+PASSPORT_NUMBERS = 10 ** 7
+# 10 ga tub son: i -> i * k mod 10^7 o'zaro bir qiymatli, raqamlar ketma-ket chiqmaydi
+PASSPORT_MULTIPLIER = 3_141_593
+
+
+def passport_number(index, series_offset=0):
+    """index bo'yicha takrorlanmaydigan 9 belgili passport raqami: 2 harf + 7 raqam."""
+    block, number = divmod(index, PASSPORT_NUMBERS)
+    series = PASSPORT_SERIES[(block + series_offset) % len(PASSPORT_SERIES)]
+    return f'{series}{number * PASSPORT_MULTIPLIER % PASSPORT_NUMBERS:07d}'
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Seeder:
+    def __init__(self, seed=0, batch_size=5000, search_index=True, log=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.search_index = search_index
+        self.log = log or (lambda message: None)
+        self.password = make_password(PASSWORD)
+        self.now = timezone.now()
+
+    def phone(self):
+        return f'+998{self.rng.choice(PHONE_CODES)}{self.rng.randrange(10 ** 7):07d}'
+
+    def person(self):
+        return self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES), self.rng.choice(MIDDLE_NAMES)
+
+    def bulk_create(self, model, objects):
+        """Partiyalar bo'yicha yozadi va yaratilgan obyektlarni (pk bilan) qaytaradi."""
+        created = []
+        for batch in batched(objects, self.batch_size):
+            with transaction.atomic():
+                created += model.objects.bulk_create(batch, batch_size=self.batch_size)
+        return created
+
+    def users(self, kind, count, role):
+        return self.bulk_create(User, (
+            User(username=f'{USERNAME_PREFIX}{kind}-{i}', email=f'{kind}{i}@seed.example.com',
+                 password=self.password, role=role)
+            for i in range(1, count + 1)
+        ))
+
+    def run(self, universities=300, faculties_per_university=8, dormitories=2000, floors=5, rooms_per_floor=20,
+            students=1_000_000, applications=100_000, payments_per_student=1):
+        if User.objects.filter(username__startswith=USERNAME_PREFIX).exists():
+            raise ValueError("Bazada oldingi seed ma'lumotlari bor.")
+
+        self.users('superadmin', 1, User.Role.IS_SUPERADMIN)
+        months = [Month.objects.get_or_create(name=name)[0].pk for name in MONTHS]
+        provinces = [province.pk for province in self.bulk_create(
+            Province, (Province(name=f'{city} viloyati') for city in CITIES))]
+        districts = [(district.province_id, district.pk) for district in self.bulk_create(
+            District, (District(name=f'{i}-tuman', province_id=province) for province in provinces
+                       for i in range(1, 11)))]
+        self.log(f"Ma'lumotnomalar: {len(months)} oy, {len(provinces)} viloyat, {len(districts)} tuman")
+
+        university_ids = [university.pk for university in self.bulk_create(University, (
+            University(name=f'{self.rng.choice(CITIES)} universiteti {i}', city=self.rng.choice(CITIES),
+                       address=f'{i}-uy', website=f'https://university{i}.uz')
+            for i in range(1, universities + 1)
+        ))]
+        faculty_names = FACULTY_NAMES * (faculties_per_university // len(FACULTY_NAMES) + 1)
+        faculties = [(faculty.university_id, faculty.pk) for faculty in self.bulk_create(Faculty, (
+            Faculty(university_id=university, name=f'{name} {n // len(FACULTY_NAMES) or ""}'.strip())
+            for university in university_ids
+            for n, name in enumerate(faculty_names[:faculties_per_university])
+        ))]
+        refdata.bump_version(University)
+        refdata.bump_version(Faculty)
+        self.log(f"Universitetlar: {len(university_ids)}, fakultetlar: {len(faculties)}")
+
+        dormitory_ids, slots = self.seed_dormitories(dormitories, floors, rooms_per_floor, university_ids, students)
+        self.seed_students(students, dormitory_ids, slots, faculties, districts, months, payments_per_student)
+        self.seed_applications(applications, dormitory_ids, faculties, districts)
+
+    def seed_dormitories(self, count, floors, rooms_per_floor, university_ids, students):
+        """
+        Yotoqxona, qavat va xonalar. (yotoqxona id lari, band o'rinlar ro'yxati) qaytaradi:
+        har bir o'ringa bitta talaba joylashtiriladi, qolganlari xonasiz (navbatda).
+        """
+        rng = self.rng
+        # Sig'im va bandlik oldindan rejalashtiriladi: hisoblagichlar yaratishda yoziladi.
+        # plan[d][f] = [(sig'im, band o'rinlar), ...] - har bir xona uchun
+        capacities = [rng.choice((2, 3, 4)) for _ in range(count * floors * rooms_per_floor)]
+        beds = [room for room, capacity in enumerate(capacities) for _ in range(capacity)]
+        occupied = Counter(rng.sample(beds, min(students, int(len(beds) * 0.95))))
+        room_capacities = iter(enumerate(capacities))
+        plan = [[[(capacity, occupied[room]) for room, capacity in islice(room_capacities, rooms_per_floor)]
+                 for _ in range(floors)] for _ in range(count)]
+
+        admins = self.users('admin', count, User.Role.IS_ADMIN)
+        self.bulk_create(UserProfile, (UserProfile(user_id=admin.pk, phone_number=self.phone()) for admin in admins))
+
+        dormitories = []
+        for d, (dormitory, admin) in enumerate(zip(plan, admins), start=1):
+            rooms = [room for floor in dormitory for room in floor]
+            dormitories.append(Dormitory(
+                name=f'{d}-yotoqxona', address=f"{rng.choice(CITIES)}, {rng.randint(1, 200)}-uy",
+                number_of_floors=floors, admin_id=admin.pk, university_id=rng.choice(university_ids),
+                latitude=round(37.2 + rng.random() * 8.3, 6), longitude=round(56.0 + rng.random() * 17.1, 6),
+                total_capacity=sum(capacity for capacity, _ in rooms),
+                current_occupancy=sum(occupied for _, occupied in rooms),
+            ))
+        dormitories = self.bulk_create(Dormitory, dormitories)
+
+        floor_plans = [floor for dormitory in plan for floor in dormitory]
+        floor_objects = self.bulk_create(Floor, (
+            Floor(name=str(f), dormitory_id=dormitory.pk, gender_type=('male', 'female')[f % 2],
+                  total_capacity=sum(capacity for capacity, _ in floor),
+                  current_occupancy=sum(occupied for _, occupied in floor))
+            for dormitory, floors_ in zip(dormitories, plan)
+            for f, floor in enumerate(floors_, start=1)
+        ))
+
+        # Bo'sh joylar indeksi: yotoqxona va jins bo'yicha qavatlar yig'indisi
+        university_ids = {dormitory.pk: dormitory.university_id for dormitory in dormitories}
+        vacancies = defaultdict(lambda: [0, 0])
+        for floor in floor_objects:
+            totals = vacancies[floor.dormitory_id, floor.gender_type]
+            totals[0] += floor.total_capacity
+            totals[1] += floor.current_occupancy
+        self.bulk_create(DormitoryVacancy, (
+            DormitoryVacancy(dormitory_id=dormitory_id, university_id=university_ids[dormitory_id],
+                             gender_type=gender, status='active', total_capacity=capacity,
+                             current_occupancy=occupied, free_beds=max(capacity - occupied, 0))
+            for (dormitory_id, gender), (capacity, occupied) in vacancies.items()
+        ))
+
+        rooms = self.bulk_create(Room, (
+            Room(dormitory_id=floor.dormitory_id, floor_id=floor.pk, room_number=f'{floor.name}{r:02d}',
+                 capacity=capacity, current_occupancy=occupied)
+            for floor, floor_plan in zip(floor_objects, floor_plans)
+            for r, (capacity, occupied) in enumerate(floor_plan, start=1)
+        ))
+        self.log(f"Yotoqxonalar: {len(dormitories)}, qavatlar: {len(floor_objects)}, xonalar: {len(rooms)}")
+
+        slots = [(room.dormitory_id, room.floor_id, room.pk) for room in rooms for _ in range(room.current_occupancy)]
+        rng.shuffle(slots)
+        return [dormitory.pk for dormitory in dormitories], slots
+
+    def student(self, index, slot, dormitory_ids, faculties, districts):
+        rng = self.rng
+        first_name, last_name, middle_name = self.person()
+        dormitory_id, floor_id, room_id = slot or (rng.choice(dormitory_ids), None, None)
+        province_id, district_id = rng.choice(districts)
+        return Student(
+            name=first_name, last_name=last_name, middle_name=middle_name, dormitory_id=dormitory_id,
+            faculty_id=rng.choice(faculties)[1], direction=rng.choice(FACULTY_NAMES), province_id=province_id,
+            district_id=district_id, floor_id=floor_id, room_id=room_id, passport_number=passport_number(index),
+            phone_number=self.phone(), emergency_contact_phone=self.phone(),
+        )
+
+    def seed_students(self, count, dormitory_ids, slots, faculties, districts, months, payments_per_student):
+        Through = PaymentForStudent.month.through
+        created = payments = 0
+        for start in range(0, count, self.batch_size):
+            indexes = range(start, min(start + self.batch_size, count))
+            with transaction.atomic():
+                students = Student.objects.bulk_create([
+                    self.student(i, slots[i] if i < len(slots) else None, dormitory_ids, faculties, districts)
+                    for i in indexes
+                ])
+                payment_objects, payment_months = self.payments(students, months, payments_per_student)
+                payment_objects = PaymentForStudent.objects.bulk_create(payment_objects)
+                Through.objects.bulk_create([
+                    Through(paymentforstudent_id=payment.pk, month_id=month_id)
+                    for payment, month_ids in zip(payment_objects, payment_months) for month_id in month_ids
+                ])
+                StudentBalance.objects.bulk_create(self.balances(payment_objects, payment_months))
+                self.index(students)
+            created += len(students)
+            payments += len(payment_objects)
+            self.log(f"Talabalar: {created}/{count}, to'lovlar: {payments}")
+
+    def payments(self, students, months, per_student):
+        rng = self.rng
+        objects, payment_months = [], []
+        for student in students:
+            # O'rtacha per_student ta, 0 dan 2*per_student gacha
+            for _ in range(rng.randint(0, 2 * per_student)):
+                objects.append(PaymentForStudent(
+                    student_id=student.pk, amount=Decimal(rng.choice(AMOUNTS)),
+                    method=rng.choice(PaymentMethod.values), description='',
+                    created_at=self.now - timedelta(seconds=rng.randrange(365 * 24 * 3600)),
+                ))
+                payment_months.append(rng.sample(months, rng.randint(1, 2)))
+        return objects, payment_months
+
+    @staticmethod
+    def balances(payments, payment_months):
+        """payments.ledger.refresh_student_balances bilan bir xil hisob, bazaga so'rovsiz."""
+        rows = {}
+        for payment, month_ids in zip(payments, payment_months):
+            for month_id, share in split_amount(payment.amount, month_ids).items():
+                row = rows.setdefault((payment.student_id, month_id), StudentBalance(
+                    student_id=payment.student_id, month_id=month_id, paid_amount=Decimal(0), payments_count=0))
+                row.paid_amount += share
+                row.payments_count += 1
+                if row.last_payment_at is None or payment.created_at > row.last_payment_at:
+                    row.last_payment_at = payment.created_at
+        return list(rows.values())
+
+    def index(self, objects):
+        if not self.search_index:
+            return
+        SearchDocument.objects.bulk_create([
+            SearchDocument(kind=document_kind(type(obj)), object_id=obj.pk, document=build_document(obj))
+            for obj in objects
+        ])
+
+    def seed_applications(self, count, dormitory_ids, faculties, districts):
+        rng = self.rng
+        applicants = self.users('student', count, User.Role.IS_STUDENT)
+        created = 0
+        for batch in batched(enumerate(applicants), self.batch_size):
+            objects = []
+            for i, applicant in batch:
+                first_name, last_name, middle_name = self.person()
+                province_id, district_id = rng.choice(districts)
+                objects.append(Application(
+                    student_id=applicant.pk, first_name=first_name, last_name=last_name, middle_name=middle_name,
+                    dormitory_id=rng.choice(dormitory_ids), faculty_id=rng.choice(faculties)[1],
+                    province_id=province_id, district_id=district_id,
+                    # Talabalar passportlaridan boshqa seriyada
+                    passport_number=passport_number(i, series_offset=len(PASSPORT_SERIES) // 2),
+                    phone_number=self.phone(), comment='',
+                ))
+            with transaction.atomic():
+                self.index(Application.objects.bulk_create(objects))
+            created += len(objects)
+        self.log(f"Arizalar: {created}")
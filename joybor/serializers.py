@@ -0,0 +1,197 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+from . import images, refdata
+
+
+def parse_field_tree(value):
+    """
+    "id,floor.name,floor.dormitory" -> {'id': {}, 'floor': {'name': {}, 'dormitory': {}}}
+    """
+    tree = {}
+    if not value:
+        return tree
+    for item in value.split(','):
+        node = tree
+        for part in item.strip().split('.'):
+            if part:
+                node = node.setdefault(part, {})
+    return tree
+
+
+class ExpandableFieldsMixin:
+    """
+    Sparse fieldset va so'rov bo'yicha kengaytirish uchun serializer mixin.
+
+    - Bog'lanishlar sukut bo'yicha faqat id ko'rinishida qaytadi.
+    - `?expand=dormitory,floor.dormitory` ichma-ich serializerlarni qo'shadi.
+    - `?fields=id,room_number,floor.name` faqat ko'rsatilgan maydonlarni qoldiradi.
+
+    E'lon qilingan ichma-ich serializerlar avtomatik kengaytiriladigan hisoblanadi,
+    qolganlari `expandable_fields` da ko'rsatiladi: {'maydon': SerializerClass yoki 'yo.l.Class'}.
+    Parametrlar faqat o'qish so'rovlarida qo'llanadi, yozish maydonlariga tegilmaydi.
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        self._expand = kwargs.pop('expand', None)
+        self._requested_fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+    def _is_root(self):
+        parent = self.parent
+        return parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+
+    def _get_trees(self, request):
+        expand, requested = self._expand, self._requested_fields
+        if self._is_root() and request is not None:
+            if expand is None:
+                expand = parse_field_tree(request.query_params.get('expand'))
+            if requested is None:
+                requested = parse_field_tree(request.query_params.get('fields'))
+        return dict(expand or {}), requested or {}
+
+    def _build_expanded_field(self, name, field):
+        serializer_class = self.expandable_fields[name]
+        if isinstance(serializer_class, str):
+            serializer_class = import_string(serializer_class)
+        kwargs = {'read_only': True}
+        if isinstance(field, serializers.ManyRelatedField):
+            kwargs['many'] = True
+        if field.source and field.source != name:
+            kwargs['source'] = field.source
+        return serializer_class(**kwargs)
+
+    @staticmethod
+    def _build_id_field(name, field):
+        kwargs = {'read_only': True}
+        if isinstance(field, serializers.ListSerializer):
+            kwargs['many'] = True
+        if field.source and field.source != name:
+            kwargs['source'] = field.source
+        return serializers.PrimaryKeyRelatedField(**kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is not None and request.method not in SAFE_METHODS:
+            return fields
+
+        expand, requested = self._get_trees(request)
+        for name, subtree in requested.items():
+            # fields=floor.name floor'ni ham kengaytiradi
+            if subtree:
+                expand.setdefault(name, {})
+        if requested:
+            fields = {name: field for name, field in fields.items() if name in requested}
+
+        for name, field in list(fields.items()):
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            is_nested = isinstance(nested, serializers.BaseSerializer)
+
+            if name not in expand:
+                if is_nested:
+                    fields[name] = self._build_id_field(name, field)
+                continue
+
+            if not is_nested:
+                if name not in self.expandable_fields:
+                    continue
+                fields[name] = field = self._build_expanded_field(name, field)
+                nested = field.child if isinstance(field, serializers.ListSerializer) else field
+
+            if isinstance(nested, ExpandableFieldsMixin):
+                nested._expand = expand[name]
+                nested._requested_fields = requested.get(name) or None
+
+        return fields
+
+
+class ReferenceRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Ma'lumotnoma modellari (joybor.refdata) uchun PrimaryKeyRelatedField: qiymat bazadan
+    emas, keshdagi jadvaldan tekshiriladi. `queryset` faqat model va sxema uchun kerak,
+    undagi filtrlar hisobga olinmaydi (faqat `.none()`), cheklov `limit_to()` bilan beriladi.
+    """
+
+    def __init__(self, **kwargs):
+        self.filters = kwargs.pop('filters', None)
+        super().__init__(**kwargs)
+
+    def limit_to(self, **filters):
+        """Masalan field.limit_to(university_id=3); queryset ham shunga moslanadi."""
+        self.filters = filters
+        self.queryset = self.queryset.model._default_manager.filter(**filters)
+
+    def to_internal_value(self, data):
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        queryset = self.get_queryset()
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = queryset.model._meta.pk.to_python(data)
+        except DjangoValidationError:
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+        obj = None if queryset.query.is_empty() else refdata.get_object(queryset.model, pk)
+        if obj is None or any(getattr(obj, name) != value for name, value in (self.filters or {}).items()):
+            self.fail('does_not_exist', pk_value=data)
+        return obj
+
+
+class ReferenceStringField(serializers.ReadOnlyField):
+    """Ma'lumotnoma obyektining str() ko'rinishi, source sifatida id ustuni beriladi (source='university_id')."""
+
+    def __init__(self, model, **kwargs):
+        self.reference_model = model
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        obj = refdata.get_object(self.reference_model, value) if value is not None else None
+        return str(obj) if obj is not None else None
+
+
+class ReferenceFieldsMixin:
+    """ModelSerializer uchun: ma'lumotnoma modellariga avtomatik maydonlar ReferenceRelatedField bo'ladi."""
+
+    def build_relational_field(self, field_name, relation_info):
+        field_class, field_kwargs = super().build_relational_field(field_name, relation_info)
+        if field_class is self.serializer_related_field and refdata.is_reference_model(relation_info.related_model):
+            field_class = ReferenceRelatedField
+        return field_class, field_kwargs
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Rasm hosilalari URL lari (joybor.images): {'thumb': ..., 'thumb_webp': ..., 'medium': ...}.
+    Hosila hali tayyor bo'lmasa (yoki rasm almashtirilgan bo'lsa) asl rasm URL i qaytadi.
+    Maydon nomi `<rasm maydoni>_variants`, masalan picture_variants = ImageVariantsField('picture').
+    """
+
+    def __init__(self, image_field, **kwargs):
+        self.image_field = image_field
+        # QuerysetPlan only() ga rasm ustunini ham qo'shadi
+        self.extra_columns = (image_field,)
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        return getattr(instance, self.image_field), super().get_attribute(instance)
+
+    def _absolute(self, url):
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+    def to_representation(self, value):
+        file, variants = value
+        if not file:
+            return None
+        original = self._absolute(file.url)
+        if (variants or {}).get('source') != file.name:
+            variants = {}
+        return {
+            key: self._absolute(file.storage.url(variants[key])) if key in variants else original
+            for key in images.variant_keys()
+        }
@@ -3,6 +3,8 @@ from pathlib import Path
 
 from django.conf.global_settings import AUTH_USER_MODEL
 
+from joybor.database import cache_from_env, database_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -34,6 +36,7 @@ INSTALLED_APPS = [
     'students',
     'payments',
     'universities',
+    'joybor',
 
     # packages
     'rest_framework',
@@ -47,7 +50,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
@@ -70,6 +73,16 @@ SWAGGER_SETTINGS = {
     'USE_SESSION_AUTH': False,
 }
 
+REDOC_SETTINGS = {
+    'SPEC_URL': 'schema-json',
+}
+
+# OpenAPI sxemasi `manage.py generate_schema` bilan oldindan yaratiladi (joybor.schema).
+# OPENAPI_SCHEMA_LIVE=1 bo'lsa har so'rovda qayta generatsiya qilinadi, faqat debug uchun.
+OPENAPI_SCHEMA_PATH = BASE_DIR / 'openapi' / 'swagger.json'
+OPENAPI_SCHEMA_LIVE = os.environ.get('OPENAPI_SCHEMA_LIVE') == '1'
+OPENAPI_SCHEMA_MAX_AGE = 300
+
 from datetime import timedelta
 
 SIMPLE_JWT = {
@@ -79,7 +92,54 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,  # yoki settings.py dagi SECRET_KEY
+    'TOKEN_OBTAIN_SERIALIZER': 'accounts.serializers.RoleTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.RoleTokenRefreshSerializer',
+}
+
+# Access token'dagi role/status/yotoqxona claim'lariga necha soniya ishoniladi
+# va to'liq User qatori keshda qancha turadi (accounts.cache)
+AUTH_CLAIMS_MAX_AGE = 300
+AUTH_USER_CACHE_TIMEOUT = 60
+
+# Umumiy kesh: bir necha jarayonli deploy'da JOYBOR_CACHE_BACKEND=redis yoki db bo'lishi shart,
+# aks holda ma'lumotnoma versiyalari boshqa worker'larga yetmaydi (joybor.database)
+CACHES = {
+    'default': cache_from_env(os.environ),
+}
+
+# Ma'lumotnoma jadvallari qatorlari umumiy keshda qancha turadi (joybor.refdata);
+# o'zgarishlar versiya orqali darhol bekor qilinadi
+REFDATA_CACHE_TIMEOUT = 60 * 60 * 24
+# Kesh umumiy bo'lmasa (LocMemCache) versiya shuncha soniyadan keyin eskiradi: boshqa
+# jarayondagi o'zgarish ko'pi bilan shu muddat kechikib ko'rinadi
+REFDATA_LOCAL_VERSION_TIMEOUT = 30
+
+# generate_image_variants buyrug'idagi process pool hajmi (joybor.images);
+# yangi yuklangan rasmlar fon vazifalari navbatida qayta ishlanadi
+IMAGE_VARIANT_WORKERS = 2
+
+# ASGI ostida (joybor/asgi.py) list/retrieve amallari async view'lar orqali (joybor.asyncviews)
+ASYNC_READ_VIEWS = os.environ.get('JOYBOR_ASYNC_READ_VIEWS') == '1'
+
+# /metrics (joybor.metrics): bir necha jarayonli serverda qiymatlar shu katalog orqali
+# yig'iladi (har METRICS_FLUSH_INTERVAL soniyada); METRICS_TOKEN berilsa Bearer token talab qilinadi
+METRICS_DIR = os.environ.get('JOYBOR_METRICS_DIR') or None
+METRICS_FLUSH_INTERVAL = 5
+METRICS_TOKEN = os.environ.get('JOYBOR_METRICS_TOKEN') or None
+
+# `manage.py bench` natijalari shu fayldagi baseline bilan solishtiriladi (--update-baseline)
+BENCH_BASELINE_PATH = BASE_DIR / 'benchmarks' / 'baseline.json'
+
+# Fon vazifalari (joybor.jobqueue, `manage.py runworker`): navbat -> barcha worker'lar
+# bo'ylab bir vaqtda bajariladigan vazifalar soni, qayta urinish kechikishi (soniya)
+JOB_QUEUE_CONCURRENCY = {
+    'mail': 2,
+    'images': 2,
 }
+JOB_RETRY_BASE_DELAY = 10
+JOB_RETRY_MAX_DELAY = 60 * 60
+# Worker'dagi ochiq SMTP ulanishi shuncha soniya ishlatilmasa qayta ochiladi
+JOB_MAIL_CONNECTION_IDLE = 60
 
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
@@ -90,6 +150,8 @@ SWAGGER_SETTINGS = {
             'description': "Format: Bearer <token>",
         }
     },
+    # UI sxemani oldindan yaratilgan swagger.json dan oladi
+    'SPEC_URL': 'schema-json',
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -121,11 +183,13 @@ LOGGING = {
 }
 
 MIDDLEWARE = [
+    'joybor.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'joybor.tenant.TenantMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -152,11 +216,9 @@ WSGI_APPLICATION = 'joybor.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# JOYBOR_DB_ENGINE=postgresql - psycopg pool bilan PostgreSQL, aks holda SQLite (joybor.database)
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_from_env(os.environ, BASE_DIR),
 }
 
 # Password validation
@@ -0,0 +1,82 @@
+"""
+Umumiy fon vazifalari (joybor.jobqueue).
+
+Xatlar worker oqimi bo'yicha bitta ochiq SMTP ulanishi orqali yuboriladi: har bir xat
+uchun qayta ulanish va autentifikatsiya qilinmaydi. Uzoq turib qolgan ulanish
+(server odatda bir necha daqiqada uzadi) qayta ochiladi, worker to'xtaganda yopiladi.
+"""
+import smtplib
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection, send_mail
+
+from . import images
+from .jobqueue import task, worker_stopped
+
+_local = threading.local()
+_mail_connections = set()
+_mail_lock = threading.Lock()
+
+
+def _mail_idle_timeout():
+    return getattr(settings, 'JOB_MAIL_CONNECTION_IDLE', 60)
+
+
+def _close_mail_connection(connection):
+    with _mail_lock:
+        _mail_connections.discard(connection)
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+def mail_connection():
+    """Joriy oqim uchun ochiq email ulanishi."""
+    connection = getattr(_local, 'mail_connection', None)
+    if connection is not None and time.monotonic() - _local.mail_used_at > _mail_idle_timeout():
+        _close_mail_connection(connection)
+        connection = None
+    if connection is None:
+        connection = get_connection()
+        connection.open()
+        _local.mail_connection = connection
+        with _mail_lock:
+            _mail_connections.add(connection)
+    _local.mail_used_at = time.monotonic()
+    return connection
+
+
+def reset_mail_connection():
+    connection = getattr(_local, 'mail_connection', None)
+    _local.mail_connection = None
+    if connection is not None:
+        _close_mail_connection(connection)
+
+
+def close_mail_connections(**kwargs):
+    with _mail_lock:
+        connections = list(_mail_connections)
+    for connection in connections:
+        _close_mail_connection(connection)
+
+
+worker_stopped.connect(close_mail_connections, dispatch_uid='joybor-close-mail-connections')
+
+
+@task(queue='mail', max_attempts=8)
+def send_email(subject, message, recipient_list, from_email=None):
+    try:
+        send_mail(subject, message, from_email or settings.DEFAULT_FROM_EMAIL, recipient_list,
+                  fail_silently=False, connection=mail_connection())
+    except (smtplib.SMTPException, OSError):
+        # Uzilgan ulanish keyingi urinishda qayta ochiladi
+        reset_mail_connection()
+        raise
+
+
+@task(queue='images', timeout=120)
+def generate_image_variants(label, pk, field_name, name):
+    images.save_variants(label, pk, field_name, images.generate_variants(name))
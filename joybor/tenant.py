@@ -0,0 +1,117 @@
+"""
+So'rov doirasidagi tenant (yotoqxona) konteksti.
+
+TenantMiddleware har bir so'rovga `request.tenant` ni qo'yadi. Yotoqxona admini uchun
+uning yotoqxona id si birinchi murojaatda bir marta aniqlanadi (token claim'laridan
+kelgan foydalanuvchida so'rovsiz), keyin shu so'rov davomida qayta ishlatiladi.
+
+Modellarda `objects = TenantManager()` va `tenant_field` ('dormitory_id',
+'student__dormitory_id' ...) e'lon qilinadi, `Model.objects.for_tenant()` esa joriy
+adminning yotoqxonasi bo'yicha filtrlaydi.
+"""
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import models
+from rest_framework.exceptions import PermissionDenied
+
+_current_tenant = ContextVar('current_tenant', default=None)
+
+_UNRESOLVED = object()
+
+
+class TenantContext:
+    def __init__(self, request):
+        self.request = request
+        self._user_id = None
+        self._dormitory_id = _UNRESOLVED
+
+    @property
+    def dormitory_id(self):
+        """Joriy foydalanuvchi yotoqxona admini bo'lsa uning yotoqxona id si, aks holda None."""
+        # DRF autentifikatsiyasi middleware'dan keyin ishlaydi, shuning uchun user har safar tekshiriladi
+        user = getattr(self.request, 'user', None)
+        if user is None or not user.is_authenticated or not getattr(user, 'is_dormitory_admin', False):
+            return None
+        if self._dormitory_id is _UNRESOLVED or self._user_id != user.pk:
+            self._user_id = user.pk
+            self._dormitory_id = self._resolve(user)
+        return self._dormitory_id
+
+    @staticmethod
+    def _resolve(user):
+        from dormitories.models import Dormitory
+
+        related = type(user).dormitory.related
+        if related.is_cached(user):
+            dormitory = related.get_cached_value(user)
+            return dormitory.pk if dormitory is not None else None
+        return Dormitory.objects.filter(admin_id=user.pk).values_list('pk', flat=True).first()
+
+    def require_dormitory_id(self):
+        dormitory_id = self.dormitory_id
+        if dormitory_id is None:
+            raise PermissionDenied("Sizga hech qanday dormitory biriktirilmagan.")
+        return dormitory_id
+
+
+class TenantMiddleware:
+    # ASGI ostida async view'lar (joybor.asyncviews) oqimga o'tkazilmasligi uchun
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request.tenant = TenantContext(request)
+        token = _current_tenant.set(request.tenant)
+        try:
+            return self.get_response(request)
+        finally:
+            _current_tenant.reset(token)
+
+    async def __acall__(self, request):
+        request.tenant = TenantContext(request)
+        token = _current_tenant.set(request.tenant)
+        try:
+            return await self.get_response(request)
+        finally:
+            _current_tenant.reset(token)
+
+
+def get_tenant(request):
+    """request.tenant; middleware ishlamagan holatlarda (masalan, to'g'ridan-to'g'ri view chaqiruvi) ham."""
+    tenant = getattr(request, 'tenant', None)
+    if tenant is None:
+        tenant = TenantContext(request)
+        request.tenant = tenant
+    return tenant
+
+
+def is_own_dormitory(request, dormitory_id):
+    """Obyektning dormitory_id si joriy adminning yotoqxonasi bilan bir xilmi (bog'langan qatorni o'qimasdan)."""
+    own_dormitory_id = get_tenant(request).dormitory_id
+    return own_dormitory_id is not None and own_dormitory_id == dormitory_id
+
+
+def get_current_dormitory_id():
+    tenant = _current_tenant.get()
+    return tenant.dormitory_id if tenant is not None else None
+
+
+class TenantQuerySet(models.QuerySet):
+    def for_tenant(self, dormitory_id=None):
+        """Joriy (yoki berilgan) yotoqxonaga tegishli yozuvlar; yotoqxona bo'lmasa bo'sh queryset."""
+        if dormitory_id is None:
+            dormitory_id = get_current_dormitory_id()
+        if dormitory_id is None:
+            return self.none()
+        return self.filter(**{self.model.tenant_field: dormitory_id})
+
+
+TenantManager = models.Manager.from_queryset(TenantQuerySet)
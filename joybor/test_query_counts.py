@@ -0,0 +1,164 @@
+"""
+Har bir router endpoint'i (list va retrieve) uchun SQL so'rovlar soni nazorati.
+
+Endpoint'lar ikki xil ma'lumot hajmida (SMALL va LARGE qator) chaqiriladi. So'rovlar
+soni qatorlar soniga bog'liq bo'lmasligi (N+1 yo'q) va BUDGETS da e'lon qilingan
+chegaradan oshmasligi kerak. Yangi ViewSet ro'yxatdan o'tkazilsa, unga ham chegara
+e'lon qilinmaguncha test yiqiladi. `?expand=` bilan ichma-ich serializerlar ham
+tekshiriladi. List sahifasi PAGE_SIZE (10) bilan cheklangan, shuning uchun kichik hajm
+sahifani to'ldirmaydi - aks holda N+1 ikkala hajmda bir xil ko'rinadi.
+"""
+from importlib import import_module
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import User, UserProfile
+from accounts.tokens import RoleRefreshToken
+from dormitories.models import Dormitory, Floor, Room
+from payments.models import Month, PaymentForStudent
+from students.models import Application, Student
+from universities.models import Faculty, University
+from . import refdata
+from .bench import ROUTER_MODULES
+
+SMALL, LARGE = 2, 50
+
+SUPERADMIN = User.Role.IS_SUPERADMIN
+ADMIN = User.Role.IS_ADMIN
+
+# (basename, so'rov parametrlari, qaysi rol nomidan, list chegarasi, retrieve chegarasi yoki None)
+BUDGETS = [
+    ('user', '', SUPERADMIN, 2, 1),
+    ('userprofile', '', SUPERADMIN, 2, 1),
+    # Yotoqxona admini faqat o'z yotoqxonasini ko'radi: ro'yxat superadmin nomidan
+    ('dormitory', '', SUPERADMIN, 4, None),
+    ('dormitory', 'expand=university,admin,images', SUPERADMIN, 4, None),
+    ('dormitory', 'expand=university,admin,images', ADMIN, 4, 2),
+    ('floor', '', SUPERADMIN, 3, 1),
+    ('floor', 'expand=dormitory.admin,dormitory.university', SUPERADMIN, 4, 2),
+    ('room', '', SUPERADMIN, 3, 1),
+    ('room', 'expand=floor.dormitory.admin,dormitory.images', SUPERADMIN, 5, 3),
+    ('dormitoryvacancy', '', SUPERADMIN, 2, 1),
+    ('dormitoryvacancy', 'expand=dormitory', SUPERADMIN, 3, 2),
+    ('student', '', ADMIN, 3, 1),
+    ('student', 'expand=dormitory,faculty,floor,room', ADMIN, 4, 2),
+    ('application', '', ADMIN, 3, 2),
+    ('application', 'expand=dormitory,faculty', ADMIN, 4, 3),
+    ('paymentforstudent', '', ADMIN, 3, 2),
+    ('paymentforstudent', 'expand=month', ADMIN, 3, 2),
+    ('studentbalance', '', ADMIN, 2, 1),
+    ('studentbalance', 'expand=student', ADMIN, 2, 1),
+    # Ma'lumotnoma keshidan (joybor.refdata)
+    ('university', '', SUPERADMIN, 0, 1),
+    ('faculty', '', SUPERADMIN, 0, 1),
+    ('faculty', 'expand=university', SUPERADMIN, 0, 1),
+]
+
+
+def registered_viewsets():
+    return {
+        basename: viewset
+        for module in ROUTER_MODULES for _, viewset, basename in import_module(module).router.registry
+    }
+
+
+# ~100 foydalanuvchi yaratiladi, PBKDF2 testni sekinlashtiradi
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class QueryCountTest(TestCase):
+    def setUp(self):
+        refdata.clear()
+        self.addCleanup(refdata.clear)
+        self.superadmin = User.objects.create_user(username='super', email='super@example.com', password='x',
+                                                   role=SUPERADMIN)
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='x', role=ADMIN)
+        UserProfile.objects.create(user=self.admin, phone_number='+998901234567')
+        self.dormitory = Dormitory.objects.create(name='Asosiy', address='-', number_of_floors=60, admin=self.admin)
+        self.months = [Month.objects.create(name=name) for name in ('Sentabr', 'Oktabr', 'Noyabr')]
+        self.headers = {
+            role: {'authorization': f'Bearer {RoleRefreshToken.for_user(user).access_token}'}
+            for role, user in ((SUPERADMIN, self.superadmin), (ADMIN, self.admin))
+        }
+        self.created = 0
+
+    def grow_to(self, size):
+        """Har bir endpoint ro'yxatida kamida `size` ta qator bo'lguncha ma'lumot qo'shadi."""
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(self.created + 1, size + 1):
+                university = University.objects.create(name=f'Universitet {i}', city='Toshkent')
+                faculty = Faculty.objects.create(name=f'Fakultet {i}', university=university)
+                admin = User.objects.create_user(username=f'admin{i}', email=f'admin{i}@example.com', password='x',
+                                                 role=ADMIN)
+                UserProfile.objects.create(user=admin)
+                dormitory = Dormitory.objects.create(name=f'Yotoqxona {i}', address='-', number_of_floors=1,
+                                                     admin=admin, university=university)
+                Room.objects.create(dormitory=dormitory, capacity=2, room_number='101',
+                                    floor=Floor.objects.create(name='1', dormitory=dormitory))
+
+                floor = Floor.objects.create(name=str(i), dormitory=self.dormitory,
+                                             gender_type=('male', 'female')[i % 2])
+                room = Room.objects.create(dormitory=self.dormitory, floor=floor, room_number=f'{i}01', capacity=2)
+                student = Student.objects.create(name=f'Talaba {i}', last_name='Karimov', dormitory=self.dormitory,
+                                                 faculty=faculty, floor=floor, room=room,
+                                                 passport_number=f'AB{i:07d}', emergency_contact_phone='+998901234567')
+                applicant = User.objects.create_user(username=f'student{i}', email=f'student{i}@example.com',
+                                                     password='x')
+                Application.objects.create(student=applicant, first_name=f'Ariza {i}', last_name='Karimova',
+                                           dormitory=self.dormitory, faculty=faculty, passport_number=f'AC{i:07d}')
+                payment = PaymentForStudent.objects.create(student=student, amount=300000)
+                payment.month.add(*self.months[:i % 3 + 1])
+        self.created = size
+
+    def count_queries(self, url, role):
+        headers = self.headers[role]
+        # Keshlar (foydalanuvchi qatori, ma'lumotnomalar) isitiladi
+        self.client.get(url, headers=headers)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, 200, f'{url}: {response.content[:200]}')
+        return response, len(queries)
+
+    def first_pk(self, basename, response):
+        data = response.json()
+        results = data['results'] if isinstance(data, dict) else data
+        self.assertGreater(len(results), 0, basename)
+        if 'id' in results[0]:
+            return results[0]['id']
+        # id qaytarmaydigan serializerlar (bo'sh joylar, to'lov hisobi)
+        return registered_viewsets()[basename].queryset.order_by('pk').values_list('pk', flat=True).first()
+
+    def measure(self):
+        """'rol basename?parametrlar' -> {'list': so'rovlar soni, 'retrieve': so'rovlar soni}."""
+        counts = {}
+        for basename, query, role, _, retrieve_budget in BUDGETS:
+            name = f'{role} {basename}?{query}'
+            counts[name] = {}
+            response, counts[name]['list'] = self.count_queries(f"{reverse(f'{basename}-list')}?{query}", role)
+            if retrieve_budget is None:
+                continue
+            detail_url = reverse(f'{basename}-detail', args=[self.first_pk(basename, response)])
+            _, counts[name]['retrieve'] = self.count_queries(f'{detail_url}?{query}', role)
+        return counts
+
+    def test_every_viewset_has_a_budget(self):
+        self.assertEqual(set(registered_viewsets()), {basename for basename, *_ in BUDGETS})
+
+    def test_query_counts(self):
+        self.grow_to(SMALL)
+        small = self.measure()
+        self.grow_to(LARGE)
+        large = self.measure()
+
+        for basename, query, role, list_budget, retrieve_budget in BUDGETS:
+            name = f'{role} {basename}?{query}'
+            for action, budget in (('list', list_budget), ('retrieve', retrieve_budget)):
+                if budget is None:
+                    continue
+                count = large[name][action]
+                with self.subTest(endpoint=name, action=action):
+                    self.assertEqual(count, small[name][action],
+                                     f"So'rovlar soni qatorlar soni bilan o'smoqda (N+1): "
+                                     f"{SMALL} qator - {small[name][action]}, {LARGE} qator - {count}")
+                    self.assertLessEqual(count, budget)
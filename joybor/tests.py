@@ -0,0 +1,367 @@
+import json
+import tempfile
+import threading
+from datetime import timedelta
+from io import BytesIO
+from pathlib import Path
+from unittest import mock
+
+from django.core import mail
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from accounts.models import User
+from accounts.tokens import RoleRefreshToken
+from dormitories.models import Dormitory, DormitoryVacancy, Room
+from payments.models import PaymentForStudent, StudentBalance
+from students.models import Application, SearchDocument, Student
+from universities.models import University
+from universities.serializers import UniversitySerializer
+from . import bench, metrics, seed
+from .database import database_from_env
+from .jobqueue import Worker, task
+from .models import Job
+from .serializers import ImageVariantsField
+from .tasks import send_email
+
+
+class PrebuiltSchemaTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'swagger.json'
+        settings_override = override_settings(OPENAPI_SCHEMA_PATH=self.path, OPENAPI_SCHEMA_LIVE=False)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_served_from_disk_with_etag(self):
+        call_command('generate_schema', stdout=mock.MagicMock())
+        self.assertTrue(self.path.exists())
+
+        with mock.patch('joybor.schema.generate_schema') as generate:
+            response = self.client.get(reverse('schema-json'))
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('/students/student/', json.loads(response.content)['paths'])
+            self.assertIn('max-age', response['Cache-Control'])
+
+            response = self.client.get(reverse('schema-json'), HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304)
+            generate.assert_not_called()
+
+    def test_live_mode_generates_per_request(self):
+        with override_settings(OPENAPI_SCHEMA_LIVE=True):
+            response = self.client.get(reverse('schema-json'))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(self.path.exists())
+
+
+def _jpeg_with_orientation(size=(300, 200), orientation=6):
+    image = Image.new('RGB', size, 'red')
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    buffer = BytesIO()
+    image.save(buffer, 'JPEG', exif=exif.tobytes())
+    return SimpleUploadedFile('logo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+class ImageVariantsTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=directory.name, JOB_QUEUE_EAGER=True)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_variants_generated_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            university = University.objects.create(name='TATU', city='Toshkent', logo=_jpeg_with_orientation())
+            # Commit'gacha hosila yo'q, asl rasm beriladi
+            urls = ImageVariantsField('logo').to_representation((university.logo, university.logo_variants))
+            self.assertEqual(set(urls.values()), {university.logo.url})
+
+        university.refresh_from_db()
+        variants = university.logo_variants
+        self.assertEqual(variants['source'], university.logo.name)
+
+        with default_storage.open(variants['medium']) as file:
+            medium = Image.open(file)
+            # EXIF orientation qo'llangan, metama'lumot olib tashlangan
+            self.assertEqual(medium.size, (200, 300))
+            self.assertFalse(medium.getexif())
+        with default_storage.open(variants['thumb_webp']) as file:
+            thumb = Image.open(file)
+            self.assertEqual((thumb.format, thumb.size), ('WEBP', (200, 200)))
+
+        data = UniversitySerializer(university).data
+        self.assertTrue(data['logo_variants']['thumb_webp'].endswith('_thumb.webp'))
+        self.assertEqual(data['logo_variants']['medium'], default_storage.url(variants['medium']))
+
+        # Saqlash qayta navbatga qo'ymaydi, rasm almashtirilsa qo'yadi
+        with mock.patch('joybor.images.schedule_variants') as schedule:
+            university.save()
+            schedule.assert_not_called()
+            university.logo = _jpeg_with_orientation(orientation=1)
+            university.save()
+            schedule.assert_called_once_with(university, 'logo')
+
+
+calls = []
+
+
+@task(name='joybor.tests.flaky', max_attempts=2)
+def flaky(value):
+    calls.append(value)
+    raise ValueError(value)
+
+
+class JobQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueued_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            send_email.enqueue('Salom', 'Matn', ['a@example.com'])
+            self.assertFalse(Job.objects.exists())
+
+        job = Job.objects.get()
+        self.assertEqual((job.queue, job.args), ('mail', ['Salom', 'Matn', ['a@example.com']]))
+
+        Worker().run(burst=True)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(Job.objects.exists())
+
+    def test_retry_with_backoff_then_failed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            flaky.enqueue(1)
+
+        with self.assertLogs('joybor.jobqueue', 'WARNING'):
+            Worker().run(burst=True)
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts, calls), (Job.Status.QUEUED, 1, [1]))
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn('ValueError', job.last_error)
+
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs('joybor.jobqueue', 'ERROR'):
+            Worker().run(burst=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.Status.FAILED, 2))
+
+    def test_expired_visibility_timeout_reclaimed(self):
+        job = Job.objects.create(name='joybor.tests.flaky', args=[1], run_at=timezone.now())
+        first, second = Worker(), Worker()
+        self.assertEqual(first.claim(5), [job])
+        self.assertEqual(second.claim(5), [])
+
+        # Birinchi worker javob bermay qoldi
+        Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(second.claim(5), [job])
+        job.refresh_from_db()
+        self.assertEqual((job.locked_by, job.attempts), (second.worker_id, 2))
+
+    def test_expired_lease_after_max_attempts_fails(self):
+        job = Job.objects.create(name='joybor.tests.flaky', args=[1], run_at=timezone.now(), max_attempts=2)
+        for _ in range(2):
+            self.assertEqual(Worker().claim(5), [job])
+            Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+
+        with self.assertLogs('joybor.jobqueue', 'ERROR'):
+            self.assertEqual(Worker().claim(5), [])
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_until), (Job.Status.FAILED, 2, None))
+        self.assertIn('lease expired', job.last_error)
+
+    @override_settings(JOB_QUEUE_CONCURRENCY={'mail': 1})
+    def test_queue_concurrency_limit(self):
+        for _ in range(3):
+            Job.objects.create(name='joybor.tasks.send_email', queue='mail', run_at=timezone.now())
+        self.assertEqual(len(Worker().claim(3)), 1)
+        self.assertEqual(Worker().claim(3), [])
+
+
+class MetricsTest(TestCase):
+    def setUp(self):
+        metrics.registry.clear()
+        self.addCleanup(metrics.registry.clear)
+
+    def test_request_metrics(self):
+        superadmin = User.objects.create_user(username='super', email='super@example.com', password='pass1234',
+                                              role=User.Role.IS_SUPERADMIN)
+        University.objects.create(name='TATU', city='Toshkent')
+        token = RoleRefreshToken.for_user(superadmin).access_token
+        self.client.get('/universities/university/', headers={'authorization': f'Bearer {token}'})
+        self.client.get('/no-such-page/')
+
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        merged = metrics.collect()
+        labels = (('route', 'university-list'), ('method', 'GET'))
+        self.assertEqual(merged['joybor_http_requests_total', labels + (('status', '200'),)], 1)
+        self.assertEqual(merged['joybor_http_request_duration_seconds', labels][-1], 1)
+        self.assertIn(('joybor_db_queries_total', labels), merged)
+        self.assertGreater(merged['joybor_http_response_size_bytes', labels][-2], 0)
+        self.assertIn('joybor_http_requests_total{route="unmatched",method="GET",status="404"} 1',
+                      response.content.decode())
+        self.assertIn('joybor_http_request_duration_seconds_bucket{route="university-list",method="GET",'
+                      'le="+Inf"} 1', response.content.decode())
+
+    def test_serializer_and_query_time(self):
+        University.objects.create(name='TATU', city='Toshkent')
+        stats = metrics.RequestStats()
+        token = metrics._current.set(stats)
+        try:
+            UniversitySerializer(University.objects.all(), many=True).data
+        finally:
+            metrics._current.reset(token)
+        self.assertGreater(stats.queries, 0)
+        self.assertGreater(stats.serializer_time, 0)
+
+    def test_thread_safe_aggregation(self):
+        def observe():
+            for _ in range(500):
+                metrics.registry.record_request('room-list', 'GET', 200, 0.01, metrics.RequestStats(), 100)
+
+        threads = [threading.Thread(target=observe) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        merged = metrics.collect()
+        labels = (('route', 'room-list'), ('method', 'GET'))
+        self.assertEqual(merged['joybor_http_requests_total', labels + (('status', '200'),)], 4000)
+        self.assertEqual(merged['joybor_http_request_duration_seconds', labels][-1], 4000)
+
+    def test_multiprocess_files_are_merged(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        labels = [['route', 'room-list'], ['method', 'GET']]
+        # Boshqa worker jarayoni yozgan fayl
+        other = [['joybor_db_queries_total', labels, 7],
+                 ['joybor_http_response_size_bytes', labels, [1, 0, 0, 0, 0, 0, 0, 0, 0, 100, 1]]]
+        Path(directory.name, 'other.json').write_text(json.dumps(other))
+
+        with override_settings(METRICS_DIR=directory.name):
+            stats = metrics.RequestStats()
+            stats.queries = 3
+            metrics.registry.record_request('room-list', 'GET', 200, 0.01, stats, 100)
+            metrics.registry.flush(force=True)
+            self.assertTrue(metrics.registry.file_path(directory.name).exists())
+            text = metrics.render()
+        self.assertIn('joybor_db_queries_total{route="room-list",method="GET"} 10', text)
+        self.assertIn('joybor_http_response_size_bytes_count{route="room-list",method="GET"} 2', text)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 401)
+        response = self.client.get(reverse('metrics'), headers={'authorization': 'Bearer secret'})
+        self.assertEqual(response.status_code, 200)
+
+
+class BenchCompareTest(TestCase):
+    baseline = {'admin room-list': {'status': 200, 'p50_ms': 10.0, 'p95_ms': 20.0, 'p99_ms': 30.0,
+                                    'queries': 3, 'bytes': 1000}}
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual((bench.percentile(values, 50), bench.percentile(values, 99)), (50, 99))
+        self.assertEqual(bench.percentile([7], 95), 7)
+
+    def test_regressions(self):
+        results = {'admin room-list': {'status': 200, 'p50_ms': 10.5, 'p95_ms': 30.0, 'p99_ms': 30.5,
+                                       'queries': 4, 'bytes': 1100}}
+        self.assertEqual(bench.compare(results, self.baseline), [
+            ('admin room-list', 'p95_ms', 20.0, 30.0),
+            ('admin room-list', 'queries', 3, 4),
+        ])
+
+    def test_status_change_is_regression(self):
+        results = {'admin room-list': {'status': 403}}
+        self.assertEqual(bench.compare(results, self.baseline), [('admin room-list', 'status', 200, 403)])
+
+    def test_non_success_baseline_is_not_compared(self):
+        baseline = {'student room-list': {'status': 403}}
+        results = {'student room-list': {'status': 200, 'p50_ms': 90.0, 'p95_ms': 90.0, 'p99_ms': 90.0,
+                                         'queries': 9, 'bytes': 60}}
+        self.assertEqual(bench.compare(results, baseline), [])
+
+
+class SeedTest(TestCase):
+    counts = dict(universities=2, faculties_per_university=3, dormitories=2, floors=2, rooms_per_floor=3,
+                  students=30, applications=5, payments_per_student=2)
+
+    def run_seeder(self, rollback=False):
+        with transaction.atomic():
+            seed.Seeder(seed=7, batch_size=8).run(**self.counts)
+            students = list(Student.objects.order_by('passport_number').values_list(
+                'name', 'passport_number', 'phone_number', 'room__room_number'))
+            rooms = list(Room.objects.order_by('floor__dormitory__name', 'room_number').values_list(
+                'capacity', 'current_occupancy'))
+            transaction.set_rollback(rollback)
+        return students, rooms
+
+    def test_deterministic_per_seed(self):
+        self.assertEqual(self.run_seeder(rollback=True), self.run_seeder(rollback=True))
+
+    def test_counts_and_derived_data(self):
+        students, _ = self.run_seeder()
+        self.assertEqual((len(students), Application.objects.count()), (30, 5))
+        self.assertEqual(User.objects.filter(role=User.Role.IS_ADMIN).count(), 2)
+        self.assertEqual(SearchDocument.objects.count(), 35)
+        self.assertTrue(all(len(passport) == 9 for _, passport, _, _ in students))
+        self.assertTrue(all(phone.startswith('+998') and len(phone) == 13 for _, _, phone, _ in students))
+
+        for room in Room.objects.annotate(students=Count('student')):
+            self.assertEqual(room.current_occupancy, room.students)
+        for dormitory in Dormitory.objects.annotate(capacity=Sum('floors__total_capacity')):
+            self.assertEqual(dormitory.total_capacity, dormitory.capacity)
+        self.assertEqual(DormitoryVacancy.objects.aggregate(Sum('current_occupancy'))['current_occupancy__sum'],
+                         Student.objects.filter(room__isnull=False).count())
+
+        self.assertTrue(PaymentForStudent.month.through.objects.exists())
+        self.assertEqual(StudentBalance.objects.aggregate(Sum('paid_amount'))['paid_amount__sum'],
+                         PaymentForStudent.objects.aggregate(Sum('amount'))['amount__sum'])
+
+
+class DatabaseConfigTest(SimpleTestCase):
+    def test_sqlite_by_default(self):
+        config = database_from_env({}, Path('/app'))
+        self.assertEqual(config['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertEqual(config['NAME'], Path('/app/db.sqlite3'))
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+
+    def test_postgresql_with_pool(self):
+        config = database_from_env({
+            'JOYBOR_DB_ENGINE': 'postgresql', 'JOYBOR_DB_NAME': 'joybor_prod', 'JOYBOR_DB_HOST': 'db',
+            'JOYBOR_DB_POOL_MAX_SIZE': '20', 'JOYBOR_DB_CONN_MAX_AGE': '600',
+        }, Path('/app'))
+        self.assertEqual(config['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual((config['NAME'], config['HOST'], config['PORT']), ('joybor_prod', 'db', '5432'))
+        self.assertEqual(config['OPTIONS']['pool'], {'min_size': 2, 'max_size': 20, 'timeout': 10})
+        # Django pool bilan doimiy ulanishlarni qabul qilmaydi
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+        self.assertFalse(config['DISABLE_SERVER_SIDE_CURSORS'])
+
+    def test_postgresql_persistent_connections(self):
+        config = database_from_env({
+            'JOYBOR_DB_ENGINE': 'postgresql', 'JOYBOR_DB_POOL': '0', 'JOYBOR_DB_CONN_MAX_AGE': '600',
+            'JOYBOR_DB_DISABLE_SERVER_SIDE_CURSORS': '1',
+        }, Path('/app'))
+        self.assertEqual(config['OPTIONS'], {})
+        self.assertEqual(config['CONN_MAX_AGE'], 600)
+        self.assertTrue(config['CONN_HEALTH_CHECKS'])
+        self.assertTrue(config['DISABLE_SERVER_SIDE_CURSORS'])
+
+    def test_invalid_values(self):
+        with self.assertRaises(ImproperlyConfigured):
+            database_from_env({'JOYBOR_DB_ENGINE': 'mysql'}, Path('/app'))
+        with self.assertRaises(ImproperlyConfigured):
+            database_from_env({'JOYBOR_DB_ENGINE': 'postgresql', 'JOYBOR_DB_POOL_MAX_SIZE': 'ko`p'}, Path('/app'))
@@ -1,23 +1,10 @@
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 from django.conf import settings
 from django.conf.urls.static import static
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Joy Bor API",
-        default_version='v1',
-        description="Yotoqxona tizimi uchun API",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="vohobjonovsardorbek2005@gmail.com"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
+from .metrics import metrics_view
+from .schema import schema_json, schema_view
 
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -31,9 +18,11 @@ urlpatterns = [
 
 urlpatterns += [
     path('admin/', admin.site.urls),
+    # UI sahifalari sxemani swagger.json dan oladi (SPEC_URL sozlamasi)
     path('docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-    path('swagger.json', schema_view.without_ui(cache_timeout=0), name='schema-json'),
+    path('swagger.json', schema_json, name='schema-json'),
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 urlpatterns += [
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import PaymentForStudent
+from .models import PaymentForStudent, StudentBalance
 
 
 class PaymentByStudentAdmin(admin.ModelAdmin):
@@ -11,3 +11,13 @@ class PaymentByStudentAdmin(admin.ModelAdmin):
 
 
 admin.site.register(PaymentForStudent, PaymentByStudentAdmin)
+
+
+class StudentBalanceAdmin(admin.ModelAdmin):
+    list_display = ('student', 'month', 'paid_amount', 'payments_count', 'last_payment_at')
+    list_filter = ('month',)
+    search_fields = ('student__name', 'student__passport_number')
+    readonly_fields = ('student', 'month', 'paid_amount', 'payments_count', 'last_payment_at', 'updated_at')
+
+
+admin.site.register(StudentBalance, StudentBalanceAdmin)
@@ -0,0 +1,231 @@
+"""
+To'lovlarni CSV/XLSX fayldan ommaviy import qilish.
+
+Fayl oqim sifatida o'qiladi va qatorlar bo'laklarga (chunk) ajratiladi. Har bir bo'lak
+uchun talabalar passport_number bo'yicha bitta so'rov bilan topiladi, to'lovlar va
+ularning oy bog'lanishlari bulk_create bilan alohida tranzaksiyada yoziladi.
+Xato qatorlar o'tkazib yuboriladi va hisobotda qaytariladi. Fayl esa butunligicha
+(kodlash, CSV/XLSX tuzilishi) birinchi bo'lak yozilishidan oldin bir marta o'qib tekshiriladi:
+buzilgan fayl yarim yozilgan importni qoldirmaydi.
+"""
+import codecs
+import csv
+import zipfile
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from joybor import refdata
+from students.models import Student
+from .ledger import schedule_balance_refresh
+from .models import Month, PaymentForStudent, PaymentMethod
+
+COLUMNS = ['passport_number', 'amount', 'method', 'months', 'description', 'created_at']
+REQUIRED_COLUMNS = ['passport_number', 'amount', 'months']
+AMOUNT_FIELD = PaymentForStudent._meta.get_field('amount')
+
+
+class ImportFileError(Exception):
+    pass
+
+
+def read_csv(file):
+    try:
+        yield from csv.reader(codecs.iterdecode(file, 'utf-8-sig'))
+    except UnicodeDecodeError:
+        raise ImportFileError("CSV fayl UTF-8 kodlashda bo'lishi kerak.")
+    except csv.Error as exc:
+        raise ImportFileError(f"CSV fayl o'qilmadi: {exc}")
+
+
+def read_xlsx(file):
+    try:
+        from openpyxl import load_workbook
+        from openpyxl.utils.exceptions import InvalidFileException
+    except ImportError:
+        raise ImportFileError("XLSX fayllar uchun openpyxl o'rnatilmagan.")
+
+    # KeyError: zip ichida kerakli qism (masalan xl/workbook.xml) yo'q
+    broken = (zipfile.BadZipFile, InvalidFileException, KeyError)
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except broken:
+        raise ImportFileError("XLSX fayl buzilgan yoki Excel fayli emas.")
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield ['' if value is None else value for value in row]
+    except broken:
+        raise ImportFileError("XLSX fayl buzilgan yoki Excel fayli emas.")
+    finally:
+        workbook.close()
+
+
+def read_rows(file):
+    name = (getattr(file, 'name', '') or '').lower()
+    if name.endswith('.xlsx'):
+        return read_xlsx(file)
+    if name.endswith('.csv'):
+        return read_csv(file)
+    raise ImportFileError("Faqat .csv yoki .xlsx fayllar qabul qilinadi.")
+
+
+class PaymentImporter:
+    def __init__(self, dormitory_id, chunk_size=1000, dry_run=False):
+        self.dormitory_id = dormitory_id
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.created = 0
+        self.errors = []
+        self.months = self._load_months()
+        self.methods = {}
+        for value, label in PaymentMethod.choices:
+            self.methods[value.lower()] = value
+            self.methods[str(label).lower()] = value
+
+    @staticmethod
+    def _load_months():
+        months = {}
+        for month in refdata.get_table(Month).objects:
+            months[str(month.pk)] = month.pk
+            months[month.name.strip().lower()] = month.pk
+        return months
+
+    def run(self, file):
+        # Kodlash yoki tuzilish xatosi bo'lak yozilgandan keyin chiqmasligi uchun avval to'liq o'qiladi
+        for _ in read_rows(file):
+            pass
+        file.seek(0)
+
+        rows = read_rows(file)
+        header = next(rows, None)
+        if header is None:
+            raise ImportFileError("Fayl bo'sh.")
+        header = [str(column).strip().lower() for column in header]
+        missing = [column for column in REQUIRED_COLUMNS if column not in header]
+        if missing:
+            raise ImportFileError(f"Ustunlar topilmadi: {', '.join(missing)}")
+        index = {column: header.index(column) for column in COLUMNS if column in header}
+
+        numbered = enumerate(rows, start=2)
+        while chunk := list(islice(numbered, self.chunk_size)):
+            self._import_chunk(chunk, index)
+
+        return {
+            'created': self.created,
+            'failed': len(self.errors),
+            'dry_run': self.dry_run,
+            'errors': self.errors,
+        }
+
+    @staticmethod
+    def _cell(row, index, column):
+        position = index.get(column)
+        if position is None or position >= len(row):
+            return ''
+        value = row[position]
+        return value if isinstance(value, datetime) else str(value).strip()
+
+    def _import_chunk(self, chunk, index):
+        passports = {self._cell(row, index, 'passport_number') for _, row in chunk}
+        students = dict(
+            Student.objects.for_tenant(self.dormitory_id).filter(passport_number__in=passports)
+            .values_list('passport_number', 'id')
+        )
+
+        payments, payment_months = [], []
+        for line, row in chunk:
+            if not any(str(value).strip() for value in row):
+                continue
+            payment, month_ids, errors = self._parse_row(row, index, students)
+            if errors:
+                self.errors.append({'row': line, 'errors': errors})
+                continue
+            payments.append(payment)
+            payment_months.append(month_ids)
+
+        if not payments or self.dry_run:
+            self.created += len(payments)
+            return
+
+        Through = PaymentForStudent.month.through
+        with transaction.atomic():
+            PaymentForStudent.objects.bulk_create(payments, batch_size=self.chunk_size)
+            Through.objects.bulk_create(
+                [
+                    Through(paymentforstudent_id=payment.pk, month_id=month_id)
+                    for payment, month_ids in zip(payments, payment_months)
+                    for month_id in month_ids
+                ],
+                batch_size=self.chunk_size,
+            )
+            # bulk_create signal yubormaydi, hisobni o'zimiz yangilaymiz
+            affected = defaultdict(set)
+            for payment, month_ids in zip(payments, payment_months):
+                affected[payment.student_id].update(month_ids)
+            for student_id, month_ids in affected.items():
+                schedule_balance_refresh(student_id, month_ids)
+
+        self.created += len(payments)
+
+    def _parse_row(self, row, index, students):
+        errors = []
+
+        passport_number = self._cell(row, index, 'passport_number')
+        student_id = students.get(passport_number)
+        if student_id is None:
+            errors.append(f"Talaba topilmadi: {passport_number or '-'}")
+
+        try:
+            amount = Decimal(self._cell(row, index, 'amount').replace(' ', '').replace(',', '.'))
+            # Infinity/NaN ning exponent'i son emas, shuning uchun avval is_finite()
+            if not amount.is_finite() or amount <= 0 or amount.as_tuple().exponent < -AMOUNT_FIELD.decimal_places:
+                raise InvalidOperation
+            amount = amount.quantize(Decimal(1).scaleb(-AMOUNT_FIELD.decimal_places))
+            # max_digits: bazadagi numeric ustuniga sig'masa insert paytida xato bo'lardi
+            AMOUNT_FIELD.run_validators(amount)
+        except (InvalidOperation, ValidationError):
+            amount = None
+            errors.append("Summa noto'g'ri.")
+
+        method = self._cell(row, index, 'method').lower() or PaymentMethod.CASH
+        method = self.methods.get(method)
+        if method is None:
+            errors.append("To'lov turi noto'g'ri.")
+
+        month_ids = []
+        for name in self._cell(row, index, 'months').replace(';', ',').split(','):
+            name = name.strip().lower()
+            if not name:
+                continue
+            if name not in self.months:
+                errors.append(f"Oy topilmadi: {name}")
+            else:
+                month_ids.append(self.months[name])
+        if not month_ids and not errors:
+            errors.append("Kamida bitta oy ko'rsatilishi kerak.")
+
+        created_at = self._cell(row, index, 'created_at')
+        if isinstance(created_at, str):
+            created_at = parse_datetime(created_at) if created_at else timezone.now()
+            if created_at is None:
+                errors.append("Sana noto'g'ri.")
+        if created_at is not None and timezone.is_naive(created_at):
+            created_at = timezone.make_aware(created_at)
+
+        if errors:
+            return None, None, errors
+
+        payment = PaymentForStudent(
+            student_id=student_id,
+            amount=amount,
+            method=method,
+            description=self._cell(row, index, 'description') or None,
+            created_at=created_at,
+        )
+        return payment, sorted(set(month_ids)), []
@@ -0,0 +1,69 @@
+"""
+Talaba to'lov hisobini (StudentBalance) bosqichma-bosqich yuritish.
+
+Bitta to'lov bir necha oyga tegishli bo'lsa, summa oylar orasida teng taqsimlanadi
+(tiyingacha, qoldiq oxirgi oyga). O'zgarishda butun tarix emas, faqat ta'sirlangan
+(talaba, oy) juftliklari qayta hisoblanadi.
+"""
+from collections import defaultdict
+from decimal import ROUND_DOWN, Decimal
+
+from django.db import transaction
+
+from .models import PaymentForStudent, StudentBalance
+
+CENT = Decimal('0.01')
+
+
+def split_amount(amount, month_ids):
+    month_ids = sorted(month_ids)
+    share = (amount / len(month_ids)).quantize(CENT, rounding=ROUND_DOWN)
+    shares = dict.fromkeys(month_ids, share)
+    shares[month_ids[-1]] += amount - share * len(month_ids)
+    return shares
+
+
+def refresh_student_balances(student_id, month_ids):
+    month_ids = set(month_ids)
+    if student_id is None or not month_ids:
+        return
+
+    Through = PaymentForStudent.month.through
+    payments = {
+        payment['id']: payment
+        for payment in PaymentForStudent.objects.filter(student_id=student_id, month__in=month_ids)
+        .distinct().values('id', 'amount', 'created_at')
+    }
+    payment_months = defaultdict(list)
+    for payment_id, month_id in Through.objects.filter(paymentforstudent_id__in=payments).values_list(
+            'paymentforstudent_id', 'month_id'):
+        payment_months[payment_id].append(month_id)
+
+    totals = {}
+    for payment_id, months in payment_months.items():
+        payment = payments[payment_id]
+        for month_id, share in split_amount(payment['amount'], months).items():
+            if month_id not in month_ids:
+                continue
+            row = totals.setdefault(month_id, StudentBalance(student_id=student_id, month_id=month_id,
+                                                             paid_amount=Decimal(0), payments_count=0))
+            row.paid_amount += share
+            row.payments_count += 1
+            if row.last_payment_at is None or payment['created_at'] > row.last_payment_at:
+                row.last_payment_at = payment['created_at']
+
+    with transaction.atomic():
+        StudentBalance.objects.filter(student_id=student_id, month_id__in=month_ids - set(totals)).delete()
+        if totals:
+            StudentBalance.objects.bulk_create(
+                totals.values(),
+                update_conflicts=True,
+                unique_fields=['student', 'month'],
+                update_fields=['paid_amount', 'payments_count', 'last_payment_at', 'updated_at'],
+            )
+
+
+def schedule_balance_refresh(student_id, month_ids):
+    month_ids = set(month_ids)
+    if student_id is not None and month_ids:
+        transaction.on_commit(lambda: refresh_student_balances(student_id, month_ids))
@@ -0,0 +1,31 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from payments.ledger import refresh_student_balances
+from payments.models import PaymentForStudent, StudentBalance
+
+
+class Command(BaseCommand):
+    help = "Talabalar to'lov hisobini (StudentBalance) to'lovlar asosida qayta quradi."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help="Bir martada o'qiladigan oy-to'lov bog'lanishlari soni.")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        Through = PaymentForStudent.month.through
+
+        pairs = defaultdict(set)
+        for student_id, month_id in StudentBalance.objects.values_list('student_id', 'month_id').iterator(
+                chunk_size=chunk_size):
+            pairs[student_id].add(month_id)
+        for student_id, month_id in Through.objects.values_list(
+                'paymentforstudent__student_id', 'month_id').iterator(chunk_size=chunk_size):
+            pairs[student_id].add(month_id)
+
+        for student_id, month_ids in pairs.items():
+            refresh_student_balances(student_id, month_ids)
+
+        self.stdout.write(self.style.SUCCESS(f"{len(pairs)} ta talaba hisobi qayta hisoblandi."))
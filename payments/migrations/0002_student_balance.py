@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0001_initial'),
+        ('students', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('payments_count', models.PositiveIntegerField(default=0)),
+                ('last_payment_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('month', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balances', to='payments.month')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balances', to='students.student')),
+            ],
+            options={
+                'ordering': ['student', 'month'],
+                'constraints': [models.UniqueConstraint(fields=('student', 'month'), name='unique_student_month_balance')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0003_payment_cursor_index'),
+        ('students', '0005_picture_variants'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='paymentforstudent',
+            index=models.Index(fields=['student', '-created_at'], name='payment_student_created_idx'),
+        ),
+    ]
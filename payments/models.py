@@ -1,5 +1,6 @@
 from django.db import models
 from django.utils import timezone
+from joybor.tenant import TenantManager
 from students.models import Student
 
 
@@ -23,8 +24,44 @@ class PaymentForStudent(models.Model):
     created_at = models.DateTimeField(default=timezone.now)
     month = models.ManyToManyField(Month)
 
+    tenant_field = 'student__dormitory_id'
+
+    objects = TenantManager()
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Kursor pagination: ORDER BY created_at DESC, id DESC
+            models.Index(fields=['-created_at', '-id'], name='payment_created_id_idx'),
+            # Talaba to'lovlari tarixi: WHERE student_id = ? ORDER BY created_at DESC
+            models.Index(fields=['student', '-created_at'], name='payment_student_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.name} - {self.amount} so'm"
+
+
+class StudentBalance(models.Model):
+    """
+    Talabaning har bir oy bo'yicha to'lov hisobi (ledger).
+    To'lovlar o'zgarganda payments.ledger orqali faqat tegishli (talaba, oy) qatorlari yangilanadi.
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='balances')
+    month = models.ForeignKey(Month, on_delete=models.CASCADE, related_name='balances')
+    paid_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    payments_count = models.PositiveIntegerField(default=0)
+    last_payment_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    tenant_field = 'student__dormitory_id'
+
+    objects = TenantManager()
+
+    class Meta:
+        ordering = ['student', 'month']
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'month'], name='unique_student_month_balance'),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} - {self.month_id}: {self.paid_amount} so'm"
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from joybor.serializers import ExpandableFieldsMixin, ReferenceRelatedField, ReferenceStringField
 from .models import *
 
 
@@ -17,10 +18,13 @@ class StudentShortSerializer(serializers.ModelSerializer):
         ]
 
 
-class PaymentForStudentReadSerializer(serializers.ModelSerializer):
+class PaymentForStudentReadSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'month': MonthSerializer,
+    }
     student = StudentShortSerializer(read_only=True)
     method_display = serializers.CharField(source='get_method_display', read_only=True, max_length=255)
-    month = serializers.PrimaryKeyRelatedField(queryset=Month.objects.all(), many=True)
+    month = ReferenceRelatedField(queryset=Month.objects.all(), many=True)
 
     class Meta:
         model = PaymentForStudent
@@ -39,7 +43,7 @@ class PaymentForStudentReadSerializer(serializers.ModelSerializer):
 
 class PaymentForStudentWriteSerializer(serializers.ModelSerializer):
     method = serializers.ChoiceField(choices=PaymentMethod.choices)
-    month = MonthSerializer(many=True)
+    month = ReferenceRelatedField(queryset=Month.objects.all(), many=True)
 
     class Meta:
         model = PaymentForStudent
@@ -52,3 +56,26 @@ class PaymentForStudentWriteSerializer(serializers.ModelSerializer):
         ]
 
 
+class StudentBalanceSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    month_name = ReferenceStringField(Month, source='month_id')
+    expandable_fields = {
+        'student': StudentShortSerializer,
+    }
+
+    class Meta:
+        model = StudentBalance
+        fields = [
+            'student',
+            'month',
+            'month_name',
+            'paid_amount',
+            'payments_count',
+            'last_payment_at',
+        ]
+        read_only_fields = fields
+
+
+class PaymentImportSerializer(serializers.Serializer):
+    file = serializers.FileField(help_text="CSV yoki XLSX: passport_number, amount, method, months, "
+                                           "description, created_at")
+    dry_run = serializers.BooleanField(default=False, help_text="Faqat tekshirish, bazaga yozmaslik")
@@ -0,0 +1,53 @@
+from django.db.models.signals import m2m_changed, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .ledger import schedule_balance_refresh
+from .models import PaymentForStudent
+
+
+def _month_ids(payment):
+    return set(PaymentForStudent.month.through.objects.filter(paymentforstudent_id=payment.pk)
+               .values_list('month_id', flat=True))
+
+
+@receiver(pre_save, sender=PaymentForStudent)
+def remember_previous_student(sender, instance, **kwargs):
+    instance._previous_student_id = None
+    if instance.pk:
+        instance._previous_student_id = (
+            PaymentForStudent.objects.filter(pk=instance.pk).values_list('student_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=PaymentForStudent)
+def refresh_balance_on_save(sender, instance, created, **kwargs):
+    if created:
+        # Yangi to'lovning oylari keyin m2m_changed orqali qo'shiladi
+        return
+    month_ids = _month_ids(instance)
+    schedule_balance_refresh(instance.student_id, month_ids)
+    if instance._previous_student_id != instance.student_id:
+        schedule_balance_refresh(instance._previous_student_id, month_ids)
+
+
+@receiver(m2m_changed, sender=PaymentForStudent.month.through)
+def refresh_balance_on_months_change(sender, instance, action, reverse, pk_set, **kwargs):
+    # Oylar soni o'zgarsa to'lovning har bir oyga tushadigan ulushi ham o'zgaradi,
+    # shuning uchun to'lovning barcha oylari qayta hisoblanadi
+    if reverse:
+        if action in ('post_add', 'post_remove'):
+            for payment in PaymentForStudent.objects.filter(pk__in=pk_set).only('student_id'):
+                schedule_balance_refresh(payment.student_id, _month_ids(payment) | {instance.pk})
+        return
+
+    if action == 'pre_clear':
+        instance._cleared_month_ids = _month_ids(instance)
+    elif action == 'post_clear':
+        schedule_balance_refresh(instance.student_id, getattr(instance, '_cleared_month_ids', ()))
+    elif action in ('post_add', 'post_remove'):
+        schedule_balance_refresh(instance.student_id, _month_ids(instance) | set(pk_set))
+
+
+@receiver(pre_delete, sender=PaymentForStudent)
+def refresh_balance_on_delete(sender, instance, **kwargs):
+    schedule_balance_refresh(instance.student_id, _month_ids(instance))
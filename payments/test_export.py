@@ -0,0 +1,48 @@
+import csv
+import json
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from dormitories.models import Dormitory
+from payments.models import PaymentForStudent
+from students.models import Student
+
+
+class PaymentExportTest(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass1234',
+                                              role=User.Role.IS_ADMIN)
+        dormitory = Dormitory.objects.create(name='Dorm', address='-', number_of_floors=1, admin=self.admin)
+        student = Student.objects.create(name='Ali', last_name='Valiyev', dormitory=dormitory,
+                                         passport_number='AA1234567', emergency_contact_phone='+998901234567')
+        for amount, method in ((100, 'cash'), (200, 'card'), (300, 'cash')):
+            PaymentForStudent.objects.create(student=student, amount=amount, method=method)
+        self.client.force_authenticate(self.admin)
+
+    def export(self, **params):
+        response = self.client.get(reverse('paymentforstudent-export'), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv_uses_list_filters_and_ordering(self):
+        response, content = self.export(method='cash', ordering='amount')
+
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(content.splitlines()))
+        self.assertEqual([Decimal(row['amount']) for row in rows], [100, 300])
+        self.assertEqual(rows[0]['student__passport_number'], 'AA1234567')
+
+    def test_ndjson(self):
+        response, content = self.export(file_format='ndjson', ordering='-amount')
+
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(len(rows), 3)
+        self.assertEqual([Decimal(row['amount']) for row in rows], [300, 200, 100])
+
+    def test_unknown_format(self):
+        response = self.client.get(reverse('paymentforstudent-export'), {'file_format': 'xml'})
+        self.assertEqual(response.status_code, 400)
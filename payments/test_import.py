@@ -0,0 +1,103 @@
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from dormitories.models import Dormitory
+from payments.importers import ImportFileError, PaymentImporter
+from payments.models import Month, PaymentForStudent, StudentBalance
+from students.models import Student
+
+
+class PaymentImportTest(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass1234',
+                                              role=User.Role.IS_ADMIN)
+        dormitory = Dormitory.objects.create(name='Dorm', address='-', number_of_floors=1, admin=self.admin)
+        for passport in ('AA1234567', 'AB1234567'):
+            Student.objects.create(name='Ali', last_name='Valiyev', dormitory=dormitory, passport_number=passport,
+                                   emergency_contact_phone='+998901234567')
+        Student.objects.create(name='Begona', last_name='Talaba', passport_number='AC1234567',
+                               emergency_contact_phone='+998901234567')
+        self.january = Month.objects.create(name='Yanvar')
+        self.february = Month.objects.create(name='Fevral')
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, name, content, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('paymentforstudent-import-payments'),
+                                    {'file': SimpleUploadedFile(name, content), **data}, format='multipart')
+
+    def test_csv_import_with_error_report(self):
+        content = (
+            'passport_number,amount,method,months,description\n'
+            'AA1234567,600000,Naqd,"Yanvar, Fevral",\n'
+            'AB1234567,300000.50,card,yanvar,Karta\n'
+            'AC1234567,100000,cash,Yanvar,\n'
+            'AA1234567,-5,cash,Mart,\n'
+            'AA1234567,Infinity,cash,Yanvar,\n'
+            'AA1234567,1e15,cash,Yanvar,\n'
+            'AA1234567,1.005,cash,Yanvar,\n'
+        ).encode()
+        response = self.upload('payments.csv', content)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual([error['row'] for error in response.data['errors']], [4, 5, 6, 7, 8])
+        self.assertEqual(response.data['errors'][2]['errors'], ["Summa noto'g'ri."])
+        self.assertEqual(response.data['errors'][3]['errors'], ["Summa noto'g'ri."])
+        self.assertEqual(PaymentForStudent.objects.count(), 2)
+        self.assertEqual(PaymentForStudent.month.through.objects.count(), 3)
+        self.assertEqual(
+            StudentBalance.objects.get(student__passport_number='AA1234567', month=self.february).paid_amount,
+            Decimal('300000.00'),
+        )
+
+    def test_dry_run_writes_nothing(self):
+        response = self.upload('payments.csv', b'passport_number,amount,months\nAA1234567,1000,Yanvar\n',
+                               dry_run=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 1)
+        self.assertFalse(PaymentForStudent.objects.exists())
+
+    def test_xlsx_import(self):
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(['passport_number', 'amount', 'method', 'months'])
+        sheet.append(['AA1234567', 250000, 'cash', self.january.id])
+        buffer = BytesIO()
+        workbook.save(buffer)
+
+        response = self.upload('payments.xlsx', buffer.getvalue())
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(PaymentForStudent.objects.get().amount, Decimal('250000'))
+
+    def test_missing_columns(self):
+        response = self.upload('payments.csv', b'passport_number,amount\n')
+        self.assertEqual(response.status_code, 400)
+
+    def test_non_utf8_csv_writes_nothing(self):
+        content = (
+            'passport_number,amount,months,description\n'
+            'AA1234567,1000,Yanvar,Naqd\n'
+            'AB1234567,2000,Yanvar,Qarzdorlik to\'landi - caf\xe9\n'
+        ).encode('latin-1')
+        response = self.upload('payments.csv', content)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['file'], "CSV fayl UTF-8 kodlashda bo'lishi kerak.")
+
+        # Birinchi qator alohida bo'lakda bo'lsa ham yozilmaydi
+        with self.assertRaises(ImportFileError):
+            PaymentImporter(None, chunk_size=1).run(SimpleUploadedFile('payments.csv', content))
+        self.assertFalse(PaymentForStudent.objects.exists())
+
+    def test_corrupt_xlsx(self):
+        for content in (b'passport_number,amount,months\n', b'PK\x03\x04' + b'\x00' * 64):
+            response = self.upload('payments.xlsx', content)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.data['file'], "XLSX fayl buzilgan yoki Excel fayli emas.")
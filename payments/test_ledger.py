@@ -0,0 +1,82 @@
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from dormitories.models import Dormitory
+from joybor import refdata
+from payments.ledger import split_amount
+from payments.models import Month, PaymentForStudent, StudentBalance
+from students.models import Student
+
+
+class StudentBalanceTest(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass1234',
+                                              role=User.Role.IS_ADMIN)
+        self.dormitory = Dormitory.objects.create(name='Dorm', address='-', number_of_floors=1, admin=self.admin)
+        self.student = Student.objects.create(name='Ali', last_name='Valiyev', dormitory=self.dormitory,
+                                              passport_number='AA1234567', emergency_contact_phone='+998901234567')
+        self.other = Student.objects.create(name='Vali', last_name='Aliyev', dormitory=self.dormitory,
+                                            passport_number='AB1234567', emergency_contact_phone='+998901234567')
+        self.january = Month.objects.create(name='Yanvar')
+        self.february = Month.objects.create(name='Fevral')
+        self.client.force_authenticate(self.admin)
+
+    def balances(self, student):
+        return {
+            row.month_id: (row.paid_amount, row.payments_count)
+            for row in StudentBalance.objects.filter(student=student)
+        }
+
+    def test_split_amount_keeps_total(self):
+        shares = split_amount(Decimal('100.00'), [2, 1, 3])
+        self.assertEqual(shares, {1: Decimal('33.33'), 2: Decimal('33.33'), 3: Decimal('33.34')})
+
+    def test_payment_create_update_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('paymentforstudent-list'), {
+                'student': self.student.id,
+                'amount': '600000.00',
+                'method': 'cash',
+                'month': [self.january.id, self.february.id],
+            })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.balances(self.student), {
+            self.january.id: (Decimal('300000.00'), 1),
+            self.february.id: (Decimal('300000.00'), 1),
+        })
+
+        payment = PaymentForStudent.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            payment.month.remove(self.february)
+        self.assertEqual(self.balances(self.student), {self.january.id: (Decimal('600000.00'), 1)})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            payment.student = self.other
+            payment.save()
+        self.assertEqual(self.balances(self.student), {})
+        self.assertEqual(self.balances(self.other), {self.january.id: (Decimal('600000.00'), 1)})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            payment.delete()
+        self.assertFalse(StudentBalance.objects.exists())
+
+    def test_student_balance_endpoint(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for amount in ('100000.00', '50000.00'):
+                payment = PaymentForStudent.objects.create(student=self.student, amount=Decimal(amount))
+                payment.month.add(self.january)
+
+        # Oy nomlari ma'lumotnoma keshidan olinadi
+        refdata.get_table(Month)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('student-balance', kwargs={'pk': self.student.id}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_paid'], '150000.00')
+        self.assertEqual(response.data['months'][0]['month_name'], 'Yanvar')
+        self.assertEqual(response.data['months'][0]['payments_count'], 2)
+
+        response = self.client.get(reverse('studentbalance-list'), {'month': self.january.id})
+        self.assertEqual(response.data['count'], 1)
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from dormitories.models import Dormitory
+from payments.models import PaymentForStudent
+from students.models import Student
+
+
+class PaymentCursorPaginationTest(APITestCase):
+    def setUp(self):
+        admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass1234',
+                                         role=User.Role.IS_ADMIN)
+        dormitory = Dormitory.objects.create(name='Dorm', address='-', number_of_floors=1, admin=admin)
+        student = Student.objects.create(name='Ali', last_name='Valiyev', dormitory=dormitory,
+                                         passport_number='AA1234567', emergency_contact_phone='+998901234567')
+        now = timezone.now()
+        # Bir xil vaqtli to'lovlar ham id bo'yicha aniq tartiblanishi kerak
+        PaymentForStudent.objects.bulk_create([
+            PaymentForStudent(student=student, amount=index + 1, created_at=now - timedelta(seconds=index // 3))
+            for index in range(25)
+        ])
+        self.expected = list(PaymentForStudent.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.client.force_authenticate(admin)
+
+    def test_page_number_is_default(self):
+        response = self.client.get(reverse('paymentforstudent-list'))
+        self.assertEqual(response.data['count'], 25)
+
+    def test_walk_forward_and_back(self):
+        url = reverse('paymentforstudent-list') + '?pagination=cursor'
+        seen, pages = [], []
+        while url:
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            seen += [row['id'] for row in response.data['results']]
+            pages.append(response.data)
+            url = response.data['next']
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]['previous'])
+
+        response = self.client.get(pages[-1]['previous'])
+        self.assertEqual([row['id'] for row in response.data['results']], self.expected[10:20])
+        self.assertIsNotNone(response.data['next'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('paymentforstudent-list'), {'cursor': 'xyz'})
+        self.assertEqual(response.status_code, 404)
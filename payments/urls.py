@@ -1,11 +1,12 @@
 from django.urls import path, include
 
-from .views import PaymentForStudentViewSet
+from .views import PaymentForStudentViewSet, StudentBalanceViewSet
 from rest_framework.routers import DefaultRouter
 
 router = DefaultRouter()
 
 router.register('payment_by_student', PaymentForStudentViewSet)
+router.register('balance', StudentBalanceViewSet)
 urlpatterns = [
     path('', include(router.urls))
 ]
\ No newline at end of file
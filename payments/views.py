@@ -1,15 +1,23 @@
 from django.contrib.auth.models import AnonymousUser
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import viewsets, permissions, filters
-from rest_framework.exceptions import PermissionDenied
+from rest_framework import viewsets, permissions, filters, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
 
-from .models import PaymentForStudent
+from joybor.mixins import OptimizedQuerysetMixin, ExportMixin
+from joybor.pagination import CursorOrPageNumberPagination
+from joybor.tenant import get_tenant
+from .importers import ImportFileError, PaymentImporter
+from .models import PaymentForStudent, StudentBalance
 from .permissions import PaymentPermission
-from .serializers import PaymentForStudentReadSerializer, PaymentForStudentWriteSerializer
+from .serializers import PaymentForStudentReadSerializer, PaymentForStudentWriteSerializer, StudentBalanceSerializer, \
+    PaymentImportSerializer
 
 
-class PaymentForStudentViewSet(viewsets.ModelViewSet):
+class PaymentForStudentViewSet(OptimizedQuerysetMixin, ExportMixin, viewsets.ModelViewSet):
     queryset = PaymentForStudent.objects.all()
     permission_classes = [PaymentPermission]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -17,6 +25,9 @@ class PaymentForStudentViewSet(viewsets.ModelViewSet):
     search_fields = ['student__name']
     ordering_fields = ['created_at', 'amount']
     ordering = ['-created_at']
+    pagination_class = CursorOrPageNumberPagination
+    cursor_ordering = ('-created_at', '-id')
+    export_fields = ['id', 'student', 'student__passport_number', 'amount', 'method', 'description', 'created_at']
 
     def get_queryset(self):
 
@@ -26,16 +37,38 @@ class PaymentForStudentViewSet(viewsets.ModelViewSet):
             return PaymentForStudent.objects.none()
         role = getattr(user, 'role', None)
 
-        if user.role == 'superadmin' or user.role == 'admin':
+        if user.role == 'superadmin':
             return self.queryset
+        if user.role == 'admin':
+            return self.queryset.for_tenant()
         return PaymentForStudent.objects.none()
 
     def get_serializer_class(self):
 
         if self.action in ['list', 'retrieve']:
             return PaymentForStudentReadSerializer
+        if self.action == 'import_payments':
+            return PaymentImportSerializer
         return PaymentForStudentWriteSerializer
 
+    @swagger_auto_schema(tags=['Studentning to\'lovlari'])
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_payments(self, request):
+        """
+        To'lovlarni CSV/XLSX fayldan ommaviy import qilish.
+        Xato qatorlar yozilmaydi va javobdagi `errors` ro'yxatida qator raqami bilan qaytariladi.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        importer = PaymentImporter(get_tenant(request).dormitory_id, dry_run=serializer.validated_data['dry_run'])
+        try:
+            report = importer.run(serializer.validated_data['file'])
+        except ImportFileError as exc:
+            raise ValidationError({'file': str(exc)})
+
+        return Response(report, status=status.HTTP_200_OK if report['dry_run'] else status.HTTP_201_CREATED)
+
     @swagger_auto_schema(tags=['Studentning to\'lovlari'])
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
@@ -59,3 +92,33 @@ class PaymentForStudentViewSet(viewsets.ModelViewSet):
     @swagger_auto_schema(tags=['Studentning to\'lovlari'])
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
+
+
+class StudentBalanceViewSet(OptimizedQuerysetMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Yotoqxona bo'yicha talabalar to'lov hisobi: har bir (talaba, oy) uchun bitta qator.
+    """
+    queryset = StudentBalance.objects.all()
+    serializer_class = StudentBalanceSerializer
+    permission_classes = [PaymentPermission]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['student', 'month']
+    ordering_fields = ['paid_amount', 'last_payment_at']
+    ordering = ['student', 'month']
+
+    def get_queryset(self):
+        user = self.request.user
+        if not user.is_authenticated:
+            return StudentBalance.objects.none()
+
+        if user.role == 'admin':
+            return self.queryset.for_tenant()
+        return StudentBalance.objects.none()
+
+    @swagger_auto_schema(tags=['Studentning to\'lovlari'])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @swagger_auto_schema(tags=['Studentning to\'lovlari'])
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
@@ -0,0 +1,115 @@
+"""
+Arizalarni ommaviy tasdiqlash: Application -> Student.
+
+Barcha talabalar bitta tranzaksiyada bulk_create bilan yaratiladi, xona bandligi esa
+har bir xona uchun bir marta (move_occupants(None, room_id, count)) yangilanadi.
+Yaratib bo'lmaydigan arizalar o'tkazib yuboriladi va `conflicts` ro'yxatida qaytariladi.
+"""
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ValidationError
+
+from dormitories.models import Room
+from dormitories.occupancy import move_occupants
+from .models import Application, Student
+from .search import index_objects
+
+
+def _student_from_application(application, room=None):
+    return Student(
+        application=application,
+        name=application.first_name,
+        last_name=application.last_name,
+        middle_name=application.middle_name,
+        dormitory_id=application.dormitory_id,
+        faculty_id=application.faculty_id,
+        province_id=application.province_id,
+        district_id=application.district_id,
+        floor_id=room.floor_id if room else None,
+        room=room,
+        passport_number=application.passport_number,
+        picture=application.picture.name or None,
+        # Fayl bir xil, tayyor hosilalar ham
+        picture_variants=application.picture_variants,
+        phone_number=application.phone_number,
+        emergency_contact_phone=application.phone_number or '',
+    )
+
+
+def approve_applications(dormitory_id, items):
+    """
+    dormitory_id: joriy adminning yotoqxonasi (request.tenant), boshqa yotoqxona arizalari topilmaydi.
+    items: [{'application': id, 'room': id yoki None}, ...]
+    Qaytaradi: {'created': [{'application', 'student'}], 'conflicts': [{'application', 'errors'}]}
+    """
+    rooms_by_application = {item['application']: item.get('room') for item in items}
+    conflicts = defaultdict(list)
+
+    applications = {
+        application.pk: application
+        for application in Application.objects.for_tenant(dormitory_id).filter(pk__in=rooms_by_application)
+    }
+    for application_id in rooms_by_application:
+        if application_id not in applications:
+            conflicts[application_id].append("Ariza topilmadi.")
+
+    approved = set(
+        Student.objects.filter(application_id__in=applications).values_list('application_id', flat=True)
+    )
+    taken_passports = set(
+        Student.objects.filter(passport_number__in=[a.passport_number for a in applications.values()])
+        .values_list('passport_number', flat=True)
+    )
+    for application_id, application in applications.items():
+        if application_id in approved:
+            conflicts[application_id].append("Ariza allaqachon tasdiqlangan.")
+        elif application.passport_number in taken_passports:
+            conflicts[application_id].append(
+                f"{application.passport_number} pasport raqamli talaba allaqachon mavjud."
+            )
+
+    with transaction.atomic():
+        room_ids = {room_id for room_id in rooms_by_application.values() if room_id is not None}
+        # Bo'sh joylar qulflangan qiymatlar bo'yicha hisoblanadi
+        rooms = {
+            room.pk: room
+            for room in Room.objects.select_for_update().filter(pk__in=room_ids).order_by('pk')
+            .select_related('floor')
+        }
+        free_beds = {room.pk: room.capacity - room.current_occupancy for room in rooms.values()}
+
+        students = []
+        for application_id, room_id in rooms_by_application.items():
+            if application_id in conflicts:
+                continue
+            application = applications[application_id]
+            room = rooms.get(room_id)
+            if room_id is not None:
+                if room is None or room.floor.dormitory_id != application.dormitory_id:
+                    conflicts[application_id].append("Xona ushbu yotoqxonaga tegishli emas.")
+                    continue
+                if free_beds[room_id] <= 0:
+                    conflicts[application_id].append("Xonada bo'sh joy qolmagan.")
+                    continue
+                free_beds[room_id] -= 1
+            students.append(_student_from_application(application, room))
+
+        try:
+            Student.objects.bulk_create(students)
+        except IntegrityError:
+            # Tekshiruvdan keyin parallel so'rov bir xil pasport bilan talaba yaratgan bo'lsa
+            raise ValidationError("Talabalarni saqlab bo'lmadi, pasport raqamlari takrorlanmoqda. "
+                                  "Qayta urinib ko'ring.")
+
+        # bulk_create save() ni chaqirmaydi, shuning uchun bandlik har xona uchun bir marta yangilanadi
+        for room_id, count in Counter(student.room_id for student in students if student.room_id).items():
+            move_occupants(None, room_id, count)
+        index_objects(students)
+
+    return {
+        'created': [{'application': student.application_id, 'student': student.pk} for student in students],
+        'conflicts': [
+            {'application': application_id, 'errors': errors} for application_id, errors in conflicts.items()
+        ],
+    }
@@ -0,0 +1,34 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from students.models import Application, SearchDocument, Student
+from students.search import document_kind, index_objects
+
+
+class Command(BaseCommand):
+    help = ("Talaba va arizalar qidiruv indeksini (SearchDocument) qayta quradi. "
+            "Signal chiqarmaydigan o'zgarishlardan (update(), import) keyin ishlatiladi.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help="Bitta tranzaksiyada indekslanadigan yozuvlar soni.")
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        for model in (Student, Application):
+            fields = ['pk', *model.search_document_fields]
+            objects = model.objects.only(*fields).order_by('pk').iterator(chunk_size=chunk_size)
+            total = 0
+            while chunk := list(islice(objects, chunk_size)):
+                with transaction.atomic():
+                    index_objects(chunk)
+                total += len(chunk)
+
+            # O'chirilgan obyektlarning hujjatlari
+            stale = SearchDocument.objects.filter(kind=document_kind(model)).exclude(
+                object_id__in=model.objects.values('pk')
+            ).delete()[0]
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {total} ta indekslandi, {stale} ta eskisi o'chirildi")
+        self.stdout.write(self.style.SUCCESS("Qidiruv indeksi qayta qurildi."))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 11:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitories', '0005_dormitory_location_index'),
+        ('students', '0001_initial'),
+        ('universities', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['-submitted_at', '-id'], name='application_submitted_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['dormitory', '-submitted_at', '-id'], name='application_dorm_submitted_idx'),
+        ),
+    ]
@@ -0,0 +1,129 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:12
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE students_searchdocument_fts USING fts5("
+    "document, content='students_searchdocument', content_rowid='id', prefix='2 3')",
+    "CREATE TRIGGER students_searchdocument_ai AFTER INSERT ON students_searchdocument BEGIN "
+    "INSERT INTO students_searchdocument_fts(rowid, document) VALUES (new.id, new.document); END",
+    "CREATE TRIGGER students_searchdocument_ad AFTER DELETE ON students_searchdocument BEGIN "
+    "INSERT INTO students_searchdocument_fts(students_searchdocument_fts, rowid, document) "
+    "VALUES ('delete', old.id, old.document); END",
+    "CREATE TRIGGER students_searchdocument_au AFTER UPDATE ON students_searchdocument BEGIN "
+    "INSERT INTO students_searchdocument_fts(students_searchdocument_fts, rowid, document) "
+    "VALUES ('delete', old.id, old.document); "
+    "INSERT INTO students_searchdocument_fts(rowid, document) VALUES (new.id, new.document); END",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS students_searchdocument_au",
+    "DROP TRIGGER IF EXISTS students_searchdocument_ad",
+    "DROP TRIGGER IF EXISTS students_searchdocument_ai",
+    "DROP TABLE IF EXISTS students_searchdocument_fts",
+]
+POSTGRESQL_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX students_searchdocument_tsv ON students_searchdocument "
+    "USING GIN (to_tsvector('simple', document))",
+    "CREATE INDEX students_searchdocument_trgm ON students_searchdocument USING GIN (document gin_trgm_ops)",
+]
+POSTGRESQL_BACKWARD = [
+    "DROP INDEX IF EXISTS students_searchdocument_trgm",
+    "DROP INDEX IF EXISTS students_searchdocument_tsv",
+]
+
+# Migratsiya vaqtidagi holat; keyingi o'zgarishlar modeldagi search_document_fields da
+INDEXED_FIELDS = {
+    'Student': ('name', 'last_name', 'middle_name', 'passport_number', 'phone_number', 'emergency_contact_phone'),
+    'Application': ('first_name', 'last_name', 'middle_name', 'passport_number', 'phone_number', 'comment'),
+}
+
+# students.search normalizatsiyasining migratsiya vaqtidagi nusxasi: keyingi o'zgarishlar bu
+# migratsiyani o'zgartirmasligi kerak (hujjatlar `rebuild_search_index` bilan yangilanadi)
+CYRILLIC_TO_LATIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo', 'ж': 'j', 'з': 'z',
+    'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
+    'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'x', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sh',
+    'ъ': '', 'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+    'ў': 'o', 'қ': 'q', 'ғ': 'g', 'ҳ': 'h',
+}
+IOTATED_E = re.compile(r'(?<![а-яёўқғҳ])е|(?<=[аеёиоуўэюяъь])е')
+APOSTROPHES = re.compile(r"['`´‘’ʻʼ‛′]")
+NUMBER_GAPS = re.compile(r'(?<=\d)[\s\-().]+(?=\d)')
+TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKC', str(text)).lower()
+    text = IOTATED_E.sub('ye', text)
+    text = ''.join(CYRILLIC_TO_LATIN.get(char, char) for char in text)
+    text = APOSTROPHES.sub('', text)
+    text = NUMBER_GAPS.sub('', text)
+    text = ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+    return TOKEN.findall(text)
+
+
+def token_variants(token):
+    yield token
+    if token.isdigit() and len(token) == 12 and token.startswith('998'):
+        yield token[3:]
+    digits = ''.join(char for char in token if char.isdigit())
+    if digits != token and len(digits) >= 4:
+        yield digits
+
+
+def document_from_values(values):
+    tokens = []
+    for value in values:
+        if value:
+            for token in normalize(value):
+                tokens.extend(token_variants(token))
+    return ' '.join(dict.fromkeys(tokens))
+
+
+def create_search_index(apps, schema_editor):
+    statements = {'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRESQL_FORWARD}
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+    SearchDocument = apps.get_model('students', 'SearchDocument')
+    for model_name, fields in INDEXED_FIELDS.items():
+        model = apps.get_model('students', model_name)
+        kind = f'students.{model_name.lower()}'
+        documents = [
+            SearchDocument(kind=kind, object_id=row[0], document=document_from_values(row[1:]))
+            for row in model.objects.values_list('pk', *fields).iterator(chunk_size=2000)
+        ]
+        SearchDocument.objects.bulk_create(documents, batch_size=2000)
+
+
+def drop_search_index(apps, schema_editor):
+    statements = {'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRESQL_BACKWARD}
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0003_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=50)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('document', models.TextField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_document')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-18 12:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dormitories', '0007_dormitoryimage_image_variants'),
+        ('students', '0005_picture_variants'),
+        ('universities', '0002_university_logo_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('dormitory__isnull', False)), fields=['dormitory', '-created_at'], name='student_dorm_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(fields=('student', 'dormitory'), name='unique_student_dormitory_application'),
+        ),
+    ]
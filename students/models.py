@@ -1,10 +1,12 @@
 from datetime import timezone
 
 from django.core.validators import RegexValidator
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from accounts.models import User
 from dormitories.models import Dormitory, Floor, Room
+from dormitories.occupancy import move_occupants
+from joybor.tenant import TenantManager
 from universities.models import University, Faculty
 
 
@@ -36,6 +38,7 @@ class Application(models.Model):
     district = models.ForeignKey(District, on_delete=models.SET_NULL, null=True)
     passport_number = models.CharField(max_length=9, unique=True)
     picture = models.ImageField(upload_to='student_pictures/', blank=True, null=True)
+    picture_variants = models.JSONField(default=dict, blank=True, editable=False)
     phone_number = models.CharField(
         max_length=15,
         blank=True,
@@ -44,8 +47,26 @@ class Application(models.Model):
         verbose_name=_('Phone number')
     )
     submitted_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     comment = models.TextField(blank=True)
 
+    tenant_field = 'dormitory_id'
+    search_document_fields = ('first_name', 'last_name', 'middle_name', 'passport_number', 'phone_number',
+                              'comment')
+
+    objects = TenantManager()
+
+    class Meta:
+        indexes = [
+            # Kursor pagination: ORDER BY submitted_at DESC, id DESC (admin uchun yotoqxona bo'yicha)
+            models.Index(fields=['-submitted_at', '-id'], name='application_submitted_id_idx'),
+            models.Index(fields=['dormitory', '-submitted_at', '-id'], name='application_dorm_submitted_idx'),
+        ]
+        constraints = [
+            # Bitta talaba bitta yotoqxonaga bitta ariza; indeks student bo'yicha qidiruvga ham xizmat qiladi
+            models.UniqueConstraint(fields=['student', 'dormitory'], name='unique_student_dormitory_application'),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name} {self.dormitory.name}"
 
@@ -65,6 +86,7 @@ class Student(models.Model):
     room = models.ForeignKey(Room, on_delete=models.SET_NULL, null=True)
     passport_number = models.CharField(max_length=9, unique=True)
     picture = models.ImageField(upload_to='student_pictures/', blank=True, null=True)
+    picture_variants = models.JSONField(default=dict, blank=True, editable=False)
     phone_number = models.CharField(
         max_length=15,
         blank=True,
@@ -76,6 +98,56 @@ class Student(models.Model):
     discount = models.CharField(max_length=255, blank=True, null=True)
     social_status = models.CharField(max_length=255, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    tenant_field = 'dormitory_id'
+    search_document_fields = ('name', 'last_name', 'middle_name', 'passport_number', 'phone_number',
+                              'emergency_contact_phone')
+
+    objects = TenantManager()
+
+    class Meta:
+        indexes = [
+            # Admin ro'yxati: WHERE dormitory_id = ? ORDER BY created_at DESC
+            models.Index(fields=['dormitory', '-created_at'], name='student_dorm_created_idx',
+                         condition=models.Q(dormitory__isnull=False)),
+        ]
 
     def __str__(self):
         return f"{self.name} {self.last_name}"
+
+    def save(self, *args, **kwargs):
+        """Xona o'zgarsa, eski va yangi xona bandligini bitta tranzaksiyada yangilaydi."""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'room' not in update_fields and 'room_id' not in update_fields:
+            return super().save(*args, **kwargs)
+
+        with transaction.atomic():
+            previous_room_id = None
+            if not self._state.adding:
+                previous_room_id = (
+                    Student.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list('room_id', flat=True)
+                    .first()
+                )
+            move_occupants(previous_room_id, self.room_id)
+            super().save(*args, **kwargs)
+
+
+class SearchDocument(models.Model):
+    """
+    Talaba va arizalar uchun normallashtirilgan qidiruv matni (students.search).
+    Bazaga xos indeks (SQLite FTS5, PostgreSQL tsvector/trigram) migratsiyada yaratiladi.
+    """
+    kind = models.CharField(max_length=50)
+    object_id = models.PositiveBigIntegerField()
+    document = models.TextField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_document'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}"
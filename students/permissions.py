@@ -1,5 +1,7 @@
 from rest_framework import permissions
 
+from joybor.tenant import is_own_dormitory
+
 
 class IsSuperAdminOrOwner(permissions.BasePermission):
     """
@@ -12,7 +14,7 @@ class IsSuperAdminOrOwner(permissions.BasePermission):
             return True
 
         # Ariza egasi bo‘lsa
-        if request.user == obj.student:
+        if obj.student_id == request.user.pk:
             return True
 
         # Hech kimga ruxsat berilmaydi
@@ -27,7 +29,7 @@ class IsAdminForDormitory(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         # Admin bo‘lsa va yotoqxona admini bo‘lsa
         if request.user.is_dormitory_admin:
-            if obj.dormitory.admin == request.user:
+            if is_own_dormitory(request, obj.dormitory_id):
                 return True
             return False
 
@@ -41,11 +43,11 @@ class IsStudentOrAdminForOwnDormitory(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         # Talaba o‘zining arizasini ko‘rishi mumkin
-        if request.user == obj.student:
+        if obj.student_id == request.user.pk:
             return True
 
         # Admin bo‘lsa va yotoqxona admini bo‘lsa
-        if request.user.is_dormitory_admin and obj.dormitory.admin == request.user:
+        if request.user.is_dormitory_admin and is_own_dormitory(request, obj.dormitory_id):
             return True
 
         return False
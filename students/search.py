@@ -0,0 +1,175 @@
+"""
+Talaba va arizalar bo'yicha indeksli qidiruv.
+
+Har bir obyekt uchun SearchDocument da normallashtirilgan matn saqlanadi: kirill yozuvi
+lotinga o'giriladi, apostrof variantlari (o‘, o', oʻ, o`) olib tashlanadi, telefon va
+pasport raqamlari bo'sh joy/chiziqchasiz yoziladi. So'rov ham xuddi shunday
+normallashtiriladi, har bir so'z prefiks sifatida qidiriladi (AND).
+
+- SQLite: FTS5 jadvali (students_searchdocument_fts), reyting bm25.
+- PostgreSQL: to_tsvector('simple') GIN va pg_trgm indekslari, reyting ts_rank + similarity.
+- Boshqa bazalar: indeks jadvali bo'yicha prefiks LIKE, reytingsiz.
+
+Hujjatlar post_save/post_delete signallarida yangilanadi. Signal chiqarmaydigan
+yozuvlardan (bulk_create) keyin `index_objects()` chaqiriladi.
+"""
+import re
+import unicodedata
+
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+from .models import SearchDocument
+
+CYRILLIC_TO_LATIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo', 'ж': 'j', 'з': 'z',
+    'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r',
+    'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'x', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sh',
+    'ъ': '', 'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+    'ў': 'o', 'қ': 'q', 'ғ': 'g', 'ҳ': 'h',
+}
+# So'z boshida, unli va ъ/ь dan keyin е -> ye (Ерназар -> Yernazar, Ўринбоев -> Orinboyev)
+IOTATED_E = re.compile(r'(?<![а-яёўқғҳ])е|(?<=[аеёиоуўэюяъь])е')
+APOSTROPHES = re.compile(r"['`´‘’ʻʼ‛′]")
+NUMBER_GAPS = re.compile(r'(?<=\d)[\s\-().]+(?=\d)')
+TOKEN = re.compile(r'[a-z0-9]+')
+
+FTS_TABLE = 'students_searchdocument_fts'
+
+
+def normalize(text):
+    """Matnni qidiruv so'zlariga ajratadi: 'Oʻrinboyev Ғайрат' -> ['orinboyev', 'gayrat']."""
+    text = unicodedata.normalize('NFKC', str(text)).lower()
+    text = IOTATED_E.sub('ye', text)
+    text = ''.join(CYRILLIC_TO_LATIN.get(char, char) for char in text)
+    text = APOSTROPHES.sub('', text)
+    text = NUMBER_GAPS.sub('', text)
+    # Qolgan lotin diakritikalari (é -> e)
+    text = ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+    return TOKEN.findall(text)
+
+
+def _token_variants(token):
+    yield token
+    if token.isdigit() and len(token) == 12 and token.startswith('998'):
+        # +998 90 123 45 67 ni 901234567 deb ham qidirish mumkin
+        yield token[3:]
+    digits = ''.join(char for char in token if char.isdigit())
+    if digits != token and len(digits) >= 4:
+        # Pasport AB1234567 ni raqam qismi bo'yicha ham
+        yield digits
+
+
+def document_from_values(values):
+    tokens = []
+    for value in values:
+        if value:
+            for token in normalize(value):
+                tokens.extend(_token_variants(token))
+    return ' '.join(dict.fromkeys(tokens))
+
+
+def build_document(instance):
+    return document_from_values(getattr(instance, name) for name in instance.search_document_fields)
+
+
+def document_kind(model):
+    return model._meta.label_lower
+
+
+def index_objects(objects):
+    """Obyektlar hujjatlarini yaratadi yoki yangilaydi (bitta upsert)."""
+    documents = [
+        SearchDocument(kind=document_kind(type(obj)), object_id=obj.pk, document=build_document(obj))
+        for obj in objects
+    ]
+    if documents:
+        SearchDocument.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=['kind', 'object_id'],
+            update_fields=['document'],
+        )
+
+
+def remove_object(instance):
+    SearchDocument.objects.filter(kind=document_kind(type(instance)), object_id=instance.pk).delete()
+
+
+def _prefix_terms(tokens, vendor):
+    if vendor == 'sqlite':
+        # To'liq mos kelgan so'z bm25 da prefiks mosligidan yuqori turadi
+        return ' AND '.join(f'("{token}" OR "{token}"*)' for token in tokens)
+    if vendor == 'postgresql':
+        return ' & '.join(f'{token}:*' for token in tokens)
+    return tokens
+
+
+def search_queryset(queryset, text):
+    """
+    `text` bo'yicha mos obyektlar, `search_rank` (katta - yaxshiroq) annotatsiyasi bilan.
+    Qidiruv so'zlari bo'lmasa queryset o'zgarmaydi.
+    """
+    tokens = normalize(text)
+    if not tokens:
+        return queryset
+
+    model = queryset.model
+    kind = document_kind(model)
+    connection = connections[queryset.db]
+    quote = connection.ops.quote_name
+    outer_pk = f'{quote(model._meta.db_table)}.{quote(model._meta.pk.column)}'
+    terms = _prefix_terms(tokens, connection.vendor)
+
+    if connection.vendor == 'sqlite':
+        matches = RawSQL(
+            f'SELECT d.object_id FROM {FTS_TABLE} JOIN students_searchdocument d ON d.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s AND d.kind = %s',
+            [terms, kind],
+        )
+        rank = RawSQL(
+            f'SELECT -bm25({FTS_TABLE}) FROM students_searchdocument d CROSS JOIN {FTS_TABLE} '
+            f'ON {FTS_TABLE}.rowid = d.id WHERE d.kind = %s AND d.object_id = {outer_pk} AND {FTS_TABLE} MATCH %s',
+            [kind, terms],
+            output_field=FloatField(),
+        )
+    elif connection.vendor == 'postgresql':
+        phrase = ' '.join(tokens)
+        matches = RawSQL(
+            "SELECT object_id FROM students_searchdocument WHERE kind = %s AND "
+            "(to_tsvector('simple', document) @@ to_tsquery('simple', %s) OR document %% %s)",
+            [kind, terms, phrase],
+        )
+        rank = RawSQL(
+            "SELECT ts_rank(to_tsvector('simple', document), to_tsquery('simple', %s)) + similarity(document, %s) "
+            f"FROM students_searchdocument WHERE kind = %s AND object_id = {outer_pk}",
+            [terms, phrase, kind],
+            output_field=FloatField(),
+        )
+    else:
+        condition = Q()
+        for token in terms:
+            condition &= Q(document__startswith=token) | Q(document__contains=f' {token}')
+        matches = SearchDocument.objects.filter(condition, kind=kind).values('object_id')
+        rank = Value(0.0, output_field=FloatField())
+
+    return queryset.filter(pk__in=matches).annotate(search_rank=rank)
+
+
+class IndexedSearchFilter(SearchFilter):
+    """
+    `?search=` ni SearchDocument indeksi orqali bajaradi (icontains bilan jadvalni to'liq
+    o'qimaydi). `?ordering=` berilmagan bo'lsa natijalar reyting bo'yicha tartiblanadi,
+    shuning uchun filter_backends da OrderingFilter dan keyin qo'yiladi.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '')
+        if not normalize(text):
+            return queryset
+        queryset = search_queryset(queryset, text)
+        if not request.query_params.get('ordering'):
+            queryset = queryset.order_by('-search_rank', '-pk')
+        return queryset
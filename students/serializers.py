@@ -1,16 +1,26 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from accounts.models import User
+from joybor.serializers import ExpandableFieldsMixin, ImageVariantsField, ReferenceFieldsMixin, ReferenceRelatedField
 from .models import Student, Application
 from dormitories.models import Dormitory
 from universities.models import University, Faculty
 
 
-class StudentSerializer(serializers.ModelSerializer):
-    faculty = serializers.PrimaryKeyRelatedField(
+class StudentSerializer(ExpandableFieldsMixin, ReferenceFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'dormitory': 'dormitories.serializers.DormitorySerializer',
+        'faculty': 'universities.serializers.FacultySerializer',
+        'floor': 'dormitories.serializers.FloorSerializer',
+        'room': 'dormitories.serializers.RoomSerializer',
+    }
+    faculty = ReferenceRelatedField(
         queryset=Faculty.objects.none(),  # dynamic filtering
         allow_null=True,
         required=False
     )
+    picture_variants = ImageVariantsField('picture')
 
     class Meta:
         model = Student
@@ -30,17 +40,19 @@ class StudentSerializer(serializers.ModelSerializer):
             'room',
             'emergency_contact_phone',
             'picture',
+            'picture_variants',
             'discount',
             'social_status',
             'created_at',
+            'updated_at',
         ]
-        read_only_fields = ['created_at']
+        read_only_fields = ['created_at', 'updated_at']
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         dormitory = self.context.get('dormitory')
         if dormitory:
-            self.fields['faculty'].queryset = Faculty.objects.filter(university=dormitory.university)
+            self.fields['faculty'].limit_to(university_id=dormitory.university_id)
 
     def validate_passport_number(self, value):
         if len(value) != 9:
@@ -51,11 +63,18 @@ class StudentSerializer(serializers.ModelSerializer):
         return Student.objects.create(**validated_data)
 
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(ExpandableFieldsMixin, ReferenceFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'dormitory': 'dormitories.serializers.DormitorySerializer',
+        'faculty': 'universities.serializers.FacultySerializer',
+    }
     student = serializers.HiddenField(default=serializers.CurrentUserDefault())  # Auto-fill with current user
-    dormitory = serializers.PrimaryKeyRelatedField(queryset=Dormitory.objects.all())
+    # unique_student_dormitory_application NULL larni takrorlanishiga qo'yadi, shuning uchun
+    # yotoqxonasiz ariza qabul qilinmaydi (shartli constraint esa yotoqxona o'chirilganda SET_NULL ni buzadi)
+    dormitory = serializers.PrimaryKeyRelatedField(queryset=Dormitory.objects.all(), required=True, allow_null=False)
     submitted_at = serializers.DateTimeField(read_only=True)
     comment = serializers.CharField(required=False, allow_blank=True)
+    picture_variants = ImageVariantsField('picture')
 
     class Meta:
         model = Application
@@ -73,25 +92,58 @@ class ApplicationSerializer(serializers.ModelSerializer):
             'phone_number',
             'comment',
             'picture',
+            'picture_variants',
             'submitted_at',
+            'updated_at',
         ]
-        read_only_fields = ['submitted_at']
+        read_only_fields = ['submitted_at', 'updated_at']
+        # (student, dormitory) takrorlanishini unique_student_dormitory_application ushlaydi:
+        # DRF ning UniqueTogetherValidator har yozishda qo'shimcha exists() so'rovini yuboradi
+        validators = []
 
-    def validate(self, attrs):
-        """Kombinatsion validatsiya: dormitory va student."""
-        dormitory = attrs.get('dormitory')
-        student = attrs.get('student')
-        if Application.objects.filter(student=student, dormitory=dormitory).exists():
-            raise serializers.ValidationError("Siz ushbu yotoqxonaga allaqachon ariza yuborgansiz.")
-        return attrs
+    duplicate_message = "Siz ushbu yotoqxonaga allaqachon ariza yuborgansiz."
 
     def create(self, validated_data):
         """Create method to handle the creation of an application."""
-        return Application.objects.create(**validated_data)
+        try:
+            with transaction.atomic():
+                return Application.objects.create(**validated_data)
+        except IntegrityError as exc:
+            self.raise_duplicate(exc, Application(**validated_data))
 
     def update(self, instance, validated_data):
         """Update method to handle application updates."""
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        try:
+            with transaction.atomic():
+                instance.save()
+        except IntegrityError as exc:
+            self.raise_duplicate(exc, instance)
         return instance
+
+    def raise_duplicate(self, exc, application):
+        """Takroriy ariza bo'lsa - validatsiya xatosi, boshqa IntegrityError o'zgarmaydi."""
+        duplicate = (
+            Application.objects.filter(student_id=application.student_id, dormitory_id=application.dormitory_id)
+            .exclude(pk=application.pk)
+            .exists()
+        )
+        if not duplicate:
+            raise exc
+        raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [self.duplicate_message]}) from exc
+
+
+class ApplicationApprovalItemSerializer(serializers.Serializer):
+    application = serializers.IntegerField()
+    room = serializers.IntegerField(required=False, allow_null=True, default=None)
+
+
+class ApplicationApproveSerializer(serializers.Serializer):
+    items = ApplicationApprovalItemSerializer(many=True, allow_empty=False, max_length=1000)
+
+    def validate_items(self, value):
+        ids = [item['application'] for item in value]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Arizalar takrorlanmasligi kerak.")
+        return value
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from dormitories.occupancy import move_occupants
+from .models import Application, Student
+from .search import index_objects, remove_object
+
+
+@receiver(post_delete, sender=Student)
+def release_student_room(sender, instance, **kwargs):
+    """Talaba o'chirilganda xonadagi joyni bo'shatadi."""
+    move_occupants(instance.room_id, None)
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Application)
+def update_search_document(sender, instance, **kwargs):
+    index_objects([instance])
+
+
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Application)
+def delete_search_document(sender, instance, **kwargs):
+    remove_object(instance)
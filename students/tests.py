@@ -1,13 +1,18 @@
 from datetime import date
+from io import StringIO
 
+from django.core.management import call_command
 from django.test import TestCase
 from django.utils import timezone
 from decimal import Decimal
 
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
 from accounts.models import User
-from dormitories.models import Dormitory
+from dormitories.models import Dormitory, Floor, Room
 from universities.models import University, Faculty
-from students.models import Student, Application  # yoki to‘g‘ri import qiling
+from students.models import Student, Application, SearchDocument  # yoki to‘g‘ri import qiling
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 
@@ -94,3 +99,147 @@ class ApplicationModelTestCase(TestCase):
 
     def test_application_has_document(self):
         self.assertTrue(self.application.student_document.name.startswith('student_ID/'))
+
+
+class ApplicationApproveTestCase(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass1234',
+                                              role=User.Role.IS_ADMIN)
+        self.dormitory = Dormitory.objects.create(name='Dorm', address='-', number_of_floors=1, admin=self.admin)
+        floor = Floor.objects.create(name='1', dormitory=self.dormitory)
+        self.room = Room.objects.create(dormitory=self.dormitory, floor=floor, room_number='101', capacity=2)
+        self.applications = []
+        for index in range(4):
+            user = User.objects.create_user(username=f'student{index}', email=f's{index}@example.com',
+                                            password='pass1234', role=User.Role.IS_STUDENT)
+            self.applications.append(Application.objects.create(
+                student=user, first_name=f'Ism {index}', last_name='Familiya', dormitory=self.dormitory,
+                passport_number=f'AB{index:07d}', phone_number='+998901234567',
+            ))
+        Student.objects.create(name='Eski', last_name='Talaba', passport_number='AB0000003',
+                               emergency_contact_phone='+998901234567')
+        self.client.force_authenticate(self.admin)
+
+    def test_bulk_approve(self):
+        items = [{'application': application.pk, 'room': self.room.pk} for application in self.applications]
+        response = self.client.post(reverse('application-approve'), {'items': items}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['created']), 2)
+        conflicts = {conflict['application']: conflict['errors'] for conflict in response.data['conflicts']}
+        self.assertEqual(set(conflicts), {self.applications[2].pk, self.applications[3].pk})
+        self.assertIn("Xonada bo'sh joy qolmagan.", conflicts[self.applications[2].pk])
+
+        student = Student.objects.get(application=self.applications[0])
+        self.assertEqual(student.name, 'Ism 0')
+        self.assertTrue(SearchDocument.objects.filter(kind='students.student', object_id=student.pk).exists())
+        self.assertEqual(student.floor_id, self.room.floor_id)
+        self.room.refresh_from_db()
+        self.dormitory.refresh_from_db()
+        self.assertEqual(self.room.current_occupancy, 2)
+        self.assertEqual(self.dormitory.current_occupancy, 2)
+
+        response = self.client.post(reverse('application-approve'),
+                                    {'items': [{'application': self.applications[0].pk}]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['conflicts'][0]['errors'], ["Ariza allaqachon tasdiqlangan."])
+
+    def test_student_cannot_approve(self):
+        self.client.force_authenticate(self.applications[0].student)
+        response = self.client.post(reverse('application-approve'),
+                                    {'items': [{'application': self.applications[0].pk}]}, format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+class ApplicationUniqueTestCase(APITestCase):
+    def setUp(self):
+        admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass1234',
+                                         role=User.Role.IS_ADMIN)
+        self.dormitory = Dormitory.objects.create(name='Dorm', address='-', number_of_floors=1, admin=admin)
+        self.student = User.objects.create_user(username='student', email='student@example.com',
+                                                password='pass1234', role=User.Role.IS_STUDENT)
+        self.client.force_authenticate(self.student)
+
+    def submit(self, passport_number):
+        return self.client.post(reverse('application-list'), {
+            'first_name': 'Ism', 'last_name': 'Familiya', 'dormitory': self.dormitory.pk,
+            'passport_number': passport_number,
+        }, format='json')
+
+    def test_duplicate_application_is_rejected_by_constraint(self):
+        response = self.submit('AB0000001')
+        self.assertEqual(response.status_code, 201)
+
+        response = self.submit('AB0000002')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['non_field_errors'], ["Siz ushbu yotoqxonaga allaqachon ariza yuborgansiz."])
+        self.assertEqual(Application.objects.filter(student=self.student).count(), 1)
+
+    def test_application_without_dormitory_is_rejected(self):
+        for _ in range(2):
+            response = self.client.post(reverse('application-list'), {
+                'first_name': 'Ism', 'last_name': 'Familiya', 'dormitory': None, 'passport_number': 'AB0000003',
+            }, format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('dormitory', response.data)
+        application_id = self.submit('AB0000001').data['id']
+        response = self.client.patch(reverse('application-detail', args=[application_id]), {'dormitory': None},
+                                     format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Application.objects.filter(dormitory__isnull=True).exists())
+
+    def test_update_keeps_same_dormitory(self):
+        application_id = self.submit('AB0000001').data['id']
+        response = self.client.patch(reverse('application-detail', args=[application_id]),
+                                     {'dormitory': self.dormitory.pk, 'comment': 'Yangilandi'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['comment'], 'Yangilandi')
+
+
+class StudentSearchTestCase(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@example.com', password='pass1234',
+                                              role=User.Role.IS_ADMIN)
+        self.dormitory = Dormitory.objects.create(name='Dorm', address='-', number_of_floors=1, admin=self.admin)
+        other = Dormitory.objects.create(name='Other', address='-', number_of_floors=1)
+
+        def create(name, last_name, passport_number, phone_number, dormitory=self.dormitory):
+            return Student.objects.create(name=name, last_name=last_name, passport_number=passport_number,
+                                          phone_number=phone_number, emergency_contact_phone='',
+                                          dormitory=dormitory)
+
+        self.orinboy = create('Ўринбой', 'Алиев', 'AB1234567', '+998901112233')
+        self.gayrat = create('Gʻayrat', 'Orinboyev', 'AC7654321', '+998935556677')
+        create('Orinboy', 'Boshqa', 'AD0000001', '+998900000000', dormitory=other)
+        self.client.force_authenticate(self.admin)
+
+    def search(self, text):
+        response = self.client.get(reverse('student-list'), {'search': text})
+        return [row['id'] for row in response.data['results']]
+
+    def test_transliteration_and_apostrophes(self):
+        self.assertEqual(self.search("o'rinboy али"), [self.orinboy.pk])
+        self.assertEqual(self.search('ғайрат'), [self.gayrat.pk])
+        self.assertEqual(self.search('aliyev ўrin'), [self.orinboy.pk])
+
+    def test_prefix_and_numbers(self):
+        # Birinchi natija to'liq so'z mos kelgani, boshqa yotoqxona talabasi ko'rinmaydi
+        self.assertEqual(self.search('orinboy'), [self.orinboy.pk, self.gayrat.pk])
+        self.assertEqual(self.search('90 111'), [self.orinboy.pk])
+        self.assertEqual(self.search('ac765'), [self.gayrat.pk])
+        self.assertEqual(self.search('1234567'), [self.orinboy.pk])
+
+    def test_index_follows_save_and_delete(self):
+        self.orinboy.name = 'Sherzod'
+        self.orinboy.save()
+        self.assertEqual(self.search('sherzod'), [self.orinboy.pk])
+        self.assertEqual(self.search('ўринбой'), [self.gayrat.pk])
+
+        self.gayrat.delete()
+        self.assertEqual(self.search('orinboy'), [])
+
+    def test_rebuild_command(self):
+        SearchDocument.objects.all().delete()
+        self.assertEqual(self.search('orinboy'), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search('orinboy'), [self.orinboy.pk, self.gayrat.pk])
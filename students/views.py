@@ -1,24 +1,35 @@
+from decimal import Decimal
+
 from django.contrib.auth.models import AnonymousUser
 from django.template.context_processors import request
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import viewsets, permissions, filters
+from rest_framework import viewsets, permissions, filters, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
 from accounts.permissions import IsDormitoryAdmin
+from joybor.mixins import ConditionalRequestMixin, OptimizedQuerysetMixin, ExportMixin
+from joybor.pagination import CursorOrPageNumberPagination
+from joybor.tenant import get_tenant
+from payments.models import StudentBalance
+from payments.serializers import StudentBalanceSerializer
+from .approval import approve_applications
 from .models import Student, Application
-from .serializers import StudentSerializer, ApplicationSerializer
+from .serializers import StudentSerializer, ApplicationSerializer, ApplicationApproveSerializer
 from .permissions import IsStudentOrAdminForOwnDormitory, IsAdminForDormitory, IsSuperAdminOrOwner
+from .search import IndexedSearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
 
-class StudentViewSet(viewsets.ModelViewSet):
-    queryset = Student.objects.select_related('user', 'dormitory', 'faculty').all()
+class StudentViewSet(ConditionalRequestMixin, OptimizedQuerysetMixin, ExportMixin, viewsets.ModelViewSet):
+    queryset = Student.objects.all()
     serializer_class = StudentSerializer
     permission_classes = [IsDormitoryAdmin]
 
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # ?search= ism, pasport va telefon raqamlari bo'yicha (Student.search_document_fields)
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, IndexedSearchFilter]
     filterset_fields = ['faculty', 'social_status']
-    search_fields = ['passport_number', 'middle_name', 'name']
     ordering_fields = ['created_at', 'discount']
     ordering = ['-created_at']
 
@@ -43,12 +54,24 @@ class StudentViewSet(viewsets.ModelViewSet):
         role = getattr(user, 'role', None)
 
         if user.is_dormitory_admin:
-            return self.queryset.filter(dormitory=user.dormitory)
-        return self.queryset.filter(user=user)
+            return self.queryset.for_tenant()
+        return self.queryset.filter(application__student=user)
 
     def perform_create(self, serializer):
-        serializer.save(dormitory=self.request.user.dormitory)
-
+        serializer.save(dormitory_id=get_tenant(self.request).require_dormitory_id())
+
+    @swagger_auto_schema(tags=['Student'], responses={200: StudentBalanceSerializer(many=True)})
+    @action(detail=True, methods=['get'])
+    def balance(self, request, pk=None):
+        """Talabaning oylar bo'yicha to'lov hisobi (StudentBalance jadvalidan)."""
+        student = self.get_object()
+        balances = StudentBalance.objects.filter(student=student)
+        serializer = StudentBalanceSerializer(balances, many=True, context=self.get_serializer_context())
+        return Response({
+            'student': student.pk,
+            'total_paid': str(sum((row.paid_amount for row in balances), start=Decimal('0.00'))),
+            'months': serializer.data,
+        })
 
     @swagger_auto_schema(tags=['Student'])
     def list(self, request, *args, **kwargs):
@@ -75,17 +98,18 @@ class StudentViewSet(viewsets.ModelViewSet):
         return super().destroy(request, *args, **kwargs)
 
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+class ApplicationViewSet(ConditionalRequestMixin, OptimizedQuerysetMixin, ExportMixin, viewsets.ModelViewSet):
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, IndexedSearchFilter]
 
-    # Filtirlash, izlash, tartiblash maydonlari
+    # Filtirlash, izlash (Application.search_document_fields), tartiblash maydonlari
     filterset_fields = ['dormitory']
-    search_fields = ['comment', 'dormitory__name']
     ordering_fields = ['submitted_at']
     ordering = ['-submitted_at']
+    pagination_class = CursorOrPageNumberPagination
+    cursor_ordering = ('-submitted_at', '-id')
 
     def get_queryset(self):
         user = self.request.user
@@ -100,7 +124,7 @@ class ApplicationViewSet(viewsets.ModelViewSet):
 
         # Admin faqat o‘zining yotoqxonasidagi arizalarni ko‘radi
         if user.is_dormitory_admin:
-            return self.queryset.filter(dormitory__admin=user)
+            return self.queryset.for_tenant()
 
         # Student faqat o‘zining arizasini ko‘radi
         return self.queryset.filter(student=user)
@@ -109,15 +133,35 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         # Foydalanuvchini avtomatik bog‘lash
         serializer.save(student=self.request.user)
 
+    def get_serializer_class(self):
+        if self.action == 'approve':
+            return ApplicationApproveSerializer
+        return super().get_serializer_class()
+
     def get_permissions(self):
+        # Arizalarni tasdiqlash faqat yotoqxona admini uchun
+        if self.action == 'approve':
+            self.permission_classes = [IsDormitoryAdmin]
         # Ariza yangilanishi uchun ruxsat
-        if self.action in ['update', 'partial_update']:
+        elif self.action in ['update', 'partial_update']:
             self.permission_classes = [IsStudentOrAdminForOwnDormitory]
         else:
             # Ariza ko‘rish uchun ruxsat
             self.permission_classes = [IsStudentOrAdminForOwnDormitory]
         return super().get_permissions()
 
+    @swagger_auto_schema(tags=['Ariza'])
+    @action(detail=False, methods=['post'])
+    def approve(self, request):
+        """
+        Bir nechta arizani bitta so'rovda tasdiqlab, talabalar yaratadi.
+        Har bir element uchun xona ixtiyoriy. Muammoli arizalar `conflicts` da qaytadi.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        report = approve_applications(get_tenant(request).dormitory_id, serializer.validated_data['items'])
+        return Response(report, status=status.HTTP_201_CREATED if report['created'] else status.HTTP_200_OK)
+
     @swagger_auto_schema(tags=['Ariza'])
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
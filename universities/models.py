@@ -10,12 +10,19 @@ class University(models.Model):
     contact_info = models.TextField(blank=True, null=True, verbose_name=_('Contact information'))
     website = models.URLField(blank=True, null=True, verbose_name=_('Website'))
     logo = models.ImageField(upload_to='university_logos/', blank=True, null=True, verbose_name=_('Logo'))
+    logo_variants = models.JSONField(default=dict, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
 
+    @property
+    def reference_faculties(self):
+        """Universitet fakultetlari ma'lumotnoma keshidan (bazaga so'rovsiz)."""
+        from joybor.refdata import get_table
+        return get_table(Faculty).children('university_id', self.pk)
+
     class Meta:
         verbose_name = _('University')
         verbose_name_plural = _('Universities')
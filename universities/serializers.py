@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from joybor.serializers import ExpandableFieldsMixin, ImageVariantsField, ReferenceFieldsMixin, ReferenceStringField
 from .models import University, Faculty
 
 
@@ -9,8 +10,10 @@ class FacultySimpleSerializer(serializers.ModelSerializer):
 
 
 
-class UniversitySerializer(serializers.ModelSerializer):
-    faculties = FacultySimpleSerializer(many=True, read_only=True)
+class UniversitySerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
+    # Fakultetlar prefetch qilinmaydi, ma'lumotnoma keshidan olinadi
+    faculties = FacultySimpleSerializer(many=True, read_only=True, source='reference_faculties')
+    logo_variants = ImageVariantsField('logo')
 
     class Meta:
         model = University
@@ -23,6 +26,7 @@ class UniversitySerializer(serializers.ModelSerializer):
             'contact_info',
             'website',
             'logo',
+            'logo_variants',
             'created_at',
             'updated_at',
             'faculties',
@@ -48,8 +52,11 @@ class UniversitySerializer(serializers.ModelSerializer):
         return value
 
 
-class FacultySerializer(serializers.ModelSerializer):
-    university_name = serializers.StringRelatedField(source='university', read_only=True)
+class FacultySerializer(ExpandableFieldsMixin, ReferenceFieldsMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'university': 'universities.serializers.UniversitySerializer',
+    }
+    university_name = ReferenceStringField(University, source='university_id')
 
     class Meta:
         model = Faculty
@@ -1,5 +1,17 @@
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
 from django.test import TestCase
 from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APITestCase
+
+from joybor import refdata
+from joybor.serializers import ReferenceRelatedField
 from universities.models import University, Faculty
 
 
@@ -58,3 +70,164 @@ class FacultyTestCase(TestCase):
                 university=self.university,
                 name='Informatika Fakulteti',  # Duplicate faculty name for the same university
             )
+
+
+class UniversityListQueryTestCase(APITestCase):
+    def setUp(self):
+        self.superadmin = get_user_model().objects.create_user(
+            username='superadmin',
+            email='superadmin@example.com',
+            password='superpass',
+            role='superadmin',
+        )
+        self.client.force_authenticate(self.superadmin)
+
+    def create_universities(self, count):
+        for i in range(count):
+            university = University.objects.create(name=f'Universitet {i}', city='Toshkent')
+            Faculty.objects.create(university=university, name=f'Fakultet {i}')
+
+    def test_university_list_query_count_does_not_grow(self):
+        # Ro'yxat ma'lumotnoma keshidan: jadvallar o'zgargandan keyin bir marta o'qiladi
+        self.create_universities(2)
+        with self.assertNumQueries(2):
+            self.client.get(reverse('university-list'))
+        with self.assertNumQueries(0):
+            self.client.get(reverse('university-list'))
+
+        self.create_universities(8)
+        with self.assertNumQueries(2):
+            self.client.get(reverse('university-list'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('university-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 10)
+        self.assertEqual(len(response.data['results'][0]['faculties']), 1)
+
+    def test_faculty_list_selects_university(self):
+        self.create_universities(5)
+        self.client.get(reverse('faculty-list'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('faculty-list'))
+        self.assertEqual(response.data['results'][0]['university_name'], 'Universitet 0')
+
+
+class FacultyExpandTestCase(APITestCase):
+    def setUp(self):
+        self.superadmin = get_user_model().objects.create_user(
+            username='superadmin',
+            email='superadmin@example.com',
+            password='superpass',
+            role='superadmin',
+        )
+        self.client.force_authenticate(self.superadmin)
+        self.university = University.objects.create(name='Andijon Texnika Universiteti', city='Andijon')
+        Faculty.objects.create(university=self.university, name='Informatika Fakulteti')
+
+    def test_relations_are_ids_by_default(self):
+        response = self.client.get(reverse('faculty-list'))
+        self.assertEqual(response.data['results'][0]['university'], self.university.id)
+
+    def test_expand_inlines_relation(self):
+        response = self.client.get(reverse('faculty-list'), {'expand': 'university'})
+        university = response.data['results'][0]['university']
+        self.assertEqual(university['name'], 'Andijon Texnika Universiteti')
+        self.assertEqual(university['faculties'], [self.university.faculties.get().id])
+
+    def test_sparse_fields(self):
+        response = self.client.get(reverse('faculty-list'), {'fields': 'id,name,university.city'})
+        self.assertEqual(
+            response.data['results'][0],
+            {'id': self.university.faculties.get().id, 'name': 'Informatika Fakulteti',
+             'university': {'city': 'Andijon'}},
+        )
+
+
+class ReferenceDataCacheTestCase(APITestCase):
+    def setUp(self):
+        refdata.clear()
+        self.superadmin = get_user_model().objects.create_user(
+            username='superadmin',
+            email='superadmin@example.com',
+            password='superpass',
+            role='superadmin',
+        )
+        self.client.force_authenticate(self.superadmin)
+        self.university = University.objects.create(name='Andijon Texnika Universiteti', city='Andijon')
+        self.other_university = University.objects.create(name='Farg\'ona Universiteti', city='Farg\'ona')
+        self.faculty = Faculty.objects.create(university=self.university, name='Informatika Fakulteti')
+        self.other_faculty = Faculty.objects.create(university=self.other_university, name='Fizika Fakulteti')
+
+    def test_foreign_key_validation_without_queries(self):
+        field = ReferenceRelatedField(queryset=Faculty.objects.all())
+        field.to_internal_value(self.faculty.pk)
+        with self.assertNumQueries(0):
+            faculty = field.to_internal_value(str(self.faculty.pk))
+            self.assertEqual(str(faculty), 'Andijon Texnika Universiteti - Informatika Fakulteti')
+            with self.assertRaises(ValidationError):
+                field.to_internal_value(self.other_faculty.pk + 100)
+            with self.assertRaises(ValidationError):
+                field.to_internal_value('abc')
+
+    def test_limit_to_and_empty_queryset(self):
+        field = ReferenceRelatedField(queryset=Faculty.objects.none())
+        with self.assertRaises(ValidationError):
+            field.to_internal_value(self.faculty.pk)
+
+        field.limit_to(university_id=self.university.pk)
+        self.assertEqual(field.to_internal_value(self.faculty.pk), self.faculty)
+        with self.assertRaises(ValidationError):
+            field.to_internal_value(self.other_faculty.pk)
+
+    def test_changes_bump_version(self):
+        self.client.get(reverse('faculty-list'))
+
+        self.university.name = 'Andijon Davlat Universiteti'
+        self.university.save()
+        response = self.client.get(reverse('faculty-list'), {'university': self.university.pk})
+        self.assertEqual([row['university_name'] for row in response.data['results']],
+                         ['Andijon Davlat Universiteti'])
+
+        self.faculty.delete()
+        response = self.client.get(reverse('university-list'))
+        faculties = {row['id']: row['faculties'] for row in response.data['results']}
+        self.assertEqual(faculties[self.university.pk], [])
+        self.assertEqual(faculties[self.other_university.pk], [self.other_faculty.pk])
+
+    def as_process(self, backend, tables):
+        """Boshqa jarayonni taqlid qiladi: o'z kesh ulanishi va jadvallari."""
+        return mock.patch.multiple(refdata, cache=backend, _tables=tables)
+
+    def test_bump_reaches_other_process_through_shared_cache(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        writer, reader = FileBasedCache(directory.name, {}), FileBasedCache(directory.name, {})
+        writer_tables, reader_tables = {}, {}
+
+        with self.as_process(reader, reader_tables):
+            self.assertEqual(refdata.get_object(University, self.university.pk), self.university)
+        with self.as_process(writer, writer_tables), self.captureOnCommitCallbacks(execute=True):
+            university = University.objects.create(name='Toshkent Universiteti', city='Toshkent')
+            self.university.delete()
+        with self.as_process(reader, reader_tables):
+            self.assertEqual(refdata.get_object(University, university.pk), university)
+            self.assertIsNone(refdata.get_object(University, self.university.pk))
+
+    def test_local_cache_version_expires(self):
+        writer, reader = LocMemCache('writer', {}), LocMemCache('reader', {})
+        writer_tables, reader_tables = {}, {}
+
+        with self.as_process(reader, reader_tables):
+            refdata.get_table(University)
+        with self.as_process(writer, writer_tables), self.captureOnCommitCallbacks(execute=True):
+            university = University.objects.create(name='Toshkent Universiteti', city='Toshkent')
+        with self.as_process(reader, reader_tables):
+            # Bump bu jarayonga yetmaydi, versiya muddati tugaguncha eski jadval
+            self.assertIsNone(refdata.get_object(University, university.pk))
+            with mock.patch('time.time', return_value=time.time() + 31):
+                self.assertEqual(refdata.get_object(University, university.pk), university)
+
+    def test_unknown_params_fall_back_to_database(self):
+        response = self.client.get(reverse('faculty-list'), {'ordering': '-name'})
+        self.assertEqual([row['name'] for row in response.data['results']],
+                         ['Informatika Fakulteti', 'Fizika Fakulteti'])
@@ -1,6 +1,8 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from joybor.asyncviews import router_urls
+
 from .views import UniversityViewSet, FacultyViewSet
 
 router = DefaultRouter()
@@ -9,5 +11,5 @@ router.register('university', UniversityViewSet)
 router.register('faculty', FacultyViewSet)
 
 urlpatterns = [
-    path('', include(router.urls))
+    path('', include(router_urls(router)))
 ]
\ No newline at end of file
@@ -2,6 +2,8 @@ from drf_yasg.utils import swagger_auto_schema
 
 from accounts.permissions import IsAuthenticatedOrSuperAdminOnly, IsSuperAdmin
 from dormitories.models import Floor
+from joybor.asyncviews import AsyncReadMixin
+from joybor.mixins import OptimizedQuerysetMixin, ReferenceListMixin
 from .serializers import UniversitySerializer, FacultySerializer
 from rest_framework import status
 from rest_framework.response import Response
@@ -9,10 +11,12 @@ from universities.models import University, Faculty
 from rest_framework import viewsets
 
 
-class UniversityViewSet(viewsets.ModelViewSet):
+class UniversityViewSet(ReferenceListMixin, AsyncReadMixin, OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = University.objects.all().order_by('name')
     serializer_class = UniversitySerializer
     permission_classes = [IsSuperAdmin]
+    # UniversitySerializer.faculties
+    async_reference_models = (Faculty,)
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
@@ -48,10 +52,13 @@ class UniversityViewSet(viewsets.ModelViewSet):
         return super().destroy(request, *args, **kwargs)
 
 
-class FacultyViewSet(viewsets.ModelViewSet):
+class FacultyViewSet(ReferenceListMixin, AsyncReadMixin, OptimizedQuerysetMixin, viewsets.ModelViewSet):
     queryset = Faculty.objects.all().order_by('name')
     serializer_class = FacultySerializer
     permission_classes = [IsSuperAdmin]
+    reference_filter_params = {'university': 'university_id'}
+    # FacultySerializer.university_name
+    async_reference_models = (University,)
 
     def perform_create(self, serializer):
         """